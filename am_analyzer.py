@@ -15,21 +15,36 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.ticker import EngFormatter
-from scipy import signal as sig
+import importlib.util
+import json
+import os
 import textwrap
-import threading
-import queue
+import time
+
+from am_audio import AudioPlayer, SoundDeviceSink
+from am_cache import ResultCache, with_seed
+from am_capture import save_capture
+from am_engine import (
+    MAX_SAMPLES,
+    PRESETS,
+    SIGNAL_SHAPES,
+    BufferPool,
+    Pipeline,
+    SignalProcessor,
+    compute_metrics,
+    default_fft_span,
+    parse_input,
+)
+from am_profiling import Profiler
+from am_render import PlotView
+from am_scheduler import CalculationScheduler
+from am_spectrum import AVERAGING_MODES, SPECTRUM_WINDOWS
+from am_stream import StreamingPipeline, StreamView, Waterfall
 
 # --- Pustaka baru untuk pemutaran audio ---
-try:
-    import sounddevice as sd
-
-    AUDIO_ENABLED = True
-except ImportError:
-    AUDIO_ENABLED = False
+# Only looked up here; sounddevice (and PortAudio) load on the first Play
+AUDIO_ENABLED = importlib.util.find_spec("sounddevice") is not None
 
 # --- Pustaka UI Modern ---
 try:
@@ -80,225 +95,93 @@ class ToolTip:
         self.tooltip_window = None
 
 
-class SignalProcessor:
-    """Menangani semua tugas pemrosesan sinyal."""
-
-    def calculate_thd(self, signal_data, fundamental_freq, sampling_rate):
-        n = len(signal_data)
-        if n < 2:
-            return 0.0
-        yf, xf = np.fft.fft(signal_data), np.fft.fftfreq(n, 1 / sampling_rate)
-        idx_fund = np.argmin(np.abs(xf - fundamental_freq))
-        p_fund = np.abs(yf[idx_fund]) ** 2
-        p_harm = sum(
-            np.abs(yf[np.argmin(np.abs(xf - i * fundamental_freq))]) ** 2
-            for i in range(2, 11)
-        )
-        if p_fund == 0:
-            return float("inf")
-        return (np.sqrt(p_harm) / np.sqrt(p_fund)) * 100
-
-    def modulate(self, msg, carrier, ac, mode):
-        return (ac + msg) * (carrier / ac) if mode == "DSB-FC" else msg * (carrier / ac)
-
-    def envelope_demodulate(self, mod, fm, sr):
-        rect = np.abs(mod)
-        b, a = sig.butter(4, 1.5 * fm / (0.5 * sr), "low")
-        dem = sig.filtfilt(b, a, rect)
-        return dem - np.mean(dem)
-
-    def coherent_demodulate(self, mod, t, fc, pe, fm, sr):
-        lo = np.cos(2 * np.pi * fc * t + np.deg2rad(pe))
-        mul = mod * lo
-        b, a = sig.butter(4, 1.5 * fm / (0.5 * sr), "low")
-        dem = sig.filtfilt(b, a, mul)
-        return dem * 2
-
-    def add_noise(self, s, snr):
-        p_s = np.mean(s**2)
-        p_s_db = 10 * np.log10(p_s + 1e-9)
-        p_n_db = p_s_db - snr
-        p_n = 10 ** (p_n_db / 10)
-        return s + np.random.normal(0, np.sqrt(p_n), len(s))
-
-    def calc_power(self, ac, m, mode):
-        if mode == "DSB-FC":
-            m_eff = min(m, 1.0)
-            Pc, Psb = (ac**2) / 2, (ac**2 / 2) * (m_eff**2) / 2
-            Pt = Pc + Psb
-            eff = (Psb / Pt) * 100 if Pt > 0 else 0
-        else:
-            Pc, Pt, Psb, eff = (
-                0,
-                (ac * m) ** 2 / 2,
-                (ac * m) ** 2 / 2,
-                100.0 if (ac * m) > 0 else 0,
-            )
-        return {"Pc": Pc, "Psb": Psb, "Pt": Pt, "eff": eff}
-
-    def gen_time_vector(self, dur, sr, max_s):
-        n = min(int(dur * sr), max_s)
-        return np.linspace(0, dur, n, endpoint=False)
-
-    def gen_message_signal(self, t, a, f, sh):
-        if sh == "dual_tone":
-            tone1 = (a / 2) * np.cos(2 * np.pi * f * t)
-            tone2 = (a / 2) * np.cos(2 * np.pi * (3 * f) * t)
-            return tone1 + tone2
-        return a * {"sine": np.cos, "square": sig.square, "sawtooth": sig.sawtooth}[sh](
-            2 * np.pi * f * t
-        )
-
-    def gen_carrier_signal(self, t, a, f):
-        return a * np.cos(2 * np.pi * f * t)
-
-    def calc_fft(self, s, sr):
-        n = len(s)
-        if n == 0:
-            return np.array([]), np.array([]), np.array([])
-        yf, xf = np.fft.fft(s), np.fft.fftfreq(n, 1 / sr)
-        mag = 2.0 / n * np.abs(yf[: n // 2])
-        return xf[: n // 2], mag, 20 * np.log10(mag + 1e-9)
-
-
 class AMSimulatorGUI:
-    MAX_SAMPLES, DEBOUNCE_TIME_MS = 150_000, 300
+    # Short debounce: the scheduler coalesces bursts, so sliders stay responsive
+    DEBOUNCE_TIME_MS = 25
+    # A configuration left unchanged this long is stored in the result cache
+    CACHE_SETTLE_MS = 1500
+    LIVE_INTERVAL_MS, LIVE_BLOCK_SIZE, LIVE_MAX_BLOCKS = 50, 4096, 8
+    # Parameters that only change the FFT view; they never rerun the pipeline
+    VIEW_KEYS = ("fft_scale", "fft_center", "fft_span")
     FONT_BOLD, FONT_ITALIC = ("Segoe UI", 10, "bold"), ("Segoe UI", 9, "italic")
-
-    # NEW: Central source of truth for signal shapes
-    SIGNAL_SHAPES = {
-        "Sine": "sine",
-        "Square": "square",
-        "Sawtooth": "sawtooth",
-        "Dual Tone (Music)": "dual_tone",
-    }
+    # Status-bar timing breakdown: (label, recorded stage prefix)
+    TIMING_GROUPS = (
+        ("pipeline", "pipeline."),
+        ("plot", "plot."),
+        ("analisis", "analysis"),
+    )
+    # Waterfall: STFT rows appended per calculation result (outside live mode)
+    # and colour range (dB) below the peak
+    WATERFALL_ROWS_PER_UPDATE, WATERFALL_RANGE_DB = 4, 80
+    # The figure is built this long after the window is shown (staged startup)
+    STARTUP_DELAY_MS = 30
+
+    # Central source of truth for signal shapes (shared with am_engine)
+    SIGNAL_SHAPES = SIGNAL_SHAPES
 
     def __init__(self, root):
+        self._init_state()
         self.root = root
         self.root.title(APP_TITLE)
         self.root.geometry("1300x900")
-        self.processor = SignalProcessor()
-        self._debounce_timer = None
-        self.previous_preset = "Default (Modulasi Baik)"
-        self._is_updating_internally = False
-        self.signals = {}
-        self.play_buttons = []
-
-        self.calculation_queue = queue.Queue()
-        self.is_calculating = False
+        self.root.bind("<<CalculationDone>>", self._on_calculation_done)
 
         self._define_presets()
         self._setup_styles()
         self._setup_vars()
         self._setup_ui()
+        # The first preset already computes in the worker (which is also where
+        # scipy gets imported) while the window opens
         self.load_preset("Default (Modulasi Baik)")
-        self._check_calculation_queue()
+        self._mark_startup("ui")
+        self.root.after(self.STARTUP_DELAY_MS, self._finish_startup)
+
+    def _init_state(self, cache=True):
+        """State per instance yang tidak butuh Tk (juga dipakai am_bench.py).
+
+        Figure dibuat terpisah lewat _create_figure; sampai saat itu view
+        bernilai None. cache=False tidak membuka cache hasil di disk.
+        """
+        # Wall-clock milestones, so am_bench.py --startup can time them from
+        # the moment it launched the process
+        self.startup_times = {"init": time.time()}
+        self.startup_probe = False
+        # Buffer dipakai ulang antar update agar tidak alokasi ulang tiap slider
+        self.processor = SignalProcessor(pool=BufferPool())
+        self.pipeline = Pipeline(self.processor)
+        self.cache = None
+        if cache:
+            try:
+                # Presets and revisited configurations load from disk
+                self.cache = ResultCache()
+            except OSError:
+                pass
+        self._debounce_timer, self._settle_job = None, None
+        self.previous_preset = "Default (Modulasi Baik)"
+        self._is_updating_internally = False
+        self.signals = {}
+        self._signal_params = None
+        self._latency_ms = 0.0
+        self.view, self.play_buttons = None, {}
+        # Streaming playback; the device is opened on the first Play
+        self.audio, self._audio_source = None, None
+        # Per-stage latency history for the status-bar breakdown
+        self.profiler = Profiler()
+        self.timing_visible, self._draw_in_render = False, 0.0
+
+        # Latest-value-wins worker; results arrive via <<CalculationDone>>
+        self.scheduler = CalculationScheduler(
+            self._generate_signals, notify=self._notify_calculation_done
+        )
+
+        # Live (streaming) mode state
+        self.stream, self.stream_view, self._live_job = None, None, None
+        self._live_params = None
+        # Waterfall window (opened from the display tab)
+        self.waterfall, self.waterfall_view = None, None
 
     def _define_presets(self):
-        self.presets = {
-            "--- Dasar & Edukasional ---": None,
-            "Default (Modulasi Baik)": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 0.7,
-                "fm": "500",
-                "snr": 50,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "Modulasi 100% (Ideal)": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 1.0,
-                "fm": "500",
-                "snr": 50,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "Overmodulation (Distorsi)": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 1.5,
-                "fm": "500",
-                "snr": 50,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "Sinyal Kotak (Harmonik)": {
-                "ac": "1",
-                "fc": "50k",
-                "m": 0.5,
-                "fm": "1k",
-                "snr": 50,
-                "shape": "square",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "DSB-SC (Efisien)": {
-                "ac": "1",
-                "fc": "20k",
-                "m": 1.0,
-                "fm": "1k",
-                "snr": 50,
-                "shape": "sine",
-                "mode": "DSB-SC",
-                "demod_mode": "Coherent",
-                "phase_error": 0,
-            },
-            "--- Audio & Dunia Nyata ---": None,
-            "Nada Uji Terdengar (440Hz)": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 0.8,
-                "fm": "440",
-                "snr": 40,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "AM Radio - Musik (MW)": {
-                "ac": "1",
-                "fc": "900k",
-                "m": 0.8,
-                "fm": "400",
-                "snr": 25,
-                "shape": "dual_tone",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "--- Kondisi Buruk & Batasan ---": None,
-            "Sangat Berisik (SNR Rendah)": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 0.8,
-                "fm": "1k",
-                "snr": 3,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Envelope",
-                "phase_error": 0,
-            },
-            "Coherent - Phase Error 45°": {
-                "ac": "1",
-                "fc": "10k",
-                "m": 0.7,
-                "fm": "500",
-                "snr": 50,
-                "shape": "sine",
-                "mode": "DSB-FC",
-                "demod_mode": "Coherent",
-                "phase_error": 45,
-            },
-        }
+        self.presets = PRESETS
 
     def _setup_styles(self):
         self.style = ttk.Style()
@@ -327,24 +210,34 @@ class AMSimulatorGUI:
             tk.StringVar(),
         )
         self.pause_update_var, self.preset_var = tk.BooleanVar(), tk.StringVar()
+        self.live_var = tk.BooleanVar()
+        self.baseband_var = tk.BooleanVar()
+        self.float32_var = tk.BooleanVar()
         (
             self.status_var,
             self.bandwidth_var,
             self.efficiency_var,
             self.insights_var,
             self.thd_var,
+            self.sinad_var,
         ) = (
             tk.StringVar(),
             tk.StringVar(),
             tk.StringVar(),
             tk.StringVar(),
             tk.StringVar(),
+            tk.StringVar(),
         )
         self.fft_center_var, self.fft_span_var = tk.StringVar(), tk.StringVar()
+        self.fft_zoom_var, self.fft_rbw_var = tk.BooleanVar(), tk.StringVar()
         self.marker_info_var = tk.StringVar(value="Marker: (Klik pada plot FFT)")
         self.app_status_var = tk.StringVar(value="Ready")
+        self.profile_var, self.timing_var = tk.BooleanVar(), tk.StringVar()
 
         self.fft_scale_var.set("dB")
+        self.fft_window_var = tk.StringVar(value="Hann")
+        self.fft_overlap_var = tk.StringVar(value="50%")
+        self.fft_averaging_var = tk.StringVar(value="RMS")
         self.shape_display_var.set("Sine")  # Set default display value
         self.shape_var.set("sine")  # Set default internal value
         self.mode_var.set("DSB-FC")
@@ -369,9 +262,20 @@ class AMSimulatorGUI:
         plot_panel.grid(row=0, column=1, sticky="nsew")
         footer_frame = ttk.Frame(main_frame)
         footer_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(10, 0))
-        ttk.Label(
+        self.status_bar = ttk.Label(
             footer_frame, textvariable=self.app_status_var, relief=tk.SUNKEN
-        ).pack(side=tk.LEFT, fill="x", expand=True)
+        )
+        self.status_bar.pack(side=tk.LEFT, fill="x", expand=True)
+        # Shown next to the status bar while "Profil Tahap" is ticked
+        self.timing_label = ttk.Label(
+            footer_frame,
+            textvariable=self.timing_var,
+            relief=tk.SUNKEN,
+            font=("Consolas", 8),
+            cursor="hand2",
+        )
+        self.timing_label.bind("<Button-1>", lambda e: self._show_profile_report())
+        ToolTip(self.timing_label, "Klik untuk histogram latensi per tahap.")
         ttk.Label(
             footer_frame,
             text=FULL_CREDIT,
@@ -498,6 +402,27 @@ class AMSimulatorGUI:
         ttk.Scale(tab, from_=0, to=50, orient="h", variable=self.snr_var).grid(
             row=5, column=0, columnspan=2, sticky="ew"
         )
+        check_button_class = (
+            tb.Checkbutton if TTK_BOOTSTRAP_ENABLED else ttk.Checkbutton
+        )
+        baseband_check = check_button_class(
+            tab, text="Mode Baseband (IQ)", variable=self.baseband_var
+        )
+        baseband_check.grid(row=6, column=0, columnspan=2, sticky="w", pady=(10, 0))
+        ToolTip(
+            baseband_check,
+            "Simulasi selubung kompleks pada laju sesuai bandwidth pesan.\n"
+            "Jauh lebih cepat untuk fc tinggi; passband hanya dibuat untuk plot.",
+        )
+        float32_check = check_button_class(
+            tab, text="Presisi float32", variable=self.float32_var
+        )
+        float32_check.grid(row=7, column=0, columnspan=2, sticky="w")
+        ToolTip(
+            float32_check,
+            "Menyimpan sinyal dalam float32 (separuh memori). Fasa dan filter\n"
+            "tetap dihitung dalam float64; cek akurasi: python am_precision.py",
+        )
         return tab
 
     def _create_display_tab(self, notebook):
@@ -515,21 +440,76 @@ class AMSimulatorGUI:
         ttk.OptionMenu(tab, self.fft_scale_var, "dB", "dB", "Linear").grid(
             row=1, column=1, sticky="ew"
         )
+        ttk.Label(tab, text="Window:").grid(row=2, column=0, sticky="w")
+        ttk.OptionMenu(
+            tab, self.fft_window_var, self.fft_window_var.get(), *SPECTRUM_WINDOWS
+        ).grid(row=2, column=1, sticky="ew")
+        ttk.Label(tab, text="Overlap:").grid(row=3, column=0, sticky="w")
+        ttk.OptionMenu(
+            tab, self.fft_overlap_var, self.fft_overlap_var.get(), "0%", "50%", "75%"
+        ).grid(row=3, column=1, sticky="ew")
+        ttk.Label(tab, text="Averaging:").grid(row=4, column=0, sticky="w")
+        averaging_menu = ttk.OptionMenu(
+            tab, self.fft_averaging_var, self.fft_averaging_var.get(), *AVERAGING_MODES
+        )
+        averaging_menu.grid(row=4, column=1, sticky="ew")
+        ToolTip(
+            averaging_menu,
+            "Rata-rata segmen spektrum sinyal kanal (Welch): Linear, RMS atau Max-hold.",
+        )
         check_button_class = (
             tb.Checkbutton if TTK_BOOTSTRAP_ENABLED else ttk.Checkbutton
         )
         check_button_class(
             tab, text="Pause Update", variable=self.pause_update_var
-        ).grid(row=2, column=0, columnspan=2, pady=10)
+        ).grid(row=5, column=0, pady=10)
+        live_check = check_button_class(
+            tab, text="Live (Streaming)", variable=self.live_var
+        )
+        live_check.grid(row=5, column=1, pady=10)
+        ToolTip(
+            live_check,
+            "Menjalankan pipeline per blok secara kontinu, seperti sweep analyzer nyata.",
+        )
         self.manual_update_button = ttk.Button(
             tab, text="Update Manual", command=self.on_param_change
         )
-        self.manual_update_button.grid(row=3, column=0)
+        self.manual_update_button.grid(row=6, column=0)
         ttk.Button(tab, text="Export Plot...", command=self.export_plot).grid(
-            row=3, column=1
+            row=6, column=1
+        )
+        capture_button = ttk.Button(
+            tab, text="Export Capture...", command=self.export_capture
+        )
+        capture_button.grid(row=7, column=1, pady=(5, 0))
+        ToolTip(
+            capture_button,
+            "Simpan semua tahap sinyal resolusi penuh (.npy/WAV + JSON) untuk analisis offline.",
+        )
+        profile_check = check_button_class(
+            tab,
+            text="Profil Tahap",
+            variable=self.profile_var,
+            command=self._toggle_timing,
+        )
+        profile_check.grid(row=7, column=0, pady=(5, 0))
+        ToolTip(
+            profile_check,
+            "Menampilkan rincian ms per tahap (pipeline, plot, draw, analisis) di status bar.",
+        )
+        ttk.Button(tab, text="Rekam cProfile...", command=self.arm_profile).grid(
+            row=8, column=0, pady=(5, 0)
+        )
+        waterfall_button = ttk.Button(
+            tab, text="Waterfall...", command=self.open_waterfall
+        )
+        waterfall_button.grid(row=8, column=1, pady=(5, 0))
+        ToolTip(
+            waterfall_button,
+            "Spektrogram sinyal kanal yang bergulir: STFT dihitung per blok baru (live) atau per update.",
         )
         ttk.Button(tab, text="Reset to Default", command=self._reset_to_default).grid(
-            row=4, column=0, columnspan=2, pady=(10, 0)
+            row=9, column=0, columnspan=2, pady=(10, 0)
         )
         return tab
 
@@ -553,28 +533,32 @@ class AMSimulatorGUI:
         ttk.Label(frame, textvariable=self.thd_var, font=self.FONT_BOLD).grid(
             row=3, column=1, sticky="w"
         )
-        ttk.Separator(frame, orient="h").grid(row=4, columnspan=2, sticky="ew", pady=5)
+        sinad_label = ttk.Label(frame, text="THD+N / SINAD:")
+        sinad_label.grid(row=4, column=0, sticky="w")
+        ToolTip(
+            sinad_label,
+            "Distorsi + noise hingga harmonik ke-10 relatif terhadap fundamental.",
+        )
+        ttk.Label(frame, textvariable=self.sinad_var).grid(row=4, column=1, sticky="w")
+        ttk.Separator(frame, orient="h").grid(row=5, columnspan=2, sticky="ew", pady=5)
         ttk.Label(
             frame,
             textvariable=self.insights_var,
             wraplength=300,
             justify=tk.LEFT,
             font=self.FONT_ITALIC,
-        ).grid(row=5, columnspan=2, sticky="w")
+        ).grid(row=6, columnspan=2, sticky="w")
         return frame
 
     def _create_plot_panel(self, parent):
-        panel = ttk.Frame(parent)
+        panel = self.plot_panel = ttk.Frame(parent)
         panel.rowconfigure(0, weight=1)
         panel.columnconfigure(0, weight=1)
-        self.fig, self.axs_all = plt.subplots(
-            5, 1, figsize=(9, 8), constrained_layout=True
+        # Placeholder until _finish_startup puts the Matplotlib canvas here
+        self._plot_placeholder = ttk.Label(
+            panel, text="Memuat plot...", anchor="center", font=self.FONT_ITALIC
         )
-        self.axs, self.ax_fft = self.axs_all[:4], self.axs_all[4]
-        self.canvas = FigureCanvasTkAgg(self.fig, master=panel)
-        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
-        toolbar = NavigationToolbar2Tk(self.canvas, panel, pack_toolbar=False)
-        toolbar.grid(row=1, column=0, sticky="ew")
+        self._plot_placeholder.grid(row=0, column=0, sticky="nsew")
 
         fft_ctrl = ttk.Frame(panel)
         fft_ctrl.grid(row=2, column=0, sticky="ew", pady=5)
@@ -584,9 +568,75 @@ class AMSimulatorGUI:
         )
         ttk.Label(fft_ctrl, text="Span:").pack(side=tk.LEFT, padx=(10, 2))
         ttk.Entry(fft_ctrl, textvariable=self.fft_span_var, width=10).pack(side=tk.LEFT)
+        zoom_check = ttk.Checkbutton(
+            fft_ctrl, text="Zoom FFT", variable=self.fft_zoom_var
+        )
+        zoom_check.pack(side=tk.LEFT, padx=(10, 2))
+        ToolTip(
+            zoom_check,
+            "Hanya menghitung pita Center ± Span/2 (DDC + desimasi) dengan RBW pilihan.",
+        )
+        ttk.Label(fft_ctrl, text="RBW:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(fft_ctrl, textvariable=self.fft_rbw_var, width=8).pack(side=tk.LEFT)
         ttk.Label(
             fft_ctrl, textvariable=self.marker_info_var, font=("Consolas", 9)
         ).pack(side=tk.RIGHT, padx=10)
+        return panel
+
+    def _finish_startup(self):
+        """Tahap kedua startup: canvas Matplotlib dibuat setelah jendela tampil."""
+        self._mark_startup("window")
+        from matplotlib.backends.backend_tkagg import (
+            FigureCanvasTkAgg,
+            NavigationToolbar2Tk,
+        )
+
+        panel = self.plot_panel
+        self._create_figure(lambda fig: FigureCanvasTkAgg(fig, master=panel))
+        self._plot_placeholder.destroy()
+        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+        toolbar = NavigationToolbar2Tk(self.canvas, panel, pack_toolbar=False)
+        toolbar.grid(row=1, column=0, sticky="ew")
+
+        # Play buttons are created once and only shown/hidden per update
+        if AUDIO_ENABLED:
+            master_canvas = self.canvas.get_tk_widget()
+            self.play_buttons = {
+                i: ttk.Button(
+                    master_canvas,
+                    text="▶ Play",
+                    command=lambda sig_type=i: self._play_audio(sig_type),
+                    width=8,
+                )
+                for i in (0, 3)
+            }
+        self.fig.canvas.mpl_connect("button_press_event", self.on_fft_click)
+        self._mark_startup("figure")
+        # Pick up a result that finished while the figure was being built
+        self._on_calculation_done()
+
+    def _mark_startup(self, name):
+        if name in self.startup_times:
+            return
+        self.startup_times[name] = time.time()
+        if name == "first_plot" and self.startup_probe:
+            # am_bench.py --startup reads this line from stdout
+            print("AM_STARTUP " + json.dumps(self.startup_times), flush=True)
+            self.root.destroy()
+
+    def _create_figure(self, make_canvas):
+        """Membuat figure, semua artist plot dan lapisan blit (PlotView).
+
+        `make_canvas(fig)` membuat kanvasnya; dipisah dari panel Tk agar
+        am_bench.py dapat merender _update_plots di kanvas Agg tanpa jendela.
+        """
+        from matplotlib.figure import Figure
+
+        # A bare Figure (no pyplot): it is only ever shown on our own canvas
+        self.fig = Figure(figsize=(9, 8), constrained_layout=True)
+        self.axs_all = self.fig.subplots(5, 1)
+        self.axs, self.ax_fft = self.axs_all[:4], self.axs_all[4]
+        self.canvas = make_canvas(self.fig)
 
         self.lines = []
         labels, colors = ["Pesan (msg)", "Carrier", "Sinyal Kanal", "Demodulasi"], [
@@ -605,12 +655,24 @@ class AMSimulatorGUI:
         (self.overmodulation_line,) = self.axs[3].plot(
             [], [], "r--", alpha=0.8, label="Original Envelope"
         )
+        # Envelope guide on the channel plot (hidden for DSB-SC)
+        (line_pos,) = self.axs[2].plot(
+            [], [], "r--", linewidth=1, alpha=0.9, label="Envelope"
+        )
+        (line_neg,) = self.axs[2].plot([], [], "r--", linewidth=1, alpha=0.9)
+        self.envelope_lines = (line_pos, line_neg)
         (self.fft_line,) = self.ax_fft.plot([], [], "c")
         self.fft_marker = self.ax_fft.axvline(0, color="r", ls="--", alpha=0.7)
+        # Static decorations are set once; the render layer keeps them in the
+        # cached background
         for ax in self.axs:
             ax.legend(fontsize="small")
             ax.set_ylabel("Amplitudo (V)")
+            ax.set_xlabel("Waktu (s)")
+            ax.xaxis.set_major_formatter(EngFormatter(unit="s"))
         self.ax_fft.set_ylabel("Magnitudo")
+        self.ax_fft.set_xlabel("Frekuensi (Hz)")
+        self.ax_fft.xaxis.set_major_formatter(EngFormatter(unit="Hz"))
         self.fft_annotations = [
             self.ax_fft.annotate(
                 "",
@@ -622,9 +684,23 @@ class AMSimulatorGUI:
                 fontsize=8,
                 color="orange",
             )
-            for _ in range(3)
+            for _ in range(5)
         ]
-        return panel
+        # Titles carry SNR / demodulator, so they are redrawn with the data
+        self.titles = [ax.set_title("", loc="left", fontsize=10) for ax in self.axs]
+        self.fft_title = self.ax_fft.set_title("", loc="left", fontsize=10)
+
+        self.view = PlotView(self.fig, self.canvas, on_full_draw=self._on_full_draw)
+        self.view.add_artist(
+            *self.lines,
+            self.overmodulation_line,
+            *self.envelope_lines,
+            self.fft_line,
+            self.fft_marker,
+            *self.fft_annotations,
+            *self.titles,
+            self.fft_title,
+        )
 
     def _bind_events(self):
         # NEW: Callback to link the display shape to the internal shape value
@@ -641,7 +717,14 @@ class AMSimulatorGUI:
             self.fft_scale_var,
             self.fft_center_var,
             self.fft_span_var,
+            self.fft_zoom_var,
+            self.fft_rbw_var,
+            self.fft_window_var,
+            self.fft_overlap_var,
+            self.fft_averaging_var,
             self.am_var,
+            self.baseband_var,
+            self.float32_var,
         ]:
             var.trace_add("write", self.on_param_change)
 
@@ -650,7 +733,7 @@ class AMSimulatorGUI:
         for slider_var in (self.m_var, self.phase_error_var, self.snr_var):
             slider_var.trace_add("write", self.on_param_change)
         self.demod_mode_var.trace_add("write", self.toggle_phase_controls)
-        self.fig.canvas.mpl_connect("button_press_event", self.on_fft_click)
+        self.live_var.trace_add("write", self._toggle_live)
         self.toggle_phase_controls()
 
     # NEW: Handler to synchronize internal shape value when UI display changes
@@ -696,12 +779,10 @@ class AMSimulatorGUI:
         self.fft_center_var.set(EngFormatter(unit="Hz")(fc))
 
         # Adjust span for dual tone
-        shape = params.get("shape", "sine")
-        span_mult = 12 if shape == "square" else (8 if shape == "dual_tone" else 4)
-        span = span_mult * fm
+        span = default_fft_span(params.get("shape", "sine"), fm)
         self.fft_span_var.set(EngFormatter(unit="Hz")(span))
 
-        self.start_calculation()
+        self.start_calculation(store=True)
 
     # ... The rest of the code is unchanged until _update_plots ...
     # on_param_change, _update_am_from_m, _update_m_from_am, validators, etc. are identical
@@ -775,19 +856,31 @@ class AMSimulatorGUI:
         self.load_preset("Default (Modulasi Baik)")
 
     def export_plot(self):
+        if self.view is None:
+            return
         fp = filedialog.asksaveasfilename(
             defaultextension=".png", filetypes=[("PNG", "*.png"), ("SVG", "*.svg")]
         )
         if fp:
-            self.fig.savefig(fp, dpi=300, bbox_inches="tight")
+            self.view.savefig(fp, dpi=300, bbox_inches="tight")
             self.app_status_var.set(f"Plot saved to {fp}")
 
+    def export_capture(self):
+        if not self.signals or self._signal_params is None:
+            return
+        fp = filedialog.asksaveasfilename(
+            defaultextension=".amcap", filetypes=[("AM Capture (folder)", "*.amcap")]
+        )
+        if fp:
+            try:
+                save_capture(fp, self._signal_params, self.signals, self.processor)
+            except OSError as e:
+                self.app_status_var.set(f"Error: Capture gagal disimpan ({e}).")
+                return
+            self.app_status_var.set(f"Capture saved to {fp}")
+
     def parse_input(self, s):
-        s = str(s).strip().lower().replace("hz", "").strip()
-        mult = {"k": 1e3, "m": 1e6, "g": 1e9}
-        if not s:
-            raise ValueError("Input string is empty")
-        return float(s[:-1]) * mult[s[-1]] if s and s[-1] in mult else float(s)
+        return parse_input(s)
 
     def on_fft_click(self, event):
         if event.inaxes != self.ax_fft:
@@ -798,79 +891,118 @@ class AMSimulatorGUI:
         self.marker_info_var.set(
             f"Marker: {EngFormatter(unit='Hz')(x)} @ {y:.2f} {unit}"
         )
-        self.canvas.draw_idle()
-
-    def start_calculation(self):
-        if self.is_calculating:
-            self.app_status_var.set("Calculation in progress, please wait...")
-            return
-
-        self.is_calculating = True
-        self._set_ui_state(tk.DISABLED)
-        self.app_status_var.set("Calculating...")
+        self.view.render()
 
+    def start_calculation(self, store=False):
+        if self._settle_job is not None:
+            self.root.after_cancel(self._settle_job)
+            self._settle_job = None
         params = self._parse_inputs()
         if params is None:
             self.app_status_var.set(
                 "Error: Input tidak valid. Periksa nilai yang ditandai merah."
             )
-            self._set_ui_state(tk.NORMAL)
-            self.is_calculating = False
             return
 
-        thread = threading.Thread(
-            target=self._calculation_worker, args=(params,), daemon=True
-        )
-        thread.start()
+        # A store job recomputes the displayed (unseeded) configuration with
+        # the fixed seed, so it never takes the view-only shortcut
+        if not store and self._is_view_only_change(params):
+            # Panning/zooming the FFT or toggling dB/linear only redraws
+            self._signal_params = params
+            self._update_fft_view(params, self.signals)
+            self.view.render()
+            return
 
-    def _calculation_worker(self, params):
-        try:
-            signals = self._generate_signals(params)
-            self.calculation_queue.put({"params": params, "signals": signals})
-        except Exception as e:
-            self.calculation_queue.put({"error": str(e)})
+        if store:
+            params["store"] = True
+        if self.stream is not None:
+            self._update_stream_params(params)
 
-    def _check_calculation_queue(self):
-        try:
-            result = self.calculation_queue.get_nowait()
-            if "error" in result:
-                self.app_status_var.set(f"Calculation Error: {result['error']}")
-            else:
-                self._process_calculation_result(result)
+        # Supersedes (and cancels) any job that is still queued or running
+        self.scheduler.submit(params)
+        self.app_status_var.set("Calculating...")
 
-            self._set_ui_state(tk.NORMAL)
-            self.is_calculating = False
-        except queue.Empty:
+    def _is_view_only_change(self, params):
+        # A queued or running job replaces the display when it lands, so
+        # "unchanged" is only meaningful once the scheduler is idle
+        if not self.signals or self._signal_params is None or self.scheduler.busy:
+            return False
+        # In zoom mode center/span select the computed band, not just the view
+        view_keys = ("fft_scale",) if params.get("fft_zoom") else self.VIEW_KEYS
+        view_keys += ("store",)
+        old = {k: v for k, v in self._signal_params.items() if k not in view_keys}
+        new = {k: v for k, v in params.items() if k not in view_keys}
+        return old == new
+
+    def _notify_calculation_done(self):
+        # Called from the worker thread; event_generate is safe across threads
+        try:
+            self.root.event_generate("<<CalculationDone>>", when="tail")
+        except (tk.TclError, RuntimeError):
             pass
-        finally:
-            self.root.after(100, self._check_calculation_queue)
 
-    def _process_calculation_result(self, result):
-        self.signals = result["signals"]
-        self._update_plots(result["params"], self.signals)
-        self._update_analysis(result["params"], self.signals)
-        self.app_status_var.set("Ready")
-
-    def _set_ui_state(self, state):
-        self.root.config(cursor="watch" if state == tk.DISABLED else "")
-        for widget in self.controls_panel.winfo_children():
-            try:
-                widget.config(state=state)
-                if isinstance(widget, (ttk.Frame, ttk.LabelFrame, ttk.Notebook)):
-                    for child in widget.winfo_children():
-                        self._set_widget_state_recursively(child, state)
-            except tk.TclError:
-                pass
-        if self.pause_update_var.get():
-            self.manual_update_button.config(state=tk.NORMAL)
+    def _on_calculation_done(self, event=None):
+        if self.view is None:
+            # Still starting up; _finish_startup takes the result
+            return
+        job = self.scheduler.take_result()
+        if job is None:
+            return
+        if "error" in job:
+            self.app_status_var.set(f"Calculation Error: {job['error']}")
+        else:
+            self._process_calculation_result(job)
 
-    def _set_widget_state_recursively(self, parent_widget, state):
-        try:
-            parent_widget.config(state=state)
-        except tk.TclError:
-            pass
-        for child in parent_widget.winfo_children():
-            self._set_widget_state_recursively(child, state)
+    def _process_calculation_result(self, result):
+        self.signals, timings = result["result"]
+        self._latency_ms = result["latency_ms"]
+        self._signal_params = result["params"]
+        self.profiler.begin_update()
+        self.profiler.record_many(timings, "pipeline.")
+        self.profiler.profiled(
+            self._present_result, result["params"], self.signals, keep=True
+        )
+        status = self._ready_status()
+        if self.profiler.armed:
+            path = self.profiler.finish()
+            status += f" | Profil disimpan ke {path}" if path else ""
+        self.app_status_var.set(status)
+        self._refresh_timing()
+        self._follow_audio()
+        self._schedule_cache_store(result["params"], timings)
+        if self.stream is None:
+            self._feed_waterfall_result(self._signal_params, self.signals)
+        if "first_plot" not in self.startup_times:
+            # Queued behind the canvas' own idle draw
+            self.root.after_idle(self._mark_startup, "first_plot")
+
+    def _schedule_cache_store(self, p, timings):
+        # Interactive results draw fresh noise and are not cached; once the
+        # parameters settle, the seeded result is computed and stored
+        if self.cache is None or self.stream is not None:
+            return
+        if p.get("store") or "cache" in timings:
+            return
+        self._settle_job = self.root.after(self.CACHE_SETTLE_MS, self._store_settled)
+
+    def _store_settled(self):
+        self._settle_job = None
+        self.start_calculation(store=True)
+
+    def _present_result(self, p, s):
+        self._update_plots(p, s)
+        with self.profiler.stage("analysis"):
+            self._update_analysis(p, s)
+        if self.profiler.armed:
+            # Flush the queued full draw so Matplotlib lands in the profile
+            self.root.update_idletasks()
+
+    def _ready_status(self):
+        return (
+            f"Ready | sr: {EngFormatter(unit='Hz')(self.signals['sr'])}"
+            f" | Durasi: {EngFormatter(unit='s')(self.signals['duration'])}"
+            f" | {self._latency_ms:.0f} ms"
+        )
 
     def _parse_inputs(self):
         try:
@@ -885,7 +1017,18 @@ class AMSimulatorGUI:
                 "fft_scale": self.fft_scale_var.get(),
                 "demod_mode": self.demod_mode_var.get(),
                 "phase_error": float(self.phase_error_var.get()),
+                "baseband": self.baseband_var.get(),
+                "precision": "float32" if self.float32_var.get() else "float64",
+                "fft_window": SPECTRUM_WINDOWS[self.fft_window_var.get()],
+                "fft_overlap": float(self.fft_overlap_var.get().rstrip("%")) / 100,
+                "fft_averaging": AVERAGING_MODES[self.fft_averaging_var.get()],
+                "fft_zoom": self.fft_zoom_var.get(),
             }
+            try:
+                # Blank (or invalid) RBW means automatic
+                p["fft_rbw"] = self.parse_input(self.fft_rbw_var.get()) or None
+            except (ValueError, IndexError):
+                p["fft_rbw"] = None
             try:
                 p["fft_center"] = (
                     self.parse_input(s)
@@ -895,17 +1038,13 @@ class AMSimulatorGUI:
             except (ValueError, IndexError):
                 p["fft_center"] = p["fc"]
             try:
-                shape = p["shape"]
-                mult = 12 if shape == "square" else (8 if shape == "dual_tone" else 4)
                 p["fft_span"] = (
                     self.parse_input(s)
                     if (s := str(self.fft_span_var.get()).strip()) != ""
-                    else mult * p["fm"]
+                    else default_fft_span(p["shape"], p["fm"])
                 )
             except (ValueError, IndexError):
-                shape = p["shape"]
-                mult = 12 if shape == "square" else (8 if shape == "dual_tone" else 4)
-                p["fft_span"] = mult * p["fm"]
+                p["fft_span"] = default_fft_span(p["shape"], p["fm"])
             if (
                 any(v <= 0 for v in [p["fc"], p["fm"], p["Ac"], p["fft_span"]])
                 or p["Am"] < 0
@@ -916,144 +1055,146 @@ class AMSimulatorGUI:
         except (ValueError, tk.TclError):
             return None
 
-    def _generate_signals(self, p):
-        MAX_SAMPLING_RATE = 10e6
-        required_sr = max(5 * p["fc"], 20 * p["fm"], 44100)
-        if p["shape"] == "dual_tone":
-            required_sr = max(
-                required_sr, 20 * (3 * p["fm"])
-            )  # For higher harmonic of dual_tone
-
-        if required_sr > MAX_SAMPLING_RATE:
-            max_fc_str = EngFormatter(unit="Hz")(MAX_SAMPLING_RATE / 5)
-            raise ValueError(
-                f"Frekuensi Carrier terlalu tinggi. Coba nilai di bawah {max_fc_str}."
-            )
-
-        sr = required_sr
-        t = self.processor.gen_time_vector(2.0, sr, self.MAX_SAMPLES * 2)
-        msg = self.processor.gen_message_signal(t, p["Am"], p["fm"], p["shape"])
-        carrier = self.processor.gen_carrier_signal(t, p["Ac"], p["fc"])
-        mod = self.processor.modulate(msg, carrier, p["Ac"], p["mode"])
-        noisy = self.processor.add_noise(mod, p["snr_db"])
-        demod_func = (
-            self.processor.coherent_demodulate
-            if p["demod_mode"] == "Coherent"
-            else self.processor.envelope_demodulate
-        )
-        demod = (
-            demod_func(noisy, t, p["fc"], p["phase_error"], p["fm"], sr)
-            if p["demod_mode"] == "Coherent"
-            else demod_func(noisy, p["fm"], sr)
-        )
-
-        plot_samples = int((5 / p["fm"]) * sr)
-        plot_samples = min(plot_samples, len(mod), self.MAX_SAMPLES)
-
-        fft_samples = min(len(mod), 2**16)
-        freq, mag_lin, mag_db = self.processor.calc_fft(mod[:fft_samples], sr)
-        thd = self.processor.calculate_thd(demod, p["fm"], sr)
-
-        return {
-            "t": t,
-            "msg": msg,
-            "carrier": carrier,
-            "noisy": noisy,
-            "demod": demod,
-            "freq": freq,
-            "mag_lin": mag_lin,
-            "mag_db": mag_db,
-            "thd": thd,
-            "sr": sr,
-            "plot_samples": plot_samples,
-        }
+    def _generate_signals(self, p, cancelled=None):
+        # Worker thread: the stage timings travel back with the result
+        return self.profiler.profiled(self._run_pipeline, p, cancelled)
+
+    def _run_pipeline(self, p, cancelled):
+        timings = {}
+
+        def compute(q):
+            # Only the stages whose inputs changed are recomputed
+            s = self.pipeline.run(q, cancelled)
+            timings.update(self.pipeline.last_timings)
+            return s
+
+        if self.cache is None:
+            return compute(p), timings
+        start = time.perf_counter()
+        # Only results that go into the cache use the fixed noise seed
+        seeded = with_seed(p)
+        s = self.cache.get(seeded)
+        if s is None and p.get("store"):
+            s = compute(seeded)
+            # One bounded writer thread; the GUI never waits for the disk
+            self.cache.put_later(seeded, s)
+        elif s is None:
+            s = compute(p)
+        if not timings:
+            timings["cache"] = (time.perf_counter() - start) * 1e3
+        return s, timings
 
     def _update_plots(self, p, s):
-        for btn in self.play_buttons:
-            btn.destroy()
-        self.play_buttons.clear()
-
-        t_plot = s["t"][: s["plot_samples"]]
-        self.lines[0].set_data(t_plot, s["msg"][: s["plot_samples"]])
-        self.lines[1].set_data(t_plot, s["carrier"][: s["plot_samples"]])
-        self.lines[2].set_data(t_plot, s["noisy"][: s["plot_samples"]])
-        self.lines[3].set_data(t_plot, s["demod"][: s["plot_samples"]])
-
-        max_demod = (
-            np.max(np.abs(s["demod"][: s["plot_samples"]]))
-            if s["plot_samples"] > 0
-            else 1
-        )
-        max_msg = (
-            np.max(np.abs(s["msg"][: s["plot_samples"]]))
-            if s["plot_samples"] > 0
-            else 1
-        )
-        scaled_msg = (
-            s["msg"][: s["plot_samples"]] * (max_demod / max_msg)
-            if max_msg > 1e-9
-            else s["msg"][: s["plot_samples"]]
-        )
-        self.lines[4].set_data(t_plot, scaled_msg)
-
-        # MODIFIED: Add analytical envelope to the modulated signal plot for clarity at high fc
-        if not hasattr(self, "envelope_lines"):
-            (line_pos,) = self.axs[2].plot(
-                [], [], "r--", linewidth=1, alpha=0.9, label="Envelope"
-            )
-            (line_neg,) = self.axs[2].plot([], [], "r--", linewidth=1, alpha=0.9)
-            self.envelope_lines = (line_pos, line_neg)
-
+        with self.profiler.stage("plot.data"):
+            if self.stream is None:
+                self._set_plot_data(p, s)
+            else:
+                # Live mode: the stream owns the time traces, the result
+                # only refreshes the spectrum
+                self._update_plot_titles_and_audio(p)
+                self._update_fft_view(p, s)
+        # A full draw that runs synchronously inside render() (non-Tk canvas)
+        # is already recorded as plot.draw
+        self._draw_in_render = 0.0
+        start = time.perf_counter()
+        self.view.render()
+        render_ms = (time.perf_counter() - start) * 1e3 - self._draw_in_render
+        self.profiler.record("plot.render", render_ms)
+
+    def _set_plot_data(self, p, s):
+        n = s["plot_samples"]
+        t_plot = s["t"][:n]
+        # Baseband results carry passband carrier/channel only for the plot window
+        t_pass = s["t_pass"] if "t_pass" in s else t_plot
+        msg = s["msg"][:n]
+        self.view.set_line_data(self.lines[0], t_plot, msg)
+        self.view.set_line_data(self.lines[1], t_pass, s["carrier"][: len(t_pass)])
+        self.view.set_line_data(self.lines[2], t_pass, s["noisy"][: len(t_pass)])
+        self.view.set_line_data(self.lines[3], t_plot, s["demod"][:n])
+
+        max_demod = np.max(np.abs(s["demod"][:n])) if n > 0 else 1
+        max_msg = np.max(np.abs(msg)) if n > 0 else 1
+        scaled_msg = msg * (max_demod / max_msg) if max_msg > 1e-9 else msg
+        self.view.set_line_data(self.lines[4], t_plot, scaled_msg)
+
+        # Analytical envelope on the modulated signal plot for clarity at high fc
         if p["mode"] == "DSB-FC":
-            envelope_pos = p["Ac"] + s["msg"][: s["plot_samples"]]
-            envelope_neg = -(p["Ac"] + s["msg"][: s["plot_samples"]])
-            self.envelope_lines[0].set_data(t_plot, envelope_pos)
-            self.envelope_lines[1].set_data(t_plot, envelope_neg)
+            self.view.set_line_data(self.envelope_lines[0], t_plot, p["Ac"] + msg)
+            self.view.set_line_data(self.envelope_lines[1], t_plot, -(p["Ac"] + msg))
         else:  # Hide for DSB-SC
-            self.envelope_lines[0].set_data([], [])
-            self.envelope_lines[1].set_data([], [])
+            self.view.set_line_data(self.envelope_lines[0], [], [])
+            self.view.set_line_data(self.envelope_lines[1], [], [])
 
         self.overmodulation_line.set_visible(p["m"] > 1 and p["mode"] == "DSB-FC")
         if self.overmodulation_line.get_visible():
-            self.overmodulation_line.set_data(t_plot, np.abs(scaled_msg))
-
-        y_fft = s["mag_db"] if p["fft_scale"] == "dB" else s["mag_lin"]
-        self.fft_line.set_data(s["freq"], y_fft)
+            self.view.set_line_data(
+                self.overmodulation_line, t_plot, np.abs(scaled_msg)
+            )
 
         time_limit = t_plot[-1] if len(t_plot) > 0 else 0.005
-
         for ax in self.axs:
-            ax.relim()
-            ax.autoscale_view(scaley=True)
-            ax.set_xlim(0, time_limit)
-            ax.xaxis.set_major_formatter(EngFormatter(unit="s"))
-            ax.set_xlabel("Waktu (s)")
-            ax.legend(fontsize="small")
+            self.view.set_limits(ax, xlim=(0, time_limit))
+            self.view.fit_y(ax)
+
+        self._update_plot_titles_and_audio(p)
+        self._update_fft_view(p, s)
+
+    def _on_full_draw(self, ms):
+        # Full redraws run later from draw_idle; they count toward the last update
+        self.profiler.record("plot.draw", ms)
+        self._draw_in_render += ms
+        self._refresh_timing()
+
+    def _refresh_timing(self):
+        if self.timing_visible:
+            self.timing_var.set(self.profiler.breakdown(self.TIMING_GROUPS))
+
+    def _toggle_timing(self):
+        self.timing_visible = self.profile_var.get()
+        if self.timing_visible:
+            self.timing_label.pack(side=tk.LEFT, padx=(5, 0), after=self.status_bar)
+            self._refresh_timing()
+        else:
+            self.timing_label.pack_forget()
+
+    def _show_profile_report(self):
+        win = tk.Toplevel(self.root)
+        win.title("Profil Latensi per Tahap")
+        text = tk.Text(win, width=110, height=24, font=("Consolas", 9))
+        text.insert("1.0", self.profiler.report())
+        text.config(state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True)
 
-        self.ax_fft.set_xlim(
-            p["fft_center"] - p["fft_span"] / 2, p["fft_center"] + p["fft_span"] / 2
+    def arm_profile(self):
+        fp = filedialog.asksaveasfilename(
+            defaultextension=".prof",
+            filetypes=[("cProfile stats", "*.prof"), ("All Files", "*.*")],
         )
-        try:
-            mask = (s["freq"] >= self.ax_fft.get_xlim()[0]) & (
-                s["freq"] <= self.ax_fft.get_xlim()[1]
-            )
-            y_vis = y_fft[mask]
-            if len(y_vis) > 0:
-                y_min, y_max = np.min(y_vis), np.max(y_vis)
-                self.ax_fft.set_ylim(
-                    y_min - 0.1 * (y_max - y_min), y_max + 0.1 * (y_max - y_min)
-                )
-            else:
-                self.ax_fft.autoscale_view()
-        except (ValueError, IndexError):
-            self.ax_fft.relim()
-            self.ax_fft.autoscale_view()
+        if fp:
+            self.profiler.arm(fp)
+            self.app_status_var.set(f"Profil aktif: update berikutnya disimpan ke {fp}")
 
-        self._update_plot_titles_and_audio(p)
+    def _update_fft_view(self, p, s):
+        y_fft = s["mag_db"] if p["fft_scale"] == "dB" else s["mag_lin"]
+        self.fft_line.set_data(s["freq"], y_fft)
+        self.fft_title.set_text(
+            f"5. Spektrum Frekuensi ({'Zoom' if p.get('fft_zoom') else 'Welch'})"
+            f" | RBW: {EngFormatter(unit='Hz')(s['rbw'])}"
+        )
+        xlim = (
+            p["fft_center"] - p["fft_span"] / 2,
+            p["fft_center"] + p["fft_span"] / 2,
+        )
+        self.view.set_limits(self.ax_fft, xlim=xlim)
+        # Fit exactly to the visible part of the spectrum (no hysteresis)
+        mask = (s["freq"] >= xlim[0]) & (s["freq"] <= xlim[1])
+        y_vis = y_fft[mask]
+        if len(y_vis) > 0:
+            y_min, y_max = np.min(y_vis), np.max(y_vis)
+            pad = 0.1 * (y_max - y_min) or 1.0
+            self.view.set_limits(self.ax_fft, ylim=(y_min - pad, y_max + pad))
         self._update_fft_annotations(p, s, y_fft)
-        self.canvas.draw_idle()
 
-    # ... The rest of the file is identical ...
     def _update_plot_titles_and_audio(self, p):
         titles = [
             "1. Sinyal Pesan (Message)",
@@ -1061,24 +1202,18 @@ class AMSimulatorGUI:
             f'3. Sinyal Termodulasi di Kanal (SNR: {p["snr_db"]:.0f}dB)',
             f'4. Hasil Demodulasi ({p["demod_mode"]})',
         ]
-        master_canvas = self.canvas.get_tk_widget()
+        for title, text in zip(self.titles, titles):
+            title.set_text(text)
 
-        for i, (ax, title) in enumerate(zip(self.axs, titles)):
-            ax.set_title(title, loc="left", fontsize=10)
-            if AUDIO_ENABLED and i in [0, 3] and 20 < p["fm"] < 20000:
-                btn = ttk.Button(
-                    master_canvas,
-                    text="▶ Play",
-                    command=lambda sig_type=i: self._play_audio(sig_type),
-                    width=8,
-                )
-                bbox = ax.get_position()
+        show = 20 < p["fm"] < 20000
+        for i, btn in self.play_buttons.items():
+            if show:
+                bbox = self.axs[i].get_position()
                 btn.place(relx=bbox.x1, rely=1 - bbox.y1, x=-5, y=5, anchor="ne")
-                self.play_buttons.append(btn)
-
-        self.ax_fft.set_title("5. Spektrum Frekuensi (Zoom)", loc="left", fontsize=10)
-        self.ax_fft.xaxis.set_major_formatter(EngFormatter(unit="Hz"))
-        self.ax_fft.set_xlabel("Frekuensi (Hz)")
+            else:
+                btn.place_forget()
+        if not show:
+            self._stop_audio()
 
     def _update_fft_annotations(self, p, s, y_fft):
         if p["shape"] == "dual_tone":
@@ -1095,38 +1230,18 @@ class AMSimulatorGUI:
         # Hide all annotations first
         for ann in self.fft_annotations:
             ann.set_visible(False)
-        # Resize if needed
-        while len(self.fft_annotations) < len(freqs):
-            self.fft_annotations.append(
-                self.ax_fft.annotate(
-                    "",
-                    xy=(0, 0),
-                    xytext=(0, 5),
-                    textcoords="offset points",
-                    ha="center",
-                    va="bottom",
-                    fontsize=8,
-                    color="orange",
-                )
-            )
 
-        for i, (label, freq) in enumerate(freqs.items()):
-            ann = self.fft_annotations[i]
-            if (
-                len(s["freq"]) > 0
-                and self.ax_fft.get_xlim()[0] < freq < self.ax_fft.get_xlim()[1]
-            ):
+        x_lo, x_hi = self.ax_fft.get_xlim()
+        for ann, (label, freq) in zip(self.fft_annotations, freqs.items()):
+            if len(s["freq"]) > 0 and x_lo < freq < x_hi:
                 idx = np.argmin(np.abs(s["freq"] - freq))
                 ann.set_text(label)
                 ann.xy = (freq, y_fft[idx])
                 ann.set_visible(True)
 
     def _update_analysis(self, p, s):
-        status = (
-            "Undermodulation"
-            if p["m"] < 0.99
-            else "100% Modulation" if p["m"] <= 1.01 else "Overmodulation"
-        )
+        metrics = compute_metrics(p, s, self.processor)
+        status = metrics["status"]
         colors = {
             "Undermodulation": "blue",
             "100% Modulation": "green",
@@ -1134,11 +1249,11 @@ class AMSimulatorGUI:
         }
         self.status_label.config(foreground=colors.get(status, "black"))
         self.status_var.set(f"m: {p['m']:.2f} | {status}")
-        power = self.processor.calc_power(p["Ac"], p["m"], p["mode"])
-        self.efficiency_var.set(f"{power['eff']:.2f}%")
-        bw_mult = 6 if p["shape"] == "dual_tone" else 2
-        self.bandwidth_var.set(EngFormatter(unit="Hz")(bw_mult * p["fm"]))
+        self.efficiency_var.set(f"{metrics['efficiency']:.2f}%")
+        self.bandwidth_var.set(EngFormatter(unit="Hz")(metrics["bandwidth"]))
         self.thd_var.set(f"{s['thd']:.2f} %" if s["thd"] < 100 else ">100%")
+        thd_n = f"{s['thd_n']:.2f} %" if s["thd_n"] < 100 else ">100%"
+        self.sinad_var.set(f"{thd_n} | {metrics['sinad']:.1f} dB")
         ins = []
         if p["m"] > 1:
             ins.append(
@@ -1162,19 +1277,238 @@ class AMSimulatorGUI:
             )
         self.insights_var.set("INSIGHT: " + textwrap.fill(ins[0], width=50))
 
+    # --- Live (Streaming) Mode ---
+    def _toggle_live(self, *args):
+        if self.live_var.get():
+            params = self._parse_inputs()
+            if params is None:
+                self.app_status_var.set("Error: Input tidak valid untuk mode live.")
+                self.live_var.set(False)
+                return
+            try:
+                self.stream = StreamingPipeline(params, self.LIVE_BLOCK_SIZE)
+            except ValueError as e:
+                self.app_status_var.set(f"Calculation Error: {e}")
+                self.live_var.set(False)
+                return
+            self._update_stream_params(params)
+            self._live_tick()
+        else:
+            if self._live_job:
+                self.root.after_cancel(self._live_job)
+            self.stream, self.stream_view, self._live_job = None, None, None
+            self.start_calculation()
+
+    def _update_stream_params(self, params):
+        try:
+            self.stream.update_params(params)
+        except ValueError as e:
+            self.app_status_var.set(f"Calculation Error: {e}")
+            return
+        window = min(int((5 / params["fm"]) * self.stream.sr), MAX_SAMPLES)
+        if self.stream_view is None or self.stream_view.window != window:
+            self.stream_view = StreamView(max(window, 2))
+        self._live_params = params
+
+    def _live_tick(self):
+        if self.stream is None:
+            return
+        # Real-time block budget per tick, capped so high sr runs as a sweep
+        wanted = self.stream.sr * self.LIVE_INTERVAL_MS / 1000
+        n_blocks = int(
+            min(max(1, wanted // self.LIVE_BLOCK_SIZE), self.LIVE_MAX_BLOCKS)
+        )
+        new_rows = 0
+        for block in self.stream.blocks(n_blocks):
+            self.stream_view.push(block)
+            new_rows += self._push_waterfall(block["noisy"], block["sr"])
+        if new_rows:
+            self._render_waterfall()
+        if self.view is not None:
+            self._update_live_lines(self._live_params, self.stream_view.snapshot())
+        self._live_job = self.root.after(self.LIVE_INTERVAL_MS, self._live_tick)
+
+    def _update_live_lines(self, p, snap):
+        if len(snap["t"]) < 2:
+            return
+        # Time relative to the window start keeps the x-limits (and so the
+        # cached background) fixed while the stream scrolls
+        t = snap["t"] - snap["t"][0]
+        for line, key in zip(self.lines, ("msg", "carrier", "noisy", "demod")):
+            self.view.set_line_data(line, t, snap[key])
+        max_msg = np.max(np.abs(snap["msg"]))
+        scaled_msg = (
+            snap["msg"] * (np.max(np.abs(snap["demod"])) / max_msg)
+            if max_msg > 1e-9
+            else snap["msg"]
+        )
+        self.view.set_line_data(self.lines[4], t, scaled_msg)
+        if p["mode"] == "DSB-FC":
+            envelope = p["Ac"] + snap["msg"]
+            self.view.set_line_data(self.envelope_lines[0], t, envelope)
+            self.view.set_line_data(self.envelope_lines[1], t, -envelope)
+        else:  # Hide for DSB-SC
+            self.view.set_line_data(self.envelope_lines[0], [], [])
+            self.view.set_line_data(self.envelope_lines[1], [], [])
+        self.overmodulation_line.set_visible(False)
+        window = (self.stream_view.window - 1) / self.stream.sr
+        for ax in self.axs:
+            self.view.set_limits(ax, xlim=(0, window))
+            self.view.fit_y(ax)
+        self.view.render()
+
+    # --- Waterfall (Spektrogram) ---
+    def open_waterfall(self):
+        if self.waterfall_view is not None:
+            self.waterfall_window.lift()
+            return
+        if self.view is None:
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        win = self.waterfall_window = tk.Toplevel(self.root)
+        win.title("Waterfall - Sinyal Kanal")
+        win.geometry("800x550")
+        win.protocol("WM_DELETE_WINDOW", self._close_waterfall)
+        canvas = self._create_waterfall_figure(
+            lambda fig: FigureCanvasTkAgg(fig, master=win)
+        )
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        if self.stream is None and self.signals:
+            self._feed_waterfall_result(self._signal_params, self.signals)
+
+    def _create_waterfall_figure(self, make_canvas):
+        """Figure waterfall: satu image RGBA yang di-blit, plus colorbar statis."""
+        from matplotlib import colormaps
+        from matplotlib.cm import ScalarMappable
+        from matplotlib.colors import Normalize
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8, 5.5), constrained_layout=True)
+        ax = self.ax_waterfall = fig.add_subplot()
+        canvas = make_canvas(fig)
+        # Limits are set explicitly; cropping the image must not move them
+        ax.set_autoscale_on(False)
+        self.waterfall_image = ax.imshow(
+            np.zeros((1, 1, 4), np.uint8),
+            aspect="auto",
+            origin="lower",
+            interpolation="nearest",
+        )
+        # The image is coloured per row by Waterfall; the colorbar only shows
+        # the same mapping
+        self.waterfall_colors = ScalarMappable(
+            Normalize(-self.WATERFALL_RANGE_DB, 0), colormaps["viridis"]
+        )
+        fig.colorbar(self.waterfall_colors, ax=ax, label="Magnitudo (dB)")
+        ax.set_xlabel("Frekuensi (Hz)")
+        ax.set_ylabel("Baris STFT (0 = terbaru)")
+        ax.xaxis.set_major_formatter(EngFormatter(unit="Hz"))
+        self.waterfall_view = PlotView(fig, canvas)
+        self.waterfall_view.add_artist(self.waterfall_image)
+        return canvas
+
+    def _close_waterfall(self):
+        self.waterfall_window.destroy()
+        self.waterfall, self.waterfall_view = None, None
+
+    def _reset_waterfall(self, sr, fc=None):
+        # New frequency axis: start an empty history
+        self.waterfall = Waterfall(sr, fc=fc)
+        self.waterfall.set_colormap(
+            self.waterfall_colors.get_cmap(), *self.waterfall_colors.get_clim()
+        )
+        rows = self.waterfall.rows
+        self.waterfall_view.set_limits(self.ax_waterfall, ylim=(-rows, 0))
+        self.waterfall_view.invalidate()
+
+    def _push_waterfall(self, x, sr):
+        """Menambah blok stream ke waterfall; mengembalikan jumlah baris baru."""
+        if self.waterfall_view is None:
+            return 0
+        wf = self.waterfall
+        if wf is None or wf.sr != sr or wf.fc is not None:
+            self._reset_waterfall(sr)
+        return self.waterfall.push(x)
+
+    def _feed_waterfall_result(self, p, s):
+        # Each result is a separate capture: a few rows from its start only.
+        # Baseband results carry the full-length signal only as IQ
+        if self.waterfall_view is None:
+            return
+        x, fc = (s["noisy_iq"], p["fc"]) if "noisy_iq" in s else (s["noisy"], None)
+        wf = self.waterfall
+        if wf is None or wf.sr != s["sr"] or wf.fc != fc:
+            self._reset_waterfall(s["sr"], fc)
+        n = self.waterfall.samples_for(self.WATERFALL_ROWS_PER_UPDATE)
+        if self.waterfall.push(x[:n], restart=True):
+            self._render_waterfall()
+
+    def _render_waterfall(self):
+        wf, view = self.waterfall, self.waterfall_view
+        # Colour range follows the peak with hysteresis; a change recolours
+        # the history and redraws the colorbar, so it must stay rare
+        peak = float(np.max(wf.image()))
+        vmin, vmax = self.waterfall_colors.get_clim()
+        if peak > vmax or peak < vmax - self.WATERFALL_RANGE_DB / 4:
+            vmax = np.ceil(peak / 10) * 10 + 10
+            vmin = vmax - self.WATERFALL_RANGE_DB
+            self.waterfall_colors.set_clim(vmin, vmax)
+            wf.set_colormap(self.waterfall_colors.get_cmap(), vmin, vmax)
+            view.invalidate()
+        # Same frequency window as the FFT panel; only the visible columns
+        # are handed to set_data (drawing cost scales with the image size)
+        xlim = self.ax_fft.get_xlim()
+        x_lo, x_hi = sorted(xlim)
+        lo = max(int(np.searchsorted(wf.freq, x_lo)) - 1, 0)
+        hi = min(int(np.searchsorted(wf.freq, x_hi)) + 1, len(wf.freq))
+        hi = max(hi, lo + 1)
+        df = wf.freq[1] - wf.freq[0]
+        self.waterfall_image.set_data(wf.image(rgba=True)[:, lo:hi])
+        self.waterfall_image.set_extent(
+            (wf.freq[lo] - df / 2, wf.freq[hi - 1] + df / 2, -wf.rows, 0)
+        )
+        view.set_limits(self.ax_waterfall, xlim=xlim)
+        view.render()
+
     def _play_audio(self, signal_type):
         if not AUDIO_ENABLED:
             self.app_status_var.set("Error: Pustaka 'sounddevice' tidak ditemukan.")
             return
+        if self._audio_source == signal_type:
+            # Second click on the same button stops the loop
+            self._stop_audio()
+            return
         signal_data = self.signals["msg"] if signal_type == 0 else self.signals["demod"]
         if signal_data is None or len(signal_data) == 0:
             return
         try:
-            norm_sig = signal_data / (np.max(np.abs(signal_data)) + 1e-9)
-            sd.stop()
-            sd.play(norm_sig.astype(np.float32), int(self.signals["sr"]))
+            if self.audio is None:
+                self.audio = AudioPlayer(SoundDeviceSink())
+            # Loops until stopped; new results are crossfaded in (_follow_audio)
+            self.audio.play(signal_data, self.signals["sr"])
         except Exception as e:
             self.app_status_var.set(f"Kesalahan pemutaran audio: {e}")
+            return
+        self._audio_source = signal_type
+        self._update_play_buttons()
+
+    def _follow_audio(self):
+        if self._audio_source is None:
+            return
+        key = "msg" if self._audio_source == 0 else "demod"
+        self.audio.play(self.signals[key], self.signals["sr"])
+
+    def _stop_audio(self):
+        if self._audio_source is None:
+            return
+        self.audio.stop()
+        self._audio_source = None
+        self._update_play_buttons()
+
+    def _update_play_buttons(self):
+        for i, btn in self.play_buttons.items():
+            btn.config(text="■ Stop" if i == self._audio_source else "▶ Play")
 
 
 if __name__ == "__main__":
@@ -1189,4 +1523,6 @@ if __name__ == "__main__":
         )
         root = tk.Tk()
     app = AMSimulatorGUI(root)
+    # Set by am_bench.py --startup: print the milestones and exit at first plot
+    app.startup_probe = bool(os.environ.get("AM_STARTUP_PROBE"))
     root.mainloop()
@@ -0,0 +1,430 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Pemutaran Audio Streaming
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Sinyal pesan/demodulasi disampling ulang ke laju perangkat (resampler
+# polyphase dengan rasio rasional) lalu dialirkan lewat callback
+# sounddevice.OutputStream dari buffer melingkar. Thread pengisi menjaga
+# buffer tetap terisi dari klip yang diputar berulang; klip baru (parameter
+# berubah) menyambung dari posisi yang sama dengan crossfade singkat, jadi
+# tidak ada jeda maupun klik. NullSink dan WavSink menggantikan perangkat
+# keras (blok ditarik sinkron, tanpa jam real-time) untuk pengujian.
+#
+# Contoh:
+#   python am_audio.py --preset "AM Radio - Musik (MW)" --seconds 5
+#   python am_audio.py --signal msg --wav pesan.wav --then "Overmodulation (Distorsi)"
+# =============================================================================
+
+import argparse
+import json
+import sys
+import threading
+import wave
+from fractions import Fraction
+
+import numpy as np
+
+DEFAULT_RATE = 48000
+BLOCK_SIZE = 1024
+# Audio queued ahead of the device; parameter changes trim it back to a block
+BUFFER_SECONDS = 0.2
+# Crossfade at the loop seam and when a new clip replaces the playing one
+CROSSFADE_SECONDS = 0.01
+MAX_RATIO_DENOMINATOR = 1000
+
+
+def resample_to(x, sr, rate):
+    """x (laju sr) disampling ulang ke ~rate Hz dengan resample_poly.
+
+    Rasio rate/sr didekati pecahan up/down (penyebut maksimal
+    MAX_RATIO_DENOMINATOR); filter anti-aliasing sudah termasuk di
+    resampler. Mengembalikan (array float32, laju hasil sebenarnya).
+    """
+    from scipy import signal as sig
+
+    ratio = Fraction(rate / sr).limit_denominator(MAX_RATIO_DENOMINATOR)
+    ratio = max(ratio, Fraction(1, MAX_RATIO_DENOMINATOR))
+    x = np.asarray(x, dtype=np.float64)
+    if ratio != 1:
+        x = sig.resample_poly(x, ratio.numerator, ratio.denominator)
+    return x.astype(np.float32), sr * ratio
+
+
+def loop_crossfade(x, n):
+    """Klip yang bisa diulang tanpa klik: n sampel ekor dilebur ke kepala."""
+    n = min(n, len(x) // 2)
+    if n < 1:
+        return x
+    out = x[:-n].copy()
+    fade = np.linspace(0, 1, n, endpoint=False, dtype=x.dtype)
+    # Wrapping from out[-1] = x[-n-1] lands on out[0] = x[-n]
+    out[:n] = x[:n] * fade + x[-n:] * (1 - fade)
+    return out
+
+
+class AudioRing:
+    """Buffer melingkar float32 untuk satu penulis dan satu pembaca."""
+
+    def __init__(self, size):
+        self.size = size
+        self.buf = np.zeros(size, np.float32)
+        self._read = self._write = 0
+        self._lock = threading.Lock()
+        self.underruns = 0
+
+    @property
+    def available(self):
+        return self._write - self._read
+
+    @property
+    def space(self):
+        return self.size - self.available
+
+    def write(self, x):
+        """Menulis sebanyak yang muat; mengembalikan jumlah sampel tertulis."""
+        with self._lock:
+            n = min(len(x), self.size - (self._write - self._read))
+            start = self._write % self.size
+            first = min(n, self.size - start)
+            self.buf[start : start + first] = x[:first]
+            self.buf[: n - first] = x[first:n]
+            self._write += n
+        return n
+
+    def read(self, out, expected=True):
+        """Mengisi out; kekurangan diisi nol dan dihitung sebagai underrun.
+
+        expected=False berarti sumber sudah habis: kekurangan itu akhir
+        klip, bukan underrun.
+        """
+        with self._lock:
+            n = min(len(out), self._write - self._read)
+            start = self._read % self.size
+            first = min(n, self.size - start)
+            out[:first] = self.buf[start : start + first]
+            out[first:n] = self.buf[: n - first]
+            self._read += n
+        out[n:] = 0
+        # Silence before the first write is start-up, not an underrun
+        if n < len(out) and self._write and expected:
+            self.underruns += 1
+        return n
+
+    def trim(self, keep):
+        """Membuang audio antrean di atas `keep` sampel; mengembalikan jumlahnya."""
+        with self._lock:
+            dropped = max(0, self._write - self._read - keep)
+            self._write -= dropped
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._read = self._write
+
+
+class AudioPlayer:
+    """Memutar klip (berulang) ke sebuah sink lewat AudioRing.
+
+    play() saat sudah berbunyi mengganti klip tanpa jeda: antrean dipangkas
+    ke satu blok dan klip baru masuk pada posisi yang sama dengan crossfade.
+    Resampling dikerjakan di feed() (thread pengisi untuk sink real-time,
+    atau langsung di callback untuk sink offline), bukan di thread GUI.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.ring = AudioRing(max(int(BUFFER_SECONDS * sink.rate), 2 * sink.block))
+        self.crossfade = max(1, int(CROSSFADE_SECONDS * sink.rate))
+        self.playing = False
+        self._lock = threading.Lock()
+        self._pending = None
+        self._clip, self._pos, self._loop = None, 0, True
+        self._head = np.zeros(0, np.float32)
+        self._thread, self._wake = None, threading.Event()
+
+    def play(self, x, sr, loop=True):
+        """Mulai memutar x (laju sr), atau ganti klip yang sedang diputar."""
+        # Copy: the caller's arrays may be pooled buffers reused next update
+        with self._lock:
+            self._pending = (np.array(x, dtype=np.float32), float(sr), loop)
+        self._wake.set()
+        if self.playing:
+            return
+        self.playing = True
+        if self.sink.realtime:
+            # The feeder gets a head start on the device's first callback
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        try:
+            self.sink.start(self._render)
+        except Exception:
+            self.stop()
+            raise
+
+    def stop(self):
+        if not self.playing:
+            return
+        self.playing = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sink.stop()
+        self.ring.clear()
+        self._clip, self._head = None, self._head[:0]
+
+    @property
+    def finished(self):
+        """True setelah klip tanpa loop habis diputar."""
+        return self._clip is None and not len(self._head) and not self.ring.available
+
+    def stats(self):
+        return {
+            "rate": self.sink.rate,
+            "latency_ms": self.ring.available / self.sink.rate * 1e3,
+            "underruns": self.ring.underruns,
+        }
+
+    def feed(self):
+        """Mengisi ring dari klip aktif (menerapkan klip baru lebih dulu)."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._switch(*pending)
+        while self.ring.space and (self._clip is not None or len(self._head)):
+            self.ring.write(self._next(self.ring.space))
+
+    def _switch(self, x, sr, loop):
+        if not len(x):
+            return
+        y, _ = resample_to(x, sr, self.sink.rate)
+        y /= np.max(np.abs(y)) + 1e-9
+        if loop:
+            y = loop_crossfade(y, self.crossfade)
+        if self._clip is None:
+            self._clip, self._pos, self._loop = y, 0, loop
+            return
+        # Rewind to the last sample that will actually be heard, then fade
+        # from the old clip into the new one at the same position
+        dropped = self.ring.trim(self.sink.block) + len(self._head)
+        pos = (self._pos - dropped) % len(self._clip)
+        n = min(self.crossfade, len(y))
+        old = self._take(self._clip, pos, n, self._loop)
+        self._pos = pos % len(y)
+        new = self._take(y, self._pos, n, loop)
+        fade = np.linspace(0, 1, len(new), endpoint=False, dtype=np.float32)
+        old = np.pad(old, (0, len(new) - len(old)))
+        self._head = new * fade + old * (1 - fade)
+        self._pos += len(new)
+        self._clip, self._loop = y, loop
+
+    @staticmethod
+    def _take(clip, pos, n, loop):
+        if loop:
+            return clip[np.arange(pos, pos + n) % len(clip)]
+        return clip[pos : pos + n]
+
+    def _next(self, n):
+        if len(self._head):
+            out, self._head = self._head[:n], self._head[n:]
+            return out
+        out = self._take(self._clip, self._pos, n, self._loop)
+        self._pos += len(out)
+        if self._loop:
+            self._pos %= len(self._clip)
+        elif self._pos >= len(self._clip):
+            self._clip = None
+        return out
+
+    def _render(self, out):
+        # Sink callback: offline sinks have no feeder thread, so feed here
+        if not self.sink.realtime:
+            self.feed()
+        # Once a one-shot clip is fully queued, the silence after it is the
+        # end of the clip, not an underrun
+        exhausted = self._clip is None and not len(self._head)
+        self.ring.read(out, expected=not exhausted)
+        if self.ring.available < self.ring.size // 2:
+            self._wake.set()
+
+    def _run(self):
+        period = self.sink.block / self.sink.rate
+        while self.playing:
+            self.feed()
+            self._wake.wait(period)
+            self._wake.clear()
+
+
+class SoundDeviceSink:
+    """Perangkat keluaran nyata: sounddevice.OutputStream mono float32."""
+
+    realtime = True
+
+    def __init__(self, rate=None, block=BLOCK_SIZE, device=None):
+        import sounddevice as sd
+
+        self._sd = sd
+        if rate is None:
+            # Device default rate, so the host API never has to convert
+            rate = sd.query_devices(device, "output")["default_samplerate"]
+        self.rate, self.block, self.device = int(rate), block, device
+        self.stream = None
+        self.xruns = 0
+
+    def start(self, render):
+        def callback(outdata, frames, time_info, status):
+            if status.output_underflow:
+                self.xruns += 1
+            render(outdata[:, 0])
+
+        self.stream = self._sd.OutputStream(
+            samplerate=self.rate,
+            blocksize=self.block,
+            device=self.device,
+            channels=1,
+            dtype="float32",
+            callback=callback,
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class NullSink:
+    """Sink tanpa perangkat untuk pengujian: run() menarik blok secara sinkron.
+
+    Dengan keep=True semua blok disimpan (lihat `data`), sehingga hasil
+    pemutaran bisa diperiksa sampel per sampel.
+    """
+
+    realtime = False
+
+    def __init__(self, rate=DEFAULT_RATE, block=BLOCK_SIZE, keep=False):
+        self.rate, self.block, self.keep = int(rate), block, keep
+        self.frames, self.peak = 0, 0.0
+        self._blocks, self._render = [], None
+
+    def start(self, render):
+        self._render = render
+
+    def stop(self):
+        self._render = None
+
+    def run(self, seconds):
+        """Menarik blok sebanyak `seconds` detik audio dari player."""
+        if self._render is None:
+            raise RuntimeError("Sink belum dijalankan (AudioPlayer.play).")
+        for _ in range(int(np.ceil(seconds * self.rate / self.block))):
+            buf = np.zeros(self.block, np.float32)
+            self._render(buf)
+            self.frames += len(buf)
+            self.peak = max(self.peak, float(np.max(np.abs(buf))))
+            if self.keep:
+                self._blocks.append(buf)
+            self._write(buf)
+
+    @property
+    def data(self):
+        return np.concatenate(self._blocks) if self._blocks else np.zeros(0)
+
+    def _write(self, buf):
+        pass
+
+
+class WavSink(NullSink):
+    """NullSink yang juga menulis keluaran ke file WAV 16-bit mono."""
+
+    def __init__(self, path, rate=DEFAULT_RATE, block=BLOCK_SIZE, keep=False):
+        super().__init__(rate, block, keep)
+        self.path, self._wav = path, None
+
+    def start(self, render):
+        super().start(render)
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self.rate)
+
+    def stop(self):
+        super().stop()
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def _write(self, buf):
+        self._wav.writeframes((np.clip(buf, -1, 1) * 32767).astype("<i2").tobytes())
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Play a simulated signal through the streaming audio engine."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--preset", help="built-in preset name (default: first)")
+    source.add_argument("--params", help="JSON file with one parameter set")
+    parser.add_argument(
+        "--signal", choices=("demod", "msg"), default="demod", help="what to play"
+    )
+    parser.add_argument("--seconds", type=float, default=4.0, help="playback length")
+    parser.add_argument(
+        "--then", help="switch to this preset halfway, without stopping playback"
+    )
+    parser.add_argument("--wav", help="render to this WAV file instead of a device")
+    parser.add_argument(
+        "--null", action="store_true", help="render to a null sink (no device)"
+    )
+    parser.add_argument("--rate", type=int, help="output rate (default: device rate)")
+    return parser
+
+
+def main(argv=None):
+    from am_engine import PRESETS, normalize_params, simulate
+
+    args = build_parser().parse_args(argv)
+    names = [args.preset or next(k for k, v in PRESETS.items() if v is not None)]
+    if args.then:
+        names.append(args.then)
+    raws = []
+    for name in names:
+        if PRESETS.get(name) is None:
+            raise SystemExit(f"Preset tidak dikenal: {name}")
+        raws.append(PRESETS[name])
+    if args.params:
+        with open(args.params, encoding="utf-8") as f:
+            raws[0] = json.load(f)
+    clips = [simulate(normalize_params(raw)) for raw in raws]
+
+    if args.wav:
+        sink = WavSink(args.wav, args.rate or DEFAULT_RATE)
+    elif args.null:
+        sink = NullSink(args.rate or DEFAULT_RATE)
+    else:
+        try:
+            sink = SoundDeviceSink(args.rate)
+        except ImportError:
+            raise SystemExit("sounddevice tidak terpasang; gunakan --wav atau --null.")
+    player = AudioPlayer(sink)
+    part = args.seconds / len(clips)
+    for s in clips:
+        player.play(s[args.signal], s["sr"])
+        if sink.realtime:
+            threading.Event().wait(part)
+        else:
+            sink.run(part)
+    stats = player.stats()
+    player.stop()
+    print(
+        f"{args.signal} @ {stats['rate']} Hz, {args.seconds:g} s, "
+        f"{stats['underruns']} underrun",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
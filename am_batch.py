@@ -0,0 +1,284 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Batch Runner (CLI, headless)
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menjalankan banyak set parameter dari file JSON/CSV tanpa GUI dan
+# menuliskan metrik (m, THD, efisiensi, bandwidth, SNR terukur).
+#
+# Contoh:
+#   python am_batch.py runs.json -o hasil.csv
+#   python am_batch.py runs.csv --format json
+#   python am_batch.py --preset "Default (Modulasi Baik)"
+#   python am_batch.py --preset "Default (Modulasi Baik)" \
+#       --sweep-m 0:1.5:16 --sweep-snr 0:50:11 --plot sweep.png
+#   python am_batch.py runs.csv --workers 32 --chunk-size 8
+#   python am_batch.py --preset all --monte-carlo 1000 --seed 42
+# =============================================================================
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from am_engine import (
+    FILTER_CACHE,
+    PRESETS,
+    SignalProcessor,
+    compute_metrics,
+    modulation_status,
+    normalize_params,
+    required_sampling_rate,
+    signal_duration,
+    simulate,
+)
+from am_montecarlo import monte_carlo, monte_carlo_row
+from am_parallel import ParallelRunner, RunCancelled
+from am_sweep import SWEEP_AXES, parse_range, plot_sweep, sweep, sweep_rows
+
+METRIC_FIELDS = [
+    "m",
+    "status",
+    "thd",
+    "thd_n",
+    "sinad",
+    "efficiency",
+    "bandwidth",
+    "snr_measured",
+    "sr",
+    "duration",
+]
+
+
+def load_param_sets(path):
+    """Membaca daftar set parameter dari file .json atau .csv."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [dict(row) for row in csv.DictReader(f)]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("runs", [data])
+    return list(data)
+
+
+NUMERIC_FIELDS = [f for f in METRIC_FIELDS if f != "status"]
+
+
+def _metrics_kernel(context, param_list):
+    processor = SignalProcessor()
+    rows = []
+    for p in param_list:
+        metrics = compute_metrics(p, simulate(p, processor), processor)
+        rows.append([metrics[f] for f in NUMERIC_FIELDS])
+    return rows
+
+
+def run_batch(param_sets, processor=None, runner=None):
+    """Menjalankan simulate untuk setiap set parameter; error dicatat per baris.
+
+    Jika `runner` (ParallelRunner) diberikan, simulasi dibagi ke beberapa
+    proses; validasi parameter tetap dilakukan di proses ini.
+    """
+    processor = processor or SignalProcessor()
+    rows, valid = [], []
+    for i, raw in enumerate(param_sets):
+        row = {"index": i, "name": raw.get("name", "")}
+        try:
+            p = normalize_params(raw)
+            signal_duration(p, required_sampling_rate(p))
+            row["error"] = ""
+            valid.append((row, p))
+        except (ValueError, KeyError, TypeError) as e:
+            row["error"] = str(e)
+        rows.append(row)
+
+    if runner is None:
+        for row, p in valid:
+            row.update(compute_metrics(p, simulate(p, processor), processor))
+        return rows
+
+    values = runner.map(_metrics_kernel, [p for _, p in valid], len(NUMERIC_FIELDS))
+    for (row, _), vals in zip(valid, values):
+        row.update(zip(NUMERIC_FIELDS, vals.tolist()))
+        row["status"] = modulation_status(row["m"])
+    return rows
+
+
+def write_rows(rows, out, fmt, fields=None):
+    if fmt == "json":
+        json.dump(rows, out, indent=2, default=float)
+        out.write("\n")
+        return
+    writer = csv.DictWriter(
+        out,
+        fieldnames=["index", *(fields or ["name", *METRIC_FIELDS, "error"])],
+        restval="",
+    )
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def _preset_param_sets(names):
+    if names == ["all"]:
+        names = [k for k, v in PRESETS.items() if v is not None]
+    sets = []
+    for name in names:
+        if PRESETS.get(name) is None:
+            raise SystemExit(f"Preset tidak dikenal: {name}")
+        sets.append({"name": name, **PRESETS[name]})
+    return sets
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Headless batch runner for the Virtual AM Spectrum Analyzer."
+    )
+    parser.add_argument(
+        "input", nargs="?", help="JSON (list or {'runs': [...]}) or CSV of parameters"
+    )
+    parser.add_argument(
+        "--preset",
+        action="append",
+        default=[],
+        help="run a built-in preset by name (repeatable, or 'all')",
+    )
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "--format", choices=["csv", "json"], help="output format (default from -o)"
+    )
+    sweep_group = parser.add_argument_group(
+        "sweep mode",
+        "evaluate a grid around the first parameter set; ranges are "
+        "'start:stop:n' or 'a,b,c'",
+    )
+    for name, flag in zip(SWEEP_AXES, ("m", "snr", "phase-error", "fc")):
+        sweep_group.add_argument(
+            f"--sweep-{flag}", dest=f"sweep_{name}", metavar="RANGE"
+        )
+    sweep_group.add_argument("--plot", help="save THD curves and heatmap to an image")
+    mc_group = parser.add_argument_group(
+        "monte carlo mode", "statistics of THD and output SNR per parameter set"
+    )
+    mc_group.add_argument(
+        "--monte-carlo", type=int, metavar="N", help="noise realizations per set"
+    )
+    mc_group.add_argument(
+        "--seed", type=int, help="root seed (default: fresh entropy, reported)"
+    )
+    mc_group.add_argument(
+        "--confidence", type=float, default=0.95, help="confidence level for CIs"
+    )
+    parallel_group = parser.add_argument_group("parallel execution")
+    parallel_group.add_argument(
+        "--workers",
+        type=int,
+        help="number of worker processes (0 = all cores; default: run in-process)",
+    )
+    parallel_group.add_argument(
+        "--chunk-size", type=int, help="items per worker task (default: automatic)"
+    )
+    return parser
+
+
+def _make_runner(args):
+    if args.workers is None:
+        return None
+    return ParallelRunner(workers=args.workers or None, chunk_size=args.chunk_size)
+
+
+def _run_sweep(args, base_raw, runner=None):
+    ranges = {
+        name: parse_range(getattr(args, f"sweep_{name}"))
+        for name in SWEEP_AXES
+        if getattr(args, f"sweep_{name}")
+    }
+    result = sweep(normalize_params(base_raw), runner=runner, **ranges)
+    if args.plot:
+        plot_sweep(result, args.plot)
+    rows = sweep_rows(result)
+    for i, row in enumerate(rows):
+        row["index"] = i
+    return rows, [*SWEEP_AXES, "thd", "snr_measured", "efficiency"]
+
+
+def _run_monte_carlo(args, param_sets, runner=None):
+    rows = []
+    for i, raw in enumerate(param_sets):
+        row = {"index": i, "name": raw.get("name", "")}
+        try:
+            p = normalize_params(raw)
+            seed = args.seed if args.seed is not None else p.get("seed")
+            result = monte_carlo(
+                p, args.monte_carlo, seed, runner=runner, confidence=args.confidence
+            )
+            row.update(monte_carlo_row(result))
+            row["error"] = ""
+        except (ValueError, KeyError, TypeError) as e:
+            row["error"] = str(e)
+        rows.append(row)
+    fields = ["name", "trials", "seed"]
+    fields += [
+        f"{metric}_{key}"
+        for metric in ("thd", "snr_out")
+        for key in (
+            "mean",
+            "std",
+            "ci_low",
+            "ci_high",
+            "p5",
+            "p25",
+            "p50",
+            "p75",
+            "p95",
+        )
+    ]
+    return rows, [*fields, "error"]
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    param_sets = _preset_param_sets(args.preset) if args.preset else []
+    if args.input:
+        param_sets += load_param_sets(args.input)
+    if not param_sets:
+        build_parser().error("no input file or --preset given")
+
+    fmt = args.format or (
+        "json" if args.output and args.output.lower().endswith(".json") else "csv"
+    )
+    start = time.perf_counter()
+    fields = None
+    runner = _make_runner(args)
+    try:
+        if any(getattr(args, f"sweep_{name}") for name in SWEEP_AXES):
+            rows, fields = _run_sweep(args, param_sets[0], runner)
+        elif args.monte_carlo:
+            rows, fields = _run_monte_carlo(args, param_sets, runner)
+        else:
+            rows = run_batch(param_sets, runner=runner)
+    except (KeyboardInterrupt, RunCancelled):
+        if runner is not None:
+            runner.cancel()
+        print("Dibatalkan.", file=sys.stderr)
+        return 130
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_rows(rows, f, fmt, fields)
+    else:
+        write_rows(rows, sys.stdout, fmt, fields)
+    n_err = sum(1 for r in rows if r.get("error"))
+    cache = FILTER_CACHE.stats()
+    print(
+        f"{len(rows)} runs in {elapsed:.2f} s ({n_err} errors); "
+        f"filter cache {cache['hits']} hits / {cache['misses']} misses",
+        file=sys.stderr,
+    )
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
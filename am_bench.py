@@ -0,0 +1,397 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Benchmark Pipeline & Render
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Mengukur waktu setiap tahap SignalProcessor (pesan, carrier, modulasi,
+# kanal, demodulasi, spektrum, THD), pipeline penuh, update inkremental
+# (seperti _generate_signals saat slider SNR digeser) dan render
+# _update_plots di kanvas Agg tanpa jendela, untuk matriks fc/fm/bentuk/
+# mode/demodulator plus semua preset. Hasil ditulis ke JSON dan dapat
+# dibandingkan dengan baseline tersimpan; regresi membuat keluar kode 1.
+# Dengan --startup yang diukur adalah waktu buka aplikasi di proses baru
+# (import, jendela tampil, figure siap, plot pertama).
+#
+# Contoh:
+#   python am_bench.py -o bench_baseline.json      # simpan baseline
+#   python am_bench.py --baseline bench_baseline.json
+#   python am_bench.py --quick --no-render --filter Coherent
+#   python am_bench.py --startup --startup-command dist/am_analyzer/am_analyzer
+# =============================================================================
+
+import argparse
+import functools
+import itertools
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+
+import numpy as np
+import scipy
+
+from am_engine import (
+    BASEBAND_STAGES,
+    PASSBAND_STAGES,
+    PRESETS,
+    SIGNAL_SHAPES,
+    BufferPool,
+    Pipeline,
+    SignalProcessor,
+    compute_metrics,
+    normalize_params,
+    simulate,
+)
+
+BENCH_VERSION = 1
+DEFAULT_REPEAT = 9
+# Parameter matrix crossed for the pipeline benchmarks (presets are added)
+MATRIX = {
+    "fc": ("10k", "100k"),
+    "fm": ("500", "2k"),
+    "shape": tuple(SIGNAL_SHAPES.values()),
+    "mode": ("DSB-FC", "DSB-SC"),
+    "demod_mode": ("Envelope", "Coherent"),
+}
+# A timing regresses when its median is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and by more than this many ms and SPREAD_FACTOR times the larger
+# interquartile range of the two runs (below that it is timer noise)
+MIN_REGRESSION_MS = 2.0
+SPREAD_FACTOR = 3.0
+# am_analyzer.py prints its startup milestones and exits when this is set
+STARTUP_PROBE_ENV = "AM_STARTUP_PROBE"
+STARTUP_TIMEOUT_S = 60
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def timing_stats(times):
+    """Minimum, median dan spread (rentang antarkuartil) dari waktu dalam ms."""
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {
+        "min_ms": float(min(times)),
+        "median_ms": float(median),
+        "spread_ms": float(q3 - q1),
+    }
+
+
+def time_call(func, repeat=DEFAULT_REPEAT):
+    """Menjalankan func() sekali (pemanasan) lalu `repeat` kali.
+
+    Mengembalikan (timing_stats, hasil panggilan terakhir). Median dan
+    spread dipakai untuk perbandingan dengan baseline.
+    """
+    result = func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1e3)
+    return timing_stats(times), result
+
+
+def bench_cases(matrix=True, presets=True, name_filter=None):
+    """Daftar (nama, parameter mentah, render?).
+
+    Preset juga dijalankan di mode baseband dan hanya preset yang ikut
+    benchmark render (satu draw penuh jauh lebih mahal dari pipeline-nya).
+    """
+    cases = []
+    if matrix:
+        for values in itertools.product(*MATRIX.values()):
+            raw = dict(zip(MATRIX, values))
+            name = "{fc}/{fm} {shape} {mode} {demod_mode}".format(**raw)
+            cases.append((name, {**raw, "m": 0.7, "snr": 40}, False))
+    if presets:
+        for name, raw in PRESETS.items():
+            if raw is not None:
+                cases.append((name, raw, True))
+                cases.append((f"{name} [IQ]", {**raw, "baseband": True}, True))
+    if name_filter:
+        cases = [c for c in cases if name_filter.lower() in c[0].lower()]
+    # Fixed seed: every run sees the same noise realization
+    return [(name, {**raw, "seed": 0}, render) for name, raw, render in cases]
+
+
+def bench_pipeline(p, repeat=DEFAULT_REPEAT, processor=None):
+    """Waktu tiap tahap, pipeline penuh, update SNR dan compute_metrics.
+
+    Tahap dijalankan berurutan dengan keluaran tahap sebelumnya, memakai
+    SignalProcessor ber-BufferPool seperti GUI. "pipeline" adalah run
+    pertama (memo kosong), "update.snr" adalah run berikutnya setelah SNR
+    berubah (hanya kanal, demodulasi, spektrum dan THD yang dihitung).
+    """
+    processor = processor or SignalProcessor(pool=BufferPool())
+    stages = BASEBAND_STAGES if p.get("baseband") else PASSBAND_STAGES
+    results, s = {}, {}
+    for stage in stages:
+        call = functools.partial(stage.func, processor, p, dict(s))
+        results[f"stage.{stage.name}"], outputs = time_call(call, repeat)
+        s.update(outputs)
+    results["pipeline"], _ = time_call(lambda: Pipeline(processor).run(p), repeat)
+    pipeline = Pipeline(processor)
+    pipeline.run(p)
+    snrs = itertools.cycle((p["snr_db"] + 1, p["snr_db"]))
+    results["update.snr"], _ = time_call(
+        lambda: pipeline.run({**p, "snr_db": next(snrs)}), repeat
+    )
+    results["metrics"], _ = time_call(lambda: compute_metrics(p, s, processor), repeat)
+    return results
+
+
+def offscreen_gui():
+    """AMSimulatorGUI tanpa Tk: hanya figure, artist dan PlotView di kanvas Agg.
+
+    State dibuat oleh _init_state yang sama dengan __init__, tanpa cache
+    hasil. Cukup untuk memanggil _update_plots; widget dan variabel Tk
+    tidak dibuat.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from am_analyzer import AMSimulatorGUI
+
+    gui = AMSimulatorGUI.__new__(AMSimulatorGUI)
+    gui._init_state(cache=False)
+    gui._create_figure(FigureCanvasAgg)
+    return gui
+
+
+def bench_render(gui, p, s, repeat=DEFAULT_REPEAT):
+    """Waktu _update_plots: draw penuh (latar baru) dan update blit."""
+
+    def full():
+        gui.view.invalidate()
+        gui._update_plots(p, s)
+
+    results = {}
+    results["render.full"], _ = time_call(full, repeat)
+    # Same data again: the limits do not move, so render() only blits
+    results["render.update"], _ = time_call(lambda: gui._update_plots(p, s), repeat)
+    return results
+
+
+def _run(command, env=None):
+    return subprocess.run(
+        command,
+        cwd=HERE,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=STARTUP_TIMEOUT_S,
+        check=True,
+    )
+
+
+def _probe_startup(command):
+    # Milestones are wall-clock times, so they are measured from the launch
+    start = time.time()
+    proc = _run(command, {**os.environ, STARTUP_PROBE_ENV: "1"})
+    for line in proc.stdout.splitlines():
+        if line.startswith("AM_STARTUP "):
+            milestones = json.loads(line[len("AM_STARTUP ") :])
+            return {k: (v - start) * 1e3 for k, v in milestones.items()}
+    raise RuntimeError("aplikasi keluar tanpa mencetak AM_STARTUP")
+
+
+def bench_startup(repeat=DEFAULT_REPEAT, command=None):
+    """Waktu startup di proses baru, dihitung sejak proses diluncurkan.
+
+    "python" adalah interpreter kosong dan "import" adalah `import
+    am_analyzer` (keduanya dilewati bila `command` diberikan, mis. build
+    PyInstaller). "startup.<tahap>" (init, ui, window, figure, first_plot)
+    dibaca dari aplikasi yang dijalankan dengan AM_STARTUP_PROBE; butuh
+    display. Mengembalikan (hasil, pesan galat GUI atau None).
+    """
+    results = {}
+    if command is None:
+        for name, code in (("python", "pass"), ("import", "import am_analyzer")):
+            call = functools.partial(_run, [sys.executable, "-c", code])
+            results[name], _ = time_call(call, repeat)
+        command = [sys.executable, os.path.join(HERE, "am_analyzer.py")]
+    try:
+        # The first launch only warms the OS file cache, like time_call
+        runs = [_probe_startup(command) for _ in range(repeat + 1)][1:]
+    except subprocess.CalledProcessError as e:
+        # Last stderr line, e.g. the TclError when there is no display
+        lines = e.stderr.strip().splitlines()
+        return results, lines[-1] if lines else str(e)
+    except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+        return results, str(e)
+    for name in runs[0]:
+        results[f"startup.{name}"] = timing_stats([run[name] for run in runs])
+    return results, None
+
+
+def _suite(results, repeat, **extra):
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+        },
+        "repeat": repeat,
+        **extra,
+        "results": results,
+    }
+
+
+def run_suite(cases, repeat=DEFAULT_REPEAT, render=True, progress=None):
+    """Menjalankan seluruh benchmark; hasil siap ditulis sebagai JSON."""
+    gui, render_error = None, None
+    if render and any(case[2] for case in cases):
+        try:
+            gui = offscreen_gui()
+        except ImportError as e:
+            render_error = str(e)
+    results = {}
+    for name, raw, render_case in cases:
+        p = normalize_params(raw)
+        results[name] = bench_pipeline(p, repeat)
+        if gui is not None and render_case:
+            results[name].update(bench_render(gui, p, simulate(p), repeat))
+        if progress:
+            progress(name, results[name])
+    return _suite(results, repeat, render_error=render_error)
+
+
+def run_startup(repeat=DEFAULT_REPEAT, command=None):
+    """Benchmark startup sebagai suite (satu kasus "startup")."""
+    results, gui_error = bench_startup(repeat, command)
+    return _suite({"startup": results}, repeat, gui_error=gui_error)
+
+
+def compare(
+    current,
+    baseline,
+    tolerance=DEFAULT_TOLERANCE,
+    min_ms=MIN_REGRESSION_MS,
+    spread_factor=SPREAD_FACTOR,
+):
+    """Membandingkan waktu median dua hasil suite.
+
+    Regresi jika median lebih lambat dari `tolerance` (relatif) dan dari
+    max(min_ms, spread_factor * spread terbesar) (absolut). Mengembalikan
+    daftar (kasus, metrik, ms baseline, ms sekarang, rasio, regresi?) untuk
+    setiap metrik yang ada di keduanya.
+    """
+    rows = []
+    for case, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(case, {})
+        for metric, stats in metrics.items():
+            if metric not in base_metrics:
+                continue
+            old = base_metrics[metric]
+            base, now = old["median_ms"], stats["median_ms"]
+            ratio = now / base if base > 0 else float("inf")
+            # Older result files carry no spread
+            spread = max(old.get("spread_ms", 0.0), stats.get("spread_ms", 0.0))
+            floor = max(min_ms, spread_factor * spread)
+            regressed = now - base > floor and ratio > 1 + tolerance
+            rows.append((case, metric, base, now, ratio, regressed))
+    return rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the signal pipeline and the plot update path."
+    )
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per metric"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed relative slowdown before a regression (default 0.25)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="presets only, skip the matrix"
+    )
+    parser.add_argument("--filter", help="only cases whose name contains this text")
+    parser.add_argument(
+        "--no-render", action="store_true", help="skip the offscreen render timings"
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="time application startup in fresh processes instead",
+    )
+    parser.add_argument(
+        "--startup-command",
+        help="launch this instead of am_analyzer.py (e.g. a PyInstaller build)",
+    )
+    return parser
+
+
+def _progress(name, metrics):
+    render = metrics.get("render.full", {}).get("min_ms")
+    render = f" render {render:6.1f} ms" if render is not None else ""
+    print(
+        f"{name[:44]:44s} pipeline {metrics['pipeline']['min_ms']:7.1f} ms"
+        f" update {metrics['update.snr']['min_ms']:6.1f} ms{render}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BENCH_VERSION:
+            raise SystemExit(
+                f"Versi baseline tidak didukung: {baseline.get('version')}"
+            )
+    if args.startup or args.startup_command:
+        command = args.startup_command and shlex.split(args.startup_command)
+        result = run_startup(args.repeat, command)
+        if result["gui_error"]:
+            print(f"Tahap GUI dilewati: {result['gui_error']}", file=sys.stderr)
+        for metric, stats in result["results"]["startup"].items():
+            print(f"{metric:20s} {stats['min_ms']:8.1f} ms", file=sys.stderr)
+    else:
+        cases = bench_cases(matrix=not args.quick, name_filter=args.filter)
+        if not cases:
+            raise SystemExit("Tidak ada kasus yang cocok dengan --filter.")
+        result = run_suite(cases, args.repeat, not args.no_render, _progress)
+        if result["render_error"]:
+            print(f"Render dilewati: {result['render_error']}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if baseline is None:
+        return 0
+
+    rows = compare(result, baseline, args.tolerance)
+    regressions = [row for row in rows if row[5]]
+    for case, metric, base, now, ratio, _ in regressions:
+        print(
+            f"REGRESI {case[:40]:40s} {metric:16s} {base:8.2f} -> {now:8.2f} ms"
+            f" ({ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    if rows:
+        ratios = np.array([row[4] for row in rows])
+        print(
+            f"{len(rows)} metrik dibandingkan, median rasio {np.median(ratios):.2f}x, "
+            f"{len(regressions)} regresi (toleransi {args.tolerance:.0%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
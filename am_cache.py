@@ -0,0 +1,302 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Cache Hasil di Disk
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menyimpan hasil pipeline (sinyal, spektrum, THD) per set parameter ke
+# file .npz yang dialamatkan oleh hash parameter + seed noise. Membuka
+# kembali preset atau konfigurasi lama cukup memuat file, bukan menghitung
+# ulang. Ukuran direktori dibatasi dengan eviksi LRU.
+#
+# Contoh:
+#   python am_cache.py warm            # isi cache untuk semua preset
+#   python am_cache.py info
+#   python am_cache.py clear
+# =============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from am_engine import (
+    BASEBAND_STAGES,
+    PASSBAND_STAGES,
+    PRESETS,
+    Pipeline,
+    normalize_params,
+)
+
+# Noise seed used when the parameters carry none, so cached results are
+# reproducible; an explicit "seed" always wins
+DEFAULT_SEED = 0
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Pending background writes; further writes are dropped while it is full
+WRITE_QUEUE_SIZE = 2
+
+# Everything any pipeline stage reads, plus the engine selector
+KEY_PARAMS = sorted(
+    {name for stage in PASSBAND_STAGES + BASEBAND_STAGES for name in stage.params}
+    | {"baseband", "seed"}
+)
+# Only the zoom stage reads these, and only in zoom mode
+ZOOM_ONLY_PARAMS = ("fft_center", "fft_span", "fft_rbw")
+
+
+def default_cache_dir():
+    """Direktori cache: $AM_CACHE_DIR, atau folder cache per pengguna."""
+    if os.environ.get("AM_CACHE_DIR"):
+        return os.environ["AM_CACHE_DIR"]
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    base = base or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "am_analyzer")
+
+
+def with_seed(p):
+    """Salinan `p` yang selalu berisi seed noise (DEFAULT_SEED jika kosong)."""
+    return p if p.get("seed") is not None else {**p, "seed": DEFAULT_SEED}
+
+
+def cache_key(p):
+    """Hash SHA-256 dari parameter yang memengaruhi hasil pipeline.
+
+    Hanya kunci di KEY_PARAMS yang ikut (fft_scale dan sejenisnya tidak),
+    float dibulatkan ke 12 digit signifikan agar nilai dari GUI dan preset
+    yang sama menghasilkan kunci yang sama.
+    """
+    p = with_seed(p)
+    skip = () if p.get("fft_zoom") else ZOOM_ONLY_PARAMS
+    canon = {}
+    for name in KEY_PARAMS:
+        value = p.get(name)
+        if name in skip or value is None or value is False:
+            continue
+        if isinstance(value, float):
+            value = float(f"{value:.12g}")
+        canon[name] = value
+    text = json.dumps(canon, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Cache hasil simulate() di disk, satu file .npz per set parameter.
+
+    Hit menyentuh mtime file sehingga eviksi (saat total ukuran melewati
+    `max_bytes`) membuang entri yang paling lama tidak dipakai. Penulisan
+    bersifat atomik (file sementara + os.replace), jadi beberapa proses
+    boleh berbagi satu direktori. put_later() menulis lewat satu thread
+    penulis dengan antrean terbatas.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = self.dropped = 0
+        self._lock = threading.Lock()
+        self._writes = queue.Queue(WRITE_QUEUE_SIZE)
+        self._writer = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, p):
+        """Hasil tersimpan untuk `p`, atau None jika belum ada/rusak."""
+        path = self._path(cache_key(p))
+        try:
+            with np.load(path) as data:
+                s = {k: data[k] for k in data.files}
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        # 0-d arrays were Python scalars (sr, thd, plot_samples, ...)
+        return {k: v.item() if v.ndim == 0 else v for k, v in s.items()}
+
+    def put(self, p, s):
+        arrays = {k: np.asarray(v) for k, v in s.items() if v is not None}
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(cache_key(p)))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def _put_quietly(self, p, s):
+        try:
+            self.put(p, s)
+        except OSError:
+            # A read-only or full disk only costs the cache, not the run
+            pass
+
+    def put_later(self, p, s):
+        """Menyimpan `s` di thread penulis; False jika antrean penuh (dibuang)."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+        try:
+            self._writes.put_nowait((p, s))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def _write_loop(self):
+        while True:
+            p, s = self._writes.get()
+            self._put_quietly(p, s)
+            # Drop the arrays before waiting, so pooled buffers are free again
+            del p, s
+            self._writes.task_done()
+
+    def flush(self):
+        """Menunggu semua penulisan put_later() selesai."""
+        self._writes.join()
+
+    def fetch(self, p, compute, background=False):
+        """Hasil untuk `p` dari cache, atau compute(p) lalu disimpan.
+
+        `p` diberi seed (with_seed) sebelum dihitung sehingga hasil yang
+        disimpan dapat direproduksi. Dengan background=True penulisan
+        lewat put_later() agar tidak menambah latensi GUI.
+        """
+        p = with_seed(p)
+        s = self.get(p)
+        if s is None:
+            s = compute(p)
+            if background:
+                self.put_later(p, s)
+            else:
+                self._put_quietly(p, s)
+        return s
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        return sorted(entries)
+
+    def evict(self):
+        """Membuang entri paling lama tidak dipakai hingga total <= max_bytes."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def clear(self):
+        for _, _, name in self._entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "dropped": self.dropped,
+        }
+
+
+def warm_presets(cache, names=None, baseband=(False, True)):
+    """Menghitung dan menyimpan semua preset (mode passband dan baseband).
+
+    Parameter dinormalisasi dengan normalize_params, yang kuncinya sama
+    dengan keluaran _parse_inputs di GUI, jadi memilih preset nanti
+    langsung menjadi hit.
+    """
+    pipeline = Pipeline()
+    names = names or [k for k, v in PRESETS.items() if v is not None]
+    unknown = [name for name in names if PRESETS.get(name) is None]
+    if unknown:
+        raise ValueError(f"Preset tidak dikenal: {', '.join(unknown)}")
+    done = []
+    for name in names:
+        for bb in baseband:
+            p = normalize_params({**PRESETS[name], "baseband": bb})
+            start = time.perf_counter()
+            cached = cache.get(with_seed(p)) is not None
+            if not cached:
+                cache.fetch(p, pipeline.run)
+            done.append((name, bb, cached, time.perf_counter() - start))
+    return done
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Manage the on-disk result cache of the AM analyzer."
+    )
+    parser.add_argument("command", choices=["warm", "info", "clear"])
+    parser.add_argument("--dir", help="cache directory (default: per-user cache)")
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 2**20,
+        help="size limit in MiB before LRU eviction",
+    )
+    parser.add_argument(
+        "--preset", action="append", help="warm only these presets (repeatable)"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cache = ResultCache(args.dir, int(args.max_mb * 2**20))
+    if args.command == "warm":
+        try:
+            done = warm_presets(cache, args.preset)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        for name, bb, cached, elapsed in done:
+            mode = "baseband" if bb else "passband"
+            state = "sudah ada" if cached else f"{elapsed * 1e3:.0f} ms"
+            print(f"{name} [{mode}]: {state}")
+    elif args.command == "clear":
+        cache.clear()
+    stats = cache.stats()
+    print(
+        f"{stats['entries']} entri, {stats['bytes'] / 2**20:.1f} / "
+        f"{stats['max_bytes'] / 2**20:.0f} MiB di {stats['directory']}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
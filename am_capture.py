@@ -0,0 +1,275 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Export/Import Capture Sinyal
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menyimpan seluruh tahap hasil simulasi (pesan, carrier, termodulasi, kanal,
+# demodulasi, spektrum) dalam resolusi penuh ke sebuah folder capture:
+# satu file .npy float32 per tahap (atau WAV untuk tahap berlaju audio)
+# plus sidecar capture.json berisi parameter, laju sampel dan metrik.
+# Penulisan lewat np.memmap per blok sehingga capture ratusan MB tidak
+# disalin utuh ke memori; membuka capture juga memakai memmap.
+#
+# Contoh:
+#   python am_capture.py save --preset "AM Radio - Musik (MW)" radio.amcap
+#   python am_capture.py info radio.amcap
+#   python am_capture.py analyze radio.amcap --window flattop
+# =============================================================================
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from am_engine import (
+    PRESETS,
+    SignalProcessor,
+    compute_metrics,
+    normalize_params,
+    simulate,
+)
+from am_spectrum import (
+    DEFAULT_AVERAGING,
+    DEFAULT_OVERLAP,
+    DEFAULT_WINDOW,
+    default_nperseg,
+)
+
+CAPTURE_VERSION = 1
+SIDECAR = "capture.json"
+# Samples converted per memmap write (bounds the temporary float32 block)
+CHUNK_SAMPLES = 1 << 20
+# Stages that are written as WAV when their rate fits a WAV header
+AUDIO_STAGES = ("msg", "demod")
+MAX_WAV_RATE = 384000
+# Time-domain stages; in baseband mode these run at sr_pass
+PASSBAND_KEYS = ("carrier", "mod", "noisy")
+TIME_KEYS = ("msg", "demod", "mod_iq", "noisy_iq") + PASSBAND_KEYS
+# Rebuilt from the rate on load instead of being stored
+TIMEBASE_KEYS = ("t", "t_pass")
+
+
+def _fill(mm, x):
+    # Cast block by block straight into the mapped file
+    for start in range(0, len(x), CHUNK_SAMPLES):
+        mm[start : start + CHUNK_SAMPLES] = x[start : start + CHUNK_SAMPLES]
+    mm.flush()
+
+
+def _write_npy(path, x, dtype):
+    mm = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=x.shape)
+    _fill(mm, x)
+    del mm
+
+
+def _write_wav(path, x, rate):
+    """WAV mono IEEE float32; data diisi lewat memmap setelah header."""
+    n = len(x)
+    header = b"RIFF" + struct.pack("<I", 36 + 4 * n) + b"WAVE"
+    # fmt chunk: format 3 (IEEE float), 1 channel, 32-bit
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 3, 1, rate, rate * 4, 4, 32)
+    header += b"data" + struct.pack("<I", 4 * n)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + 4 * n)
+    if n:
+        mm = np.memmap(path, dtype="<f4", mode="r+", offset=len(header), shape=(n,))
+        _fill(mm, x)
+        del mm
+
+
+def _rate_of(key, s):
+    if key in PASSBAND_KEYS and "sr_pass" in s:
+        return float(s["sr_pass"])
+    return float(s["sr"])
+
+
+def save_capture(path, p, s, processor=None):
+    """Menulis hasil simulate() `s` (parameter `p`) ke folder capture `path`.
+
+    Tahap domain waktu disimpan float32 (complex64 untuk IQ), tahap
+    berlaju audio (pesan, demodulasi) sebagai WAV float32. Array lain
+    (spektrum, level harmonik) tetap float64. Vektor waktu tidak disimpan
+    karena dapat dibangun ulang dari laju sampel.
+    """
+    os.makedirs(path, exist_ok=True)
+    arrays, scalars = {}, {}
+    for key, value in s.items():
+        if key in TIMEBASE_KEYS or value is None:
+            continue
+        if np.ndim(value) == 0:
+            scalars[key] = np.asarray(value).item()
+            continue
+        x = np.asarray(value)
+        entry = {"shape": list(x.shape)}
+        if key in TIME_KEYS:
+            rate = _rate_of(key, s)
+            entry["rate"] = rate
+            if key in AUDIO_STAGES and rate.is_integer() and rate <= MAX_WAV_RATE:
+                entry.update(file=f"{key}.wav", dtype="float32")
+                _write_wav(os.path.join(path, entry["file"]), x, int(rate))
+                arrays[key] = entry
+                continue
+            dtype = np.complex64 if np.iscomplexobj(x) else np.float32
+        else:
+            dtype = x.dtype
+        entry.update(file=f"{key}.npy", dtype=np.dtype(dtype).name)
+        _write_npy(os.path.join(path, entry["file"]), x, dtype)
+        arrays[key] = entry
+
+    sidecar = {
+        "version": CAPTURE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": p,
+        "scalars": scalars,
+        "arrays": arrays,
+        "metrics": compute_metrics(p, s, processor),
+    }
+    with open(os.path.join(path, SIDECAR), "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, indent=2, default=float)
+    return sidecar
+
+
+def read_sidecar(path):
+    with open(os.path.join(path, SIDECAR), encoding="utf-8") as f:
+        sidecar = json.load(f)
+    if sidecar.get("version") != CAPTURE_VERSION:
+        raise ValueError(f"Versi capture tidak didukung: {sidecar.get('version')}")
+    return sidecar
+
+
+def load_capture(path):
+    """Membuka folder capture; hasil (p, s) berbentuk sama seperti simulate().
+
+    Array dipetakan ke memori (read-only), jadi membuka capture besar
+    tidak membaca seluruh file. t (dan t_pass untuk baseband) dibangun
+    ulang dari laju sampel.
+    """
+    from scipy.io import wavfile
+
+    sidecar = read_sidecar(path)
+    s = dict(sidecar["scalars"])
+    for key, entry in sidecar["arrays"].items():
+        file = os.path.join(path, entry["file"])
+        if file.endswith(".wav"):
+            _, s[key] = wavfile.read(file, mmap=True)
+        else:
+            s[key] = np.load(file, mmap_mode="r")
+    n = sidecar["arrays"].get("msg", {"shape": [0]})["shape"][0]
+    s["t"] = np.arange(n) / s["sr"]
+    if "sr_pass" in s and "mod" in sidecar["arrays"]:
+        s["t_pass"] = np.arange(sidecar["arrays"]["mod"]["shape"][0]) / s["sr_pass"]
+    return sidecar["params"], s
+
+
+def analyze_capture(path, window=None, overlap=None, averaging=None, processor=None):
+    """Analisis ulang capture tanpa simulasi: harmonik dan spektrum Welch.
+
+    THD/THD+N/SINAD dihitung dari sinyal demodulasi tersimpan; spektrum
+    dihitung ulang dari sinyal kanal dengan window/overlap/averaging yang
+    diberikan (default: pengaturan saat capture dibuat).
+    """
+    processor = processor or SignalProcessor()
+    p, s = load_capture(path)
+    h = processor.analyze_harmonics(s["demod"], p["fm"], s["sr"])
+    noisy = s.get("noisy_iq", s["noisy"])
+    sr = s["sr"] if "noisy_iq" in s else _rate_of("noisy", s)
+    window = window or p.get("fft_window", DEFAULT_WINDOW)
+    overlap = p.get("fft_overlap", DEFAULT_OVERLAP) if overlap is None else overlap
+    averaging = averaging or p.get("fft_averaging", DEFAULT_AVERAGING)
+    nperseg = default_nperseg(sr, p["fm"], len(noisy))
+    freq, mag_lin, mag_db = processor.spectrum.spectrum(
+        noisy,
+        sr,
+        window,
+        nperseg,
+        overlap,
+        averaging,
+        fc=p["fc"] if np.iscomplexobj(noisy) else None,
+    )
+    return {
+        "params": p,
+        "thd": h["thd"],
+        "thd_n": h["thd_n"],
+        "sinad": h["sinad"],
+        "harmonics_dbc": h["levels_dbc"],
+        "freq": freq,
+        "mag_lin": mag_lin,
+        "mag_db": mag_db,
+        "rbw": processor.spectrum.rbw(window, nperseg, sr),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Export, inspect and analyze full-resolution signal captures."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    save = sub.add_parser("save", help="simulate a preset or JSON params and save")
+    save.add_argument("path", help="capture folder to write")
+    source = save.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", help="built-in preset name")
+    source.add_argument("--params", help="JSON file with one parameter set")
+    info = sub.add_parser("info", help="print the sidecar summary")
+    info.add_argument("path")
+    analyze = sub.add_parser("analyze", help="recompute THD and spectrum offline")
+    analyze.add_argument("path")
+    analyze.add_argument("--window", help="hann, blackmanharris or flattop")
+    analyze.add_argument("--overlap", type=float, help="segment overlap (0-0.9)")
+    analyze.add_argument("--averaging", help="linear, rms or max")
+    return parser
+
+
+def _folder_bytes(path):
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for name in os.listdir(path)
+        if os.path.isfile(os.path.join(path, name))
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "save":
+        if args.preset:
+            if PRESETS.get(args.preset) is None:
+                raise SystemExit(f"Preset tidak dikenal: {args.preset}")
+            raw = PRESETS[args.preset]
+        else:
+            with open(args.params, encoding="utf-8") as f:
+                raw = json.load(f)
+        p = normalize_params(raw)
+        start = time.perf_counter()
+        save_capture(args.path, p, simulate(p))
+        print(
+            f"{args.path}: {_folder_bytes(args.path) / 2**20:.1f} MiB "
+            f"in {time.perf_counter() - start:.2f} s",
+            file=sys.stderr,
+        )
+    elif args.command == "info":
+        sidecar = read_sidecar(args.path)
+        for key, entry in sidecar["arrays"].items():
+            rate = f" @ {entry['rate']:g} Hz" if "rate" in entry else ""
+            print(
+                f"{key:14s} {entry['file']:16s} {entry['dtype']:9s} "
+                f"{entry['shape']}{rate}"
+            )
+        for key, value in sidecar["metrics"].items():
+            print(f"{key:14s} {value}")
+    else:
+        result = analyze_capture(args.path, args.window, args.overlap, args.averaging)
+        print(f"THD    {result['thd']:.4f} %")
+        print(f"THD+N  {result['thd_n']:.4f} %")
+        print(f"SINAD  {result['sinad']:.2f} dB")
+        levels = ", ".join(f"{v:.1f}" for v in result["harmonics_dbc"][1:])
+        print(f"H2..   {levels} dBc")
+        print(f"RBW    {result['rbw']:.2f} Hz, {len(result['freq'])} bins")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
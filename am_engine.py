@@ -0,0 +1,991 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Mesin Simulasi (tanpa GUI)
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Modul ini berisi seluruh pipeline pemrosesan sinyal AM yang sebelumnya
+# hanya bisa dijalankan dari balik jendela Tk. Tidak boleh mengimpor
+# tkinter, matplotlib, maupun ttkbootstrap agar bisa dipakai di server
+# headless (lihat am_batch.py). scipy.signal diimpor di dalam fungsi yang
+# memakainya, jadi GUI sudah tampil sebelum scipy selesai dimuat.
+# =============================================================================
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from am_oscillator import Oscillator
+from am_parallel import RunCancelled
+from am_spectrum import (
+    AVERAGING_MODES,
+    DEFAULT_AVERAGING,
+    DEFAULT_OVERLAP,
+    DEFAULT_WINDOW,
+    SPECTRUM_WINDOWS,
+    SpectrumAnalyzer,
+    default_nperseg,
+)
+
+# --- Konstanta Simulasi ---
+MAX_SAMPLES = 150_000
+MAX_SAMPLING_RATE = 10e6
+SIM_DURATION = 2.0
+# Minimum whole message periods that must fit in the sample budget
+MIN_MESSAGE_PERIODS = 4
+# Lowest complex-baseband rate (keeps audio playback at a usable rate)
+MIN_BASEBAND_RATE = 8000
+# Signal-chain precision ("precision" parameter). Time/phase vectors and
+# filter states always stay float64; only the stored signals change.
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+DEFAULT_PRECISION = "float64"
+# float64 noise samples drawn per block when filling a float32 array
+NOISE_BLOCK = 1 << 16
+
+# Central source of truth for signal shapes (display name -> internal value)
+SIGNAL_SHAPES = {
+    "Sine": "sine",
+    "Square": "square",
+    "Sawtooth": "sawtooth",
+    "Dual Tone (Music)": "dual_tone",
+}
+
+PRESETS = {
+    "--- Dasar & Edukasional ---": None,
+    "Default (Modulasi Baik)": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 0.7,
+        "fm": "500",
+        "snr": 50,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "Modulasi 100% (Ideal)": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 1.0,
+        "fm": "500",
+        "snr": 50,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "Overmodulation (Distorsi)": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 1.5,
+        "fm": "500",
+        "snr": 50,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "Sinyal Kotak (Harmonik)": {
+        "ac": "1",
+        "fc": "50k",
+        "m": 0.5,
+        "fm": "1k",
+        "snr": 50,
+        "shape": "square",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "DSB-SC (Efisien)": {
+        "ac": "1",
+        "fc": "20k",
+        "m": 1.0,
+        "fm": "1k",
+        "snr": 50,
+        "shape": "sine",
+        "mode": "DSB-SC",
+        "demod_mode": "Coherent",
+        "phase_error": 0,
+    },
+    "--- Audio & Dunia Nyata ---": None,
+    "Nada Uji Terdengar (440Hz)": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 0.8,
+        "fm": "440",
+        "snr": 40,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "AM Radio - Musik (MW)": {
+        "ac": "1",
+        "fc": "900k",
+        "m": 0.8,
+        "fm": "400",
+        "snr": 25,
+        "shape": "dual_tone",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "--- Kondisi Buruk & Batasan ---": None,
+    "Sangat Berisik (SNR Rendah)": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 0.8,
+        "fm": "1k",
+        "snr": 3,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Envelope",
+        "phase_error": 0,
+    },
+    "Coherent - Phase Error 45°": {
+        "ac": "1",
+        "fc": "10k",
+        "m": 0.7,
+        "fm": "500",
+        "snr": 50,
+        "shape": "sine",
+        "mode": "DSB-FC",
+        "demod_mode": "Coherent",
+        "phase_error": 45,
+    },
+}
+
+
+def _fill_normal(out, draw):
+    # Block-wise float64 draws keep the float32 realization identical to the
+    # float64 one (just rounded) without a full-size float64 temporary
+    flat = out.reshape(-1)
+    for start in range(0, flat.size, NOISE_BLOCK):
+        flat[start : start + NOISE_BLOCK] = draw(min(NOISE_BLOCK, flat.size - start))
+
+
+def standard_normal(shape, rng=None, dtype=np.float64, out=None):
+    """Sampel N(0, 1) dari state global, satu Generator, atau satu Generator per baris.
+
+    Jika `out` diberikan (C-contiguous), sampel ditulis ke sana.
+    """
+    if out is None:
+        out = np.empty(shape, dtype)
+    f64 = out.dtype == np.float64
+    if rng is None:
+        # The legacy global state has no out= argument
+        if f64:
+            out[...] = np.random.normal(0, 1, shape)
+        else:
+            _fill_normal(out, lambda k: np.random.normal(0, 1, k))
+    elif isinstance(rng, np.random.Generator):
+        if f64:
+            rng.standard_normal(out=out)
+        else:
+            _fill_normal(out, rng.standard_normal)
+    else:
+        for row, gen in zip(out.reshape(-1, shape[-1]), rng):
+            if f64:
+                gen.standard_normal(out=row)
+            else:
+                _fill_normal(row, gen.standard_normal)
+    return out
+
+
+def signal_dtype(p):
+    """dtype sinyal untuk set parameter `p` (parameter "precision")."""
+    return PRECISIONS[p.get("precision", DEFAULT_PRECISION)]
+
+
+class FilterCache:
+    """Cache LRU terbatas untuk filter Butterworth yang sudah didesain (bentuk SOS).
+
+    Koefisien hanya bergantung pada orde, tipe dan cut-off ternormalisasi
+    (fc / Nyquist), sehingga desain ulang tiap update tidak perlu. Aman
+    dipakai dari beberapa thread.
+    """
+
+    def __init__(self, maxsize=32):
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    def design(self, order, wn, btype="low"):
+        # Round so that fm/sr pairs with the same ratio share one entry
+        key = (int(order), btype, round(float(wn), 12))
+        with self._lock:
+            sos = self._items.get(key)
+            if sos is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return sos
+            self.misses += 1
+        from scipy import signal as sig
+
+        sos = sig.butter(order, wn, btype, output="sos")
+        with self._lock:
+            self._items[key] = sos
+            self._evict()
+        return sos
+
+    def lowpass(self, order, wn):
+        return self.design(order, wn, "low")
+
+    def resize(self, maxsize):
+        """Mengubah kapasitas; entri yang paling lama tidak dipakai dibuang dulu."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._items) > max(self.maxsize, 0):
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+            }
+
+
+# Shared by every SignalProcessor unless one is given explicitly
+FILTER_CACHE = FilterCache()
+
+
+class BufferPool:
+    """Pool array kerja yang dipakai ulang antar update.
+
+    alloc() memberi buffer keluaran tahap. Buffer lama hanya dipakai ulang
+    jika tidak ada lagi yang mereferensikannya: memo Pipeline, hasil yang
+    sedang ditampilkan, view/slice, atau thread penulis cache. Ini dicek
+    lewat sys.getrefcount seperti ndarray.resize(refcheck=True).
+    scratch() memberi buffer sementara yang tidak boleh keluar dari satu
+    pemanggilan metode. Begitu ukuran sampel stabil, update interaktif
+    tidak lagi mengalokasikan array baru untuk tahap-tahap ini.
+    """
+
+    def __init__(self, max_per_key=4):
+        self._lock = threading.Lock()
+        self._outputs = {}
+        self._scratch = {}
+        self.max_per_key = max_per_key
+        self.allocations = self.reuses = 0
+
+    def alloc(self, name, shape, dtype=np.float64):
+        key, shape = (name, np.dtype(dtype).str), tuple(shape)
+        with self._lock:
+            entry = self._outputs.get(key)
+            if entry is None or entry[0] != shape:
+                # A new sample count drops the old buffers (freed once unused)
+                entry = self._outputs[key] = (shape, [])
+            for buf in entry[1]:
+                # References: the pool list, `buf` and getrefcount's argument
+                if sys.getrefcount(buf) <= 3:
+                    self.reuses += 1
+                    return buf
+            buf = np.empty(shape, dtype)
+            self.allocations += 1
+            if len(entry[1]) < self.max_per_key:
+                entry[1].append(buf)
+            return buf
+
+    def scratch(self, name, shape, dtype=np.float64):
+        key, shape = (name, np.dtype(dtype).str), tuple(shape)
+        with self._lock:
+            buf = self._scratch.get(key)
+            if buf is None or buf.shape != shape:
+                buf = self._scratch[key] = np.empty(shape, dtype)
+                self.allocations += 1
+            else:
+                self.reuses += 1
+            return buf
+
+    def clear(self):
+        with self._lock:
+            self._outputs.clear()
+            self._scratch.clear()
+
+    def stats(self):
+        with self._lock:
+            arrays = [b for _, bufs in self._outputs.values() for b in bufs]
+            arrays += list(self._scratch.values())
+            return {
+                "allocations": self.allocations,
+                "reuses": self.reuses,
+                "bytes": sum(b.nbytes for b in arrays),
+            }
+
+
+class SignalProcessor:
+    """Menangani semua tugas pemrosesan sinyal.
+
+    Semua metode bekerja di sepanjang sumbu terakhir, sehingga array 2-D
+    (satu baris per titik parameter) dapat diproses sekaligus; parameter
+    skalar boleh diganti array berbentuk (B, 1) untuk nilai per baris.
+    Dengan `pool` (BufferPool), array keluaran dan sementara diambil dari
+    pool dan diisi lewat ufunc out= alih-alih dialokasikan tiap update.
+    """
+
+    def __init__(self, filter_cache=None, pool=None):
+        self.filters = filter_cache or FILTER_CACHE
+        self.pool = pool
+        # Keeps window arrays and FFT work buffers between updates
+        self.spectrum = SpectrumAnalyzer()
+
+    def alloc(self, name, shape, dtype=np.float64):
+        """Buffer keluaran (dari pool jika ada); isinya belum diinisialisasi."""
+        if self.pool is None:
+            return np.empty(shape, dtype)
+        return self.pool.alloc(name, shape, dtype)
+
+    def scratch(self, name, shape, dtype=np.float64):
+        if self.pool is None:
+            return np.empty(shape, dtype)
+        return self.pool.scratch(name, shape, dtype)
+
+    def _lowpass(self, x, fm, sr):
+        from scipy import signal as sig
+
+        # Zero-phase lowpass at 1.5*fm; SOS stays stable for large sr/fm ratios
+        sos = self.filters.lowpass(4, 1.5 * fm / (0.5 * sr))
+        # The filter runs in float64; the result keeps the input precision
+        return sig.sosfiltfilt(sos, x, axis=-1).astype(x.dtype, copy=False)
+
+    def analyze_harmonics(self, signal_data, fundamental_freq, sampling_rate):
+        """THD, THD+N, SINAD dan level harmonik dari satu rfft (lihat harmonics())."""
+        return self.spectrum.harmonics(signal_data, fundamental_freq, sampling_rate)
+
+    def calculate_thd(self, signal_data, fundamental_freq, sampling_rate):
+        return self.analyze_harmonics(signal_data, fundamental_freq, sampling_rate)[
+            "thd"
+        ]
+
+    def modulate(self, msg, carrier, ac, mode):
+        # (ac + msg) * (carrier / ac) or msg * (carrier / ac), without temporaries
+        shape = np.broadcast_shapes(np.shape(msg), np.shape(carrier))
+        out = self.alloc("mod", shape, np.result_type(msg, carrier, ac))
+        np.divide(carrier, ac, out=out)
+        if mode == "DSB-FC":
+            env = self.scratch("env", shape, out.dtype)
+            np.add(msg, ac, out=env)
+            np.multiply(env, out, out=out)
+        else:
+            np.multiply(msg, out, out=out)
+        return out
+
+    def envelope_demodulate(self, mod, fm, sr):
+        rect = self.scratch("rect", np.shape(mod), np.real(mod).dtype)
+        np.abs(mod, out=rect)
+        dem = self._lowpass(rect, fm, sr)
+        dem -= np.mean(dem, axis=-1, keepdims=True)
+        return dem
+
+    def coherent_demodulate(self, mod, t, fc, pe, fm, sr):
+        # The LO is the carrier oscillator (same time origin) shifted by pe
+        shape = np.broadcast_shapes(np.shape(fc), np.shape(pe), np.shape(t))
+        lo = self.scratch("phase", shape, np.float64)
+        Oscillator.from_time(fc, t).cos(shape[-1], offset=np.deg2rad(pe), out=lo)
+        mul = self.scratch("mul", np.broadcast_shapes(np.shape(mod), shape), mod.dtype)
+        np.multiply(mod, lo, out=mul)
+        dem = self._lowpass(mul, fm, sr)
+        dem *= 2
+        return dem
+
+    def envelope_demodulate_iq(self, env, fm, sr):
+        # |env| is the ideal envelope; 2/pi matches the mean of the passband
+        # full-wave rectifier so both modes give the same demod amplitude.
+        dem = self.envelope_demodulate(env, fm, sr)
+        dem *= 2 / np.pi
+        return dem
+
+    def coherent_demodulate_iq(self, env, pe, fm, sr):
+        rot = np.exp(-1j * np.deg2rad(pe)).astype(env.dtype)
+        # Re(env * rot) without the complex temporary
+        shape = np.broadcast_shapes(np.shape(env), np.shape(rot))
+        mul = self.scratch("mul", shape, np.real(env).dtype)
+        cross = self.scratch("mul_im", shape, mul.dtype)
+        np.multiply(env.real, rot.real, out=mul)
+        np.multiply(env.imag, rot.imag, out=cross)
+        mul -= cross
+        return self._lowpass(mul, fm, sr)
+
+    def add_noise(self, s, snr, rng=None):
+        """Menambahkan AWGN dengan SNR (dB) terhadap daya sinyal per baris.
+
+        `rng` boleh berupa satu np.random.Generator, daftar Generator (satu
+        per baris, agar tiap realisasi tetap reprodusibel apa pun ukuran
+        batch-nya), atau None untuk memakai state global np.random.
+        Untuk selubung kompleks (baseband), noise-nya juga kompleks dengan
+        daya terbagi rata di I dan Q.
+        """
+        shape, real = np.shape(s), np.real(s).dtype
+        power = self.scratch("power", shape, real)
+        np.abs(s, out=power)
+        np.square(power, out=power)
+        p_s = np.mean(power, axis=-1, keepdims=True, dtype=np.float64)
+        p_s_db = 10 * np.log10(p_s + 1e-9)
+        p_n_db = p_s_db - snr
+        p_n = 10 ** (p_n_db / 10)
+        out = self.alloc("noisy", shape, np.result_type(s))
+        noise = self.scratch("noise", shape, real)
+        if np.iscomplexobj(s):
+            # I then Q, drawn in the same order as before
+            scale = np.sqrt(p_n / 2).astype(real)
+            for part, target in ((np.real(s), out.real), (np.imag(s), out.imag)):
+                standard_normal(shape, rng, real, out=noise)
+                noise *= scale
+                np.add(part, noise, out=target)
+            return out
+        standard_normal(shape, rng, real, out=noise)
+        noise *= np.sqrt(p_n).astype(real)
+        return np.add(s, noise, out=out)
+
+    def calc_power(self, ac, m, mode):
+        if mode == "DSB-FC":
+            m_eff = min(m, 1.0)
+            Pc, Psb = (ac**2) / 2, (ac**2 / 2) * (m_eff**2) / 2
+            Pt = Pc + Psb
+            eff = (Psb / Pt) * 100 if Pt > 0 else 0
+        else:
+            Pc, Pt, Psb, eff = (
+                0,
+                (ac * m) ** 2 / 2,
+                (ac * m) ** 2 / 2,
+                100.0 if (ac * m) > 0 else 0,
+            )
+        return {"Pc": Pc, "Psb": Psb, "Pt": Pt, "eff": eff}
+
+    def gen_time_vector(self, dur, sr, max_s):
+        # Keep the true sampling rate; the budget shortens the duration instead
+        n = min(int(round(dur * sr)), max_s)
+        t = np.arange(n, dtype=np.float64)
+        t /= sr
+        return t
+
+    def _tone(self, out, f, t, a):
+        # out = a * cos(2*pi*f*t) from the shared oscillator, rounded once
+        # from float64 in float32 mode
+        tone = out
+        if out.dtype != np.float64:
+            tone = self.scratch("phase", out.shape, np.float64)
+        Oscillator.from_time(f, t).cos(out.shape[-1], a, out=tone)
+        if tone is not out:
+            out[...] = tone
+        return out
+
+    def gen_message_signal(self, t, a, f, sh, dtype=np.float64):
+        shape = np.shape(t)
+        if sh == "dual_tone":
+            tones = self._tone(self.alloc("msg", shape, dtype), f, t, a / 2)
+            tones += self._tone(self.scratch("tone", shape, dtype), 3 * f, t, a / 2)
+            return tones
+        if sh == "sine":
+            return self._tone(self.alloc("msg", shape, dtype), f, t, a)
+        from scipy import signal as sig
+
+        func = {"square": sig.square, "sawtooth": sig.sawtooth}[sh]
+        return a * func(2 * np.pi * f * t).astype(dtype, copy=False)
+
+    def gen_carrier_signal(self, t, a, f, dtype=np.float64):
+        out = self.alloc("carrier", np.shape(t), dtype)
+        return self._tone(out, f, t, a)
+
+    def calc_fft(self, s, sr):
+        n = len(s)
+        if n == 0:
+            return np.array([]), np.array([]), np.array([])
+        yf, xf = np.fft.fft(s), np.fft.fftfreq(n, 1 / sr)
+        mag = 2.0 / n * np.abs(yf[: n // 2])
+        return xf[: n // 2], mag, 20 * np.log10(mag + 1e-9)
+
+    def calc_fft_iq(self, env, sr, fc):
+        """Spektrum passband (sekitar fc) dari selubung kompleks."""
+        n = len(env)
+        if n == 0:
+            return np.array([]), np.array([]), np.array([])
+        yf = np.fft.fftshift(np.fft.fft(env))
+        xf = np.fft.fftshift(np.fft.fftfreq(n, 1 / sr)) + fc
+        mag = np.abs(yf) / n
+        return xf, mag, 20 * np.log10(mag + 1e-9)
+
+
+def parse_input(s):
+    """Mengubah string bernotasi teknik ('10k', '1.5M', '500 Hz') menjadi float."""
+    s = str(s).strip().lower().replace("hz", "").strip()
+    mult = {"k": 1e3, "m": 1e6, "g": 1e9}
+    if not s:
+        raise ValueError("Input string is empty")
+    return float(s[:-1]) * mult[s[-1]] if s and s[-1] in mult else float(s)
+
+
+def default_fft_span(shape, fm):
+    mult = 12 if shape == "square" else (8 if shape == "dual_tone" else 4)
+    return mult * fm
+
+
+def modulation_status(m):
+    if m < 0.99:
+        return "Undermodulation"
+    return "100% Modulation" if m <= 1.01 else "Overmodulation"
+
+
+def normalize_params(raw):
+    """Membuat dict parameter simulasi dari input mentah (preset, JSON, CSV).
+
+    Menerima nama kunci gaya preset ("ac", "snr") maupun gaya internal
+    ("Ac", "snr_db"), serta nilai string bernotasi teknik. Jika "Am" tidak
+    diberikan, nilainya dihitung dari "m" * "Ac". Hasilnya sama dengan
+    keluaran AMSimulatorGUI._parse_inputs.
+    """
+
+    def pick(*keys, default=None):
+        for k in keys:
+            if k in raw and raw[k] not in (None, ""):
+                return raw[k]
+        if default is None:
+            raise ValueError(f"Parameter '{keys[0]}' tidak ditemukan.")
+        return default
+
+    p = {
+        "Ac": parse_input(pick("Ac", "ac", default="1")),
+        "fc": parse_input(pick("fc")),
+        "fm": parse_input(pick("fm")),
+        "shape": str(pick("shape", default="sine")).strip(),
+        "mode": str(pick("mode", default="DSB-FC")).strip(),
+        "snr_db": float(pick("snr_db", "snr", default=50)),
+        "fft_scale": str(pick("fft_scale", default="dB")).strip(),
+        "demod_mode": str(pick("demod_mode", default="Envelope")).strip(),
+        "phase_error": float(pick("phase_error", default=0)),
+        "fft_window": str(pick("fft_window", "window", default=DEFAULT_WINDOW)),
+        "fft_overlap": float(pick("fft_overlap", "overlap", default=DEFAULT_OVERLAP)),
+        "fft_averaging": str(
+            pick("fft_averaging", "averaging", default=DEFAULT_AVERAGING)
+        ),
+        "precision": str(pick("precision", default=DEFAULT_PRECISION)).strip(),
+    }
+    if raw.get("seed") not in (None, ""):
+        p["seed"] = int(raw["seed"])
+    if raw.get("baseband") not in (None, ""):
+        p["baseband"] = str(raw["baseband"]).strip().lower() in ("1", "true", "yes")
+    if raw.get("zoom", raw.get("fft_zoom")) not in (None, ""):
+        p["fft_zoom"] = str(pick("fft_zoom", "zoom")).strip().lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+    if raw.get("rbw", raw.get("fft_rbw")) not in (None, ""):
+        p["fft_rbw"] = parse_input(pick("fft_rbw", "rbw"))
+    if "Am" in raw or "am" in raw:
+        p["Am"] = parse_input(pick("Am", "am"))
+    else:
+        p["Am"] = float(pick("m", default=0.7)) * p["Ac"]
+    p["fft_center"] = parse_input(pick("fft_center", default=p["fc"]))
+    p["fft_span"] = parse_input(
+        pick("fft_span", default=default_fft_span(p["shape"], p["fm"]))
+    )
+
+    if p["shape"] not in SIGNAL_SHAPES.values():
+        raise ValueError(f"Bentuk sinyal tidak dikenal: {p['shape']}")
+    if p["mode"] not in ("DSB-FC", "DSB-SC"):
+        raise ValueError(f"Mode AM tidak dikenal: {p['mode']}")
+    if p["demod_mode"] not in ("Envelope", "Coherent"):
+        raise ValueError(f"Demodulator tidak dikenal: {p['demod_mode']}")
+    if p["fft_window"] not in SPECTRUM_WINDOWS.values():
+        raise ValueError(f"Window tidak dikenal: {p['fft_window']}")
+    if p["fft_averaging"] not in AVERAGING_MODES.values():
+        raise ValueError(f"Mode averaging tidak dikenal: {p['fft_averaging']}")
+    if p.get("fft_rbw") is not None and p["fft_rbw"] <= 0:
+        raise ValueError("RBW harus positif.")
+    if p["precision"] not in PRECISIONS:
+        raise ValueError(f"Presisi tidak dikenal: {p['precision']}")
+    if not 0 <= p["fft_overlap"] < 1:
+        raise ValueError("Overlap harus di antara 0 dan 1 (tidak termasuk 1).")
+    if any(v <= 0 for v in [p["fc"], p["fm"], p["Ac"], p["fft_span"]]) or p["Am"] < 0:
+        raise ValueError("fc, fm, Ac dan span harus positif, Am tidak boleh negatif.")
+    p["m"] = p["Am"] / p["Ac"]
+    return p
+
+
+def required_sampling_rate(p):
+    required_sr = max(5 * p["fc"], 20 * p["fm"], 44100)
+    if p["shape"] == "dual_tone":
+        # For higher harmonic of dual_tone
+        required_sr = max(required_sr, 20 * (3 * p["fm"]))
+    if required_sr > MAX_SAMPLING_RATE:
+        max_fc_str = f"{MAX_SAMPLING_RATE / 5 / 1e6:g} MHz"
+        raise ValueError(
+            f"Frekuensi Carrier terlalu tinggi. Coba nilai di bawah {max_fc_str}."
+        )
+    return required_sr
+
+
+def signal_duration(p, sr, dur=SIM_DURATION, max_s=MAX_SAMPLES * 2):
+    """Durasi simulasi yang muat dalam anggaran sampel pada laju `sr` penuh.
+
+    Jika dur * sr melebihi `max_s`, durasinya dipendekkan (bukan laju
+    sampelnya yang diturunkan, yang dulu membuat carrier fc tinggi alias).
+    Durasi dibulatkan ke bawah ke kelipatan periode pesan agar FFT/THD tidak
+    bocor di tepi.
+    """
+    n = min(int(round(dur * sr)), max_s)
+    periods = int(n * p["fm"] / sr)
+    if periods < MIN_MESSAGE_PERIODS:
+        raise ValueError(
+            f"fm terlalu rendah untuk laju sampel {sr / 1e6:g} MHz: hanya "
+            f"{n * p['fm'] / sr:.1f} periode pesan muat dalam {max_s} sampel. "
+            "Naikkan fm atau turunkan fc."
+        )
+    return int(periods * sr / p["fm"]) / sr
+
+
+def baseband_sampling_rate(p):
+    """Laju sampel selubung kompleks: ditentukan bandwidth pesan, bukan fc."""
+    top = 3 * p["fm"] if p["shape"] == "dual_tone" else p["fm"]
+    return max(20 * top, MIN_BASEBAND_RATE)
+
+
+def _noise_rng(p):
+    return np.random.default_rng(p["seed"]) if p.get("seed") is not None else None
+
+
+def _plot_samples(p, sr, n):
+    return min(int((5 / p["fm"]) * sr), n, MAX_SAMPLES)
+
+
+# --- Tahap pipeline passband ---
+def _time_stage(processor, p, s):
+    sr = required_sampling_rate(p)
+    t = processor.gen_time_vector(signal_duration(p, sr), sr, MAX_SAMPLES * 2)
+    return {
+        "t": t,
+        "sr": sr,
+        "duration": len(t) / sr,
+        "plot_samples": _plot_samples(p, sr, len(t)),
+    }
+
+
+def _message_stage(processor, p, s):
+    msg = processor.gen_message_signal(
+        s["t"], p["Am"], p["fm"], p["shape"], signal_dtype(p)
+    )
+    return {"msg": msg}
+
+
+def _carrier_stage(processor, p, s):
+    carrier = processor.gen_carrier_signal(s["t"], p["Ac"], p["fc"], signal_dtype(p))
+    return {"carrier": carrier}
+
+
+def _modulate_stage(processor, p, s):
+    return {"mod": processor.modulate(s["msg"], s["carrier"], p["Ac"], p["mode"])}
+
+
+def _channel_stage(processor, p, s):
+    return {"noisy": processor.add_noise(s["mod"], p["snr_db"], _noise_rng(p))}
+
+
+def _demod_stage(processor, p, s):
+    if p["demod_mode"] == "Coherent":
+        demod = processor.coherent_demodulate(
+            s["noisy"], s["t"], p["fc"], p["phase_error"], p["fm"], s["sr"]
+        )
+    else:
+        demod = processor.envelope_demodulate(s["noisy"], p["fm"], s["sr"])
+    return {"demod": demod}
+
+
+def _welch(processor, p, x, sr, fc=None):
+    if p.get("fft_zoom"):
+        # The zoom stage computes the visible band instead
+        return {}
+    nperseg = default_nperseg(sr, p["fm"], len(x))
+    window = p.get("fft_window", DEFAULT_WINDOW)
+    freq, mag_lin, mag_db = processor.spectrum.spectrum(
+        x,
+        sr,
+        window=window,
+        nperseg=nperseg,
+        overlap=p.get("fft_overlap", DEFAULT_OVERLAP),
+        averaging=p.get("fft_averaging", DEFAULT_AVERAGING),
+        fc=fc,
+    )
+    rbw = processor.spectrum.rbw(window, nperseg, sr)
+    return {"freq": freq, "mag_lin": mag_lin, "mag_db": mag_db, "rbw": rbw}
+
+
+def _zoom(processor, p, x, sr, fc=None):
+    if not p.get("fft_zoom"):
+        return {}
+    freq, mag_lin, mag_db, rbw = processor.spectrum.zoom_spectrum(
+        x,
+        sr,
+        p["fft_center"],
+        p["fft_span"],
+        rbw=p.get("fft_rbw"),
+        window=p.get("fft_window", DEFAULT_WINDOW),
+        overlap=p.get("fft_overlap", DEFAULT_OVERLAP),
+        averaging=p.get("fft_averaging", DEFAULT_AVERAGING),
+        fc=fc,
+    )
+    return {"freq": freq, "mag_lin": mag_lin, "mag_db": mag_db, "rbw": rbw}
+
+
+def _spectrum_stage(processor, p, s):
+    # Averaged spectrum of the channel signal, so the noise floor shows
+    return _welch(processor, p, s["noisy"], s["sr"])
+
+
+def _zoom_stage(processor, p, s):
+    return _zoom(processor, p, s["noisy"], s["sr"])
+
+
+def _thd_stage(processor, p, s):
+    h = processor.analyze_harmonics(s["demod"], p["fm"], s["sr"])
+    return {
+        "thd": h["thd"],
+        "thd_n": h["thd_n"],
+        "sinad": h["sinad"],
+        "harmonics_dbc": h["levels_dbc"],
+    }
+
+
+# --- Tahap pipeline baseband (IQ) ---
+def _baseband_time_stage(processor, p, s):
+    sr = baseband_sampling_rate(p)
+    t = processor.gen_time_vector(signal_duration(p, sr), sr, MAX_SAMPLES * 2)
+    return {
+        "t": t,
+        "sr": sr,
+        "duration": len(t) / sr,
+        "plot_samples": _plot_samples(p, sr, len(t)),
+        "baseband": True,
+    }
+
+
+def _envelope_stage(processor, p, s):
+    # A constant "carrier" of amplitude Ac turns modulate() into the envelope
+    env = processor.modulate(s["msg"], p["Ac"], p["Ac"], p["mode"])
+    mod_iq = processor.alloc(
+        "mod_iq", env.shape, np.result_type(env.dtype, np.complex64)
+    )
+    mod_iq.real, mod_iq.imag = env, 0
+    return {"mod_iq": mod_iq}
+
+
+def _baseband_channel_stage(processor, p, s):
+    return {"noisy_iq": processor.add_noise(s["mod_iq"], p["snr_db"], _noise_rng(p))}
+
+
+def _baseband_demod_stage(processor, p, s):
+    if p["demod_mode"] == "Coherent":
+        demod = processor.coherent_demodulate_iq(
+            s["noisy_iq"], p["phase_error"], p["fm"], s["sr"]
+        )
+    else:
+        demod = processor.envelope_demodulate_iq(s["noisy_iq"], p["fm"], s["sr"])
+    return {"demod": demod}
+
+
+def _passband_stage(processor, p, s):
+    from scipy import signal as sig
+
+    # Passband only for the plotted window, at an integer multiple of sr
+    sr, env, noisy_iq = s["sr"], s["mod_iq"], s["noisy_iq"]
+    up = int(np.ceil(required_sampling_rate(p) / sr))
+    sr_pass = up * sr
+    n_pass = min(s["plot_samples"] * up, MAX_SAMPLES)
+    t_pass = np.arange(n_pass) / sr_pass
+    lo = Oscillator(p["fc"], sr_pass).iq(n_pass)
+    # Extra input samples keep the polyphase filter edge out of the window
+    n_in = min(len(s["t"]), n_pass // up + 16)
+    noisy_up = sig.resample_poly(noisy_iq[:n_in], up, 1)[:n_pass]
+    env_up = sig.resample_poly(env[:n_in], up, 1)[:n_pass]
+    dtype = signal_dtype(p)
+    return {
+        "carrier": (p["Ac"] * np.real(lo)).astype(dtype, copy=False),
+        "mod": np.real(env_up * lo).astype(dtype, copy=False),
+        "noisy": np.real(noisy_up * lo).astype(dtype, copy=False),
+        "t_pass": t_pass,
+        "sr_pass": sr_pass,
+    }
+
+
+def _baseband_spectrum_stage(processor, p, s):
+    return _welch(processor, p, s["noisy_iq"], s["sr"], fc=p["fc"])
+
+
+def _baseband_zoom_stage(processor, p, s):
+    return _zoom(processor, p, s["noisy_iq"], s["sr"], fc=p["fc"])
+
+
+SPECTRUM_PARAMS = ("fm", "fft_window", "fft_overlap", "fft_averaging", "fft_zoom")
+ZOOM_PARAMS = SPECTRUM_PARAMS + ("fft_center", "fft_span", "fft_rbw")
+
+
+class Stage:
+    """Satu tahap pipeline: fungsi, parameter yang dibaca dan tahap yang dibutuhkan."""
+
+    def __init__(self, name, func, params=(), deps=()):
+        self.name, self.func = name, func
+        self.params, self.deps = tuple(params), tuple(deps)
+
+
+# Urutan topologis: setiap tahap hanya bergantung pada tahap sebelumnya
+PASSBAND_STAGES = (
+    Stage("time", _time_stage, ("fc", "fm", "shape")),
+    Stage("message", _message_stage, ("Am", "fm", "shape", "precision"), ("time",)),
+    Stage("carrier", _carrier_stage, ("Ac", "fc", "precision"), ("time",)),
+    Stage("modulate", _modulate_stage, ("Ac", "mode"), ("message", "carrier")),
+    Stage("channel", _channel_stage, ("snr_db", "seed"), ("modulate",)),
+    Stage(
+        "demod",
+        _demod_stage,
+        ("demod_mode", "fc", "phase_error", "fm"),
+        ("time", "channel"),
+    ),
+    Stage("spectrum", _spectrum_stage, SPECTRUM_PARAMS, ("time", "channel")),
+    Stage("zoom", _zoom_stage, ZOOM_PARAMS, ("time", "channel")),
+    Stage("thd", _thd_stage, ("fm",), ("time", "demod")),
+)
+
+BASEBAND_STAGES = (
+    Stage("time", _baseband_time_stage, ("fm", "shape")),
+    Stage("message", _message_stage, ("Am", "fm", "shape", "precision"), ("time",)),
+    Stage("envelope", _envelope_stage, ("Ac", "mode"), ("message",)),
+    Stage("channel", _baseband_channel_stage, ("snr_db", "seed"), ("envelope",)),
+    Stage(
+        "demod",
+        _baseband_demod_stage,
+        ("demod_mode", "phase_error", "fm"),
+        ("time", "channel"),
+    ),
+    Stage("passband", _passband_stage, ("Ac", "fc", "precision"), ("time", "channel")),
+    Stage(
+        "spectrum",
+        _baseband_spectrum_stage,
+        ("fc",) + SPECTRUM_PARAMS,
+        ("time", "channel"),
+    ),
+    Stage("zoom", _baseband_zoom_stage, ("fc",) + ZOOM_PARAMS, ("time", "channel")),
+    Stage("thd", _thd_stage, ("fm",), ("time", "demod")),
+)
+
+
+class Pipeline:
+    """Pipeline AM inkremental: keluaran tiap tahap di-memo berdasarkan inputnya.
+
+    Sebuah tahap hanya dihitung ulang jika parameter yang dibacanya atau
+    salah satu tahap yang dibutuhkannya berubah; misalnya mengubah SNR
+    tidak membangkitkan ulang pesan dan carrier. Array hasil dipakai
+    bersama antar run, jadi jangan diubah di tempat. `last_run` berisi
+    nama tahap yang benar-benar dihitung pada run terakhir dan
+    `last_timings` durasinya (ms).
+
+    `cancelled` (opsional) diperiksa sebelum tiap tahap; jika bernilai
+    benar, run dihentikan dengan RunCancelled dan tahap yang sudah selesai
+    tetap tersimpan di memo.
+    """
+
+    def __init__(self, processor=None):
+        self.processor = processor or SignalProcessor()
+        self._memo = {}
+        self._serial = 0
+        self._lock = threading.Lock()
+        self.last_run = []
+        self.last_timings = {}
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    def run(self, p, cancelled=None):
+        graph = "baseband" if p.get("baseband") else "passband"
+        stages = BASEBAND_STAGES if graph == "baseband" else PASSBAND_STAGES
+        with self._lock:
+            memo = self._memo.setdefault(graph, {})
+            s, serials, ran, timings = {}, {}, [], {}
+            for stage in stages:
+                key = (
+                    tuple(p.get(k) for k in stage.params),
+                    tuple(serials[d] for d in stage.deps),
+                )
+                entry = memo.get(stage.name)
+                if entry is None or entry[0] != key:
+                    if cancelled is not None and cancelled():
+                        self.last_run, self.last_timings = ran, timings
+                        raise RunCancelled("Run dibatalkan.")
+                    start = time.perf_counter()
+                    try:
+                        outputs = stage.func(self.processor, p, s)
+                    except Exception:
+                        memo.pop(stage.name, None)
+                        raise
+                    timings[stage.name] = (time.perf_counter() - start) * 1e3
+                    self._serial += 1
+                    entry = memo[stage.name] = (key, self._serial, outputs)
+                    ran.append(stage.name)
+                serials[stage.name] = entry[1]
+                s.update(entry[2])
+            self.last_run, self.last_timings = ran, timings
+        return s
+
+
+def simulate_baseband(p, processor=None):
+    """Simulasi ekuivalen baseband (IQ) untuk fc tinggi.
+
+    Modulasi, noise dan demodulasi dihitung pada selubung kompleks dengan
+    laju baseband_sampling_rate(p). Sinyal passband (carrier dan kanal)
+    hanya disintesis untuk jendela plot lewat upsampling polyphase. SNR
+    didefinisikan terhadap bandwidth simulasi baseband, bukan 0..5*fc.
+    """
+    return Pipeline(processor).run({**p, "baseband": True})
+
+
+def simulate(p, processor=None):
+    """Menjalankan seluruh pipeline AM untuk satu set parameter.
+
+    `p` adalah dict hasil normalize_params (atau AMSimulatorGUI._parse_inputs).
+    Jika `p` berisi "seed", noise dibangkitkan dari Generator ber-seed
+    sehingga hasilnya reprodusibel.
+    Jika p["baseband"] benar, dijalankan lewat tahap-tahap baseband (IQ).
+    Mengembalikan dict berisi semua sinyal beserta hasil FFT dan THD.
+    Untuk update berulang, pakai Pipeline agar tahap yang tidak berubah
+    tidak dihitung ulang.
+    """
+    return Pipeline(processor).run(p)
+
+
+def compute_metrics(p, s, processor=None):
+    """Merangkum metrik skalar (m, THD(+N), SINAD, efisiensi, BW, SNR) dari simulate."""
+    processor = processor or SignalProcessor()
+    power = processor.calc_power(p["Ac"], p["m"], p["mode"])
+    bw_mult = 6 if p["shape"] == "dual_tone" else 2
+    mod, noisy = s.get("mod_iq", s["mod"]), s.get("noisy_iq", s["noisy"])
+    p_sig = np.mean(np.abs(mod) ** 2)
+    p_noise = np.mean(np.abs(noisy - mod) ** 2)
+    snr_measured = 10 * np.log10(p_sig / p_noise) if p_noise > 0 else float("inf")
+    return {
+        "m": p["m"],
+        "status": modulation_status(p["m"]),
+        "thd": float(s["thd"]),
+        "thd_n": float(s["thd_n"]),
+        "sinad": float(s["sinad"]),
+        "efficiency": float(power["eff"]),
+        "bandwidth": bw_mult * p["fm"],
+        "snr_measured": float(snr_measured),
+        "sr": float(s["sr"]),
+        "duration": float(s["duration"]),
+    }
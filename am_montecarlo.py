@@ -0,0 +1,141 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Statistik Monte Carlo
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menjalankan N realisasi noise independen untuk satu set parameter dan
+# melaporkan statistik THD serta SNR keluaran demodulator. Realisasi ke-i
+# selalu memakai anak ke-i dari SeedSequence(seed), sehingga hasil sama
+# persis berapa pun ukuran blok maupun jumlah proses yang dipakai.
+# =============================================================================
+
+import numpy as np
+
+from am_engine import (
+    MAX_SAMPLES,
+    SignalProcessor,
+    required_sampling_rate,
+    signal_duration,
+    signal_dtype,
+)
+
+# Batas memori kasar untuk satu blok realisasi (per array sinyal)
+BLOCK_BYTES = 64 * 1024 * 1024
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def trial_generators(seed, indices):
+    """Generator untuk realisasi `indices`; identik dengan SeedSequence(seed).spawn()."""
+    return [
+        np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(int(i),)))
+        for i in indices
+    ]
+
+
+def _demodulate(processor, p, x, t, sr):
+    if p["demod_mode"] == "Coherent":
+        return processor.coherent_demodulate(
+            x, t, p["fc"], p["phase_error"], p["fm"], sr
+        )
+    return processor.envelope_demodulate(x, p["fm"], sr)
+
+
+def run_trials(p, seed, indices, processor=None, block_rows=None):
+    """Menghitung [THD, SNR keluaran] untuk realisasi noise `indices` -> (k, 2).
+
+    Pesan, carrier, sinyal termodulasi dan hasil demodulasi tanpa noise
+    (acuan SNR keluaran) hanya dihitung sekali; realisasi diproses sebagai
+    baris-baris array 2-D per blok.
+    """
+    processor = processor or SignalProcessor()
+    sr = required_sampling_rate(p)
+    t = processor.gen_time_vector(signal_duration(p, sr), sr, MAX_SAMPLES * 2)
+    dtype = signal_dtype(p)
+    msg = processor.gen_message_signal(t, p["Am"], p["fm"], p["shape"], dtype)
+    carrier = processor.gen_carrier_signal(t, p["Ac"], p["fc"], dtype)
+    mod = processor.modulate(msg, carrier, p["Ac"], p["mode"])
+    clean = _demodulate(processor, p, mod, t, sr)
+    p_clean = np.mean(clean**2)
+
+    indices = np.asarray(indices)
+    out = np.empty((len(indices), 2))
+    block_rows = block_rows or max(1, BLOCK_BYTES // (dtype().itemsize * len(t)))
+    for start in range(0, len(indices), block_rows):
+        rows = slice(start, min(start + block_rows, len(indices)))
+        rngs = trial_generators(seed, indices[rows])
+        batch = np.broadcast_to(mod, (len(rngs), len(mod)))
+        demod = _demodulate(
+            processor, p, processor.add_noise(batch, p["snr_db"], rngs), t, sr
+        )
+        out[rows, 0] = processor.calculate_thd(demod, p["fm"], sr)
+        p_err = np.mean((demod - clean) ** 2, axis=-1)
+        with np.errstate(divide="ignore"):
+            out[rows, 1] = 10 * np.log10(p_clean / p_err)
+    return out
+
+
+def _trials_kernel(context, indices):
+    p, seed = context
+    return run_trials(p, seed, indices)
+
+
+def summarize(samples, confidence=0.95):
+    """Rata-rata, deviasi standar, interval kepercayaan rata-rata dan persentil."""
+    from scipy import stats
+
+    samples = np.asarray(samples, float)
+    finite = samples[np.isfinite(samples)]
+    n = len(finite)
+    mean = float(np.mean(finite)) if n else float("nan")
+    std = float(np.std(finite, ddof=1)) if n > 1 else 0.0
+    half = (
+        float(stats.t.ppf(0.5 + confidence / 2, n - 1) * std / np.sqrt(n))
+        if n > 1
+        else float("nan")
+    )
+    summary = {
+        "n": n,
+        "mean": mean,
+        "std": std,
+        "ci_low": mean - half,
+        "ci_high": mean + half,
+    }
+    for q, v in zip(PERCENTILES, np.percentile(finite, PERCENTILES) if n else []):
+        summary[f"p{q}"] = float(v)
+    return summary
+
+
+def monte_carlo(p, trials=1000, seed=None, runner=None, confidence=0.95):
+    """Menjalankan `trials` realisasi noise untuk set parameter `p`.
+
+    Jika `seed` None, entropi baru diambil dan dilaporkan di hasil agar run
+    bisa diulang. `runner` (am_parallel.ParallelRunner) membagi realisasi ke
+    beberapa proses tanpa mengubah hasilnya.
+    """
+    if trials < 1:
+        raise ValueError("Jumlah trial minimal 1.")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    indices = np.arange(trials)
+    if runner is None:
+        values = run_trials(p, seed, indices)
+    else:
+        values = runner.map(_trials_kernel, indices, 2, context=(p, seed))
+    return {
+        "trials": trials,
+        "seed": seed,
+        "confidence": confidence,
+        "thd": summarize(values[:, 0], confidence),
+        "snr_out": summarize(values[:, 1], confidence),
+        "samples": {"thd": values[:, 0], "snr_out": values[:, 1]},
+    }
+
+
+def monte_carlo_row(result):
+    """Meratakan ringkasan Monte Carlo menjadi satu dict (untuk CSV/JSON)."""
+    row = {"trials": result["trials"], "seed": result["seed"]}
+    for metric in ("thd", "snr_out"):
+        for key, value in result[metric].items():
+            if key != "n":
+                row[f"{metric}_{key}"] = value
+    return row
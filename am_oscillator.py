@@ -0,0 +1,128 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Osilator Bersama (Rotator / NCO)
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Satu osilator untuk carrier, pesan, LO demodulator koheren, LO passband
+# dan mixer zoom. Alih-alih menghitung cos/exp untuk setiap sampel, blok
+# sepanjang n disusun dari dua tabel pendek (~sqrt(n) titik) lewat identitas
+# penjumlahan sudut: exp(j(a+b)) = exp(ja) * exp(jb). Tabel kasar dihitung
+# langsung dari fasa absolut tiap sub-blok, jadi galat tidak menumpuk
+# (renormalisasi di setiap sub-blok) dan fasa tetap kontinu antar panggilan.
+# Hanya bergantung pada numpy agar bisa diimpor modul mana pun.
+# =============================================================================
+
+import numpy as np
+
+TWO_PI = 2 * np.pi
+
+
+def _rows(x):
+    # Per-row values arrive as (B, 1) like every SignalProcessor parameter;
+    # the tables are built per row, so drop that sample axis
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 0:
+        return x
+    if x.shape[-1] != 1:
+        raise ValueError(f"Parameter per baris harus berbentuk (..., 1): {x.shape}")
+    return x[..., 0]
+
+
+class Oscillator:
+    """Osilator fasa kontinu: amplitude * cos(phase + offset), dst.
+
+    `freq` (Hz) dan `phase` (rad) boleh skalar atau array (B, 1) untuk satu
+    osilator per baris. Setiap pemanggilan cos()/iq()/phases() mengambil
+    blok berikutnya dan memajukan fasa, sehingga blok berurutan menyambung
+    tanpa lompatan fasa. `offset` hanya menggeser blok yang dihasilkan,
+    state osilator tidak berubah (dipakai untuk galat fasa LO).
+    """
+
+    def __init__(self, freq, sr, phase=0.0):
+        self.freq, self.sr, self.phase = freq, sr, phase
+
+    @classmethod
+    def from_time(cls, freq, t):
+        """Osilator yang sampel ke-k-nya bernilai pada waktu t[k] (t 1-D seragam)."""
+        t = np.ravel(t)
+        start = t[0] if len(t) else 0.0
+        step = t[1] - t[0] if len(t) > 1 else 1.0
+        phase = np.mod(TWO_PI * np.asarray(freq, dtype=np.float64) * start, TWO_PI)
+        return cls(freq, 1.0 / step, float(phase) if phase.ndim == 0 else phase)
+
+    @property
+    def step(self):
+        """Kenaikan fasa per sampel (rad)."""
+        return TWO_PI * np.asarray(self.freq, dtype=np.float64) / self.sr
+
+    def _advance(self, n):
+        phase = np.mod(self.phase + self.step * n, TWO_PI)
+        self.phase = float(phase) if np.ndim(phase) == 0 else phase
+
+    def _tables(self, n, offset):
+        # coarse[m] = exp(j(phase + step*block*m)), fine[k] = exp(j*step*k)
+        w, start = np.broadcast_arrays(
+            _rows(self.step), _rows(np.add(self.phase, offset))
+        )
+        block = max(1, int(np.ceil(np.sqrt(n))))
+        coarse = np.exp(
+            1j * (start[..., None] + w[..., None] * block * np.arange(-(-n // block)))
+        )
+        fine = np.exp(1j * w[..., None] * np.arange(block))
+        return coarse, fine, block
+
+    def _out(self, n, amplitude, offset, out, dtype):
+        if out is None:
+            lead = np.broadcast_shapes(
+                *(
+                    np.shape(_rows(x))
+                    for x in (self.step, self.phase, amplitude, offset)
+                )
+            )
+            out = np.empty(lead + (n,), dtype)
+        return out
+
+    def iq(self, n, amplitude=1.0, offset=0.0, out=None, dtype=np.complex128):
+        """Blok kompleks amplitude * exp(j(phase + offset)) sepanjang n."""
+        out = self._out(n, amplitude, offset, out, dtype)
+        if n:
+            coarse, fine, block = self._tables(n, offset)
+            coarse = coarse * _rows(amplitude)[..., None]
+            full = n // block
+            body = out[..., : full * block].reshape(out.shape[:-1] + (full, block))
+            np.multiply(coarse[..., :full, None], fine[..., None, :], out=body)
+            np.multiply(
+                coarse[..., -1:],
+                fine[..., : n - full * block],
+                out=out[..., full * block :],
+            )
+        self._advance(n)
+        return out
+
+    def cos(self, n, amplitude=1.0, offset=0.0, out=None, dtype=np.float64):
+        """Blok real amplitude * cos(phase + offset) sepanjang n.
+
+        Re(coarse * fine) = [Re c, -Im c] @ [Re f; Im f], jadi seluruh blok
+        adalah satu perkalian matriks (B, n/block, 2) @ (B, 2, block) yang
+        ditulis langsung ke `out`.
+        """
+        out = self._out(n, amplitude, offset, out, dtype)
+        if n:
+            coarse, fine, block = self._tables(n, offset)
+            coarse = coarse * _rows(amplitude)[..., None]
+            rows = np.stack([coarse.real, -coarse.imag], axis=-1).astype(out.dtype)
+            cols = np.stack([fine.real, fine.imag], axis=-2).astype(out.dtype)
+            lead, full = out.shape[:-1], n // block
+            body = out[..., : full * block].reshape(lead + (full, block))
+            np.matmul(rows[..., :full, :], cols, out=body)
+            tail = out[..., full * block :].reshape(lead + (1, n - full * block))
+            np.matmul(rows[..., -1:, :], cols[..., : n - full * block], out=tail)
+        self._advance(n)
+        return out
+
+    def phases(self, n):
+        """Fasa sesaat (rad) sepanjang n, untuk bentuk gelombang non-sinus."""
+        w = _rows(self.step)[..., None]
+        phases = _rows(self.phase)[..., None] + w * np.arange(n)
+        self._advance(n)
+        return phases
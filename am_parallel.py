@@ -0,0 +1,145 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Eksekusi Paralel Berbasis Proses
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Thread tidak membantu karena bagian Python dari pipeline memegang GIL.
+# ParallelRunner membagi titik sweep / realisasi noise ke beberapa proses
+# (ProcessPoolExecutor). Hasil ditulis langsung ke shared memory, sehingga
+# yang dikirim balik lewat pickle hanya indeks chunk, bukan array.
+# =============================================================================
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class RunCancelled(Exception):
+    """Dilempar jika run dibatalkan (ParallelRunner.cancel, Pipeline.run)."""
+
+
+def _attach(name):
+    """Membuka shared memory milik proses induk (induk yang melakukan unlink)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker,
+        # so the duplicate registration is harmless.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker():
+    # Forked workers inherit the parent's global RNG state; reseed so that
+    # unseeded noise differs between workers.
+    np.random.seed()
+
+
+def _run_chunk(kernel, context, items, start, out_name, out_shape, flag_name):
+    flag = _attach(flag_name)
+    try:
+        if flag.buf[0]:
+            return start, 0
+        values = np.asarray(kernel(context, items), dtype=np.float64)
+        out = _attach(out_name)
+        try:
+            view = np.ndarray(out_shape, dtype=np.float64, buffer=out.buf)
+            view[start : start + len(values)] = values.reshape(len(values), -1)
+            del view
+        finally:
+            out.close()
+        return start, len(values)
+    finally:
+        flag.close()
+
+
+class ParallelRunner:
+    """Menjalankan kernel per chunk di semua core dengan hasil di shared memory.
+
+    `kernel(context, items)` harus fungsi tingkat modul (bisa di-pickle) yang
+    mengembalikan array (len(items), n_fields). `chunk_size` mengatur berapa
+    item per tugas: chunk kecil = penyeimbangan beban dan pembatalan lebih
+    halus, chunk besar = overhead per tugas lebih kecil.
+    """
+
+    def __init__(self, workers=None, chunk_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._cancel = threading.Event()
+        self._flag = None
+
+    def cancel(self):
+        """Membatalkan run yang sedang berjalan (aman dipanggil dari thread lain)."""
+        self._cancel.set()
+        if self._flag is not None:
+            self._flag.buf[0] = 1
+
+    def _chunk_size(self, n_items):
+        if self.chunk_size:
+            return max(1, int(self.chunk_size))
+        # A few chunks per worker keeps all cores busy until the end
+        return max(1, -(-n_items // (self.workers * 4)))
+
+    def map(self, kernel, items, n_fields, context=None, progress=None):
+        """Mengembalikan array (len(items), n_fields) hasil kernel untuk semua item.
+
+        `progress(done, total)` dipanggil di proses induk setiap chunk selesai.
+        Melempar RunCancelled jika cancel() dipanggil sebelum selesai.
+        """
+        n_items = len(items)
+        result = np.full((n_items, n_fields), np.nan)
+        if n_items == 0:
+            return result
+        self._cancel.clear()
+        size = self._chunk_size(n_items)
+
+        out = shared_memory.SharedMemory(create=True, size=result.nbytes)
+        self._flag = flag = shared_memory.SharedMemory(create=True, size=1)
+        flag.buf[0] = 0
+        view = None
+        try:
+            view = np.ndarray(result.shape, dtype=np.float64, buffer=out.buf)
+            view[:] = np.nan
+            with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker
+            ) as pool:
+                pending = {
+                    pool.submit(
+                        _run_chunk,
+                        kernel,
+                        context,
+                        items[start : start + size],
+                        start,
+                        out.name,
+                        result.shape,
+                        flag.name,
+                    )
+                    for start in range(0, n_items, size)
+                }
+                done_items = 0
+                while pending:
+                    if self._cancel.is_set():
+                        for future in pending:
+                            future.cancel()
+                        break
+                    finished, pending = wait(
+                        pending, timeout=0.2, return_when=FIRST_COMPLETED
+                    )
+                    for future in finished:
+                        done_items += future.result()[1]
+                        if progress:
+                            progress(done_items, n_items)
+            result[:] = view
+        finally:
+            # Drop the buffer export before closing, even on errors
+            view = None
+            self._flag = None
+            flag.close()
+            flag.unlink()
+            out.close()
+            out.unlink()
+        if self._cancel.is_set():
+            raise RunCancelled("Run dibatalkan.")
+        return result
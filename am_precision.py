@@ -0,0 +1,105 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Cek Akurasi Mode Presisi float32
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menjalankan set parameter yang sama dalam presisi float64 dan float32
+# (seed noise sama) lalu membandingkan THD, THD+N, SINAD, efisiensi dan SNR
+# terukur, beserta puncak memori yang dialokasikan dan waktu proses.
+# Keluar dengan kode 1 jika selisih melewati toleransi.
+#
+# Contoh:
+#   python am_precision.py                  # semua preset, passband + baseband
+#   python am_precision.py runs.json --seed 7
+# =============================================================================
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from am_batch import _preset_param_sets, load_param_sets
+from am_engine import compute_metrics, normalize_params, simulate
+
+# metric -> (absolute, relative) tolerance of float32 against float64
+TOLERANCES = {
+    "thd": (1e-3, 1e-2),
+    "thd_n": (1e-3, 1e-2),
+    "sinad": (0.05, 0.0),
+    "efficiency": (1e-9, 0.0),
+    "snr_measured": (1e-3, 0.0),
+}
+
+
+def _run(p):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        s = simulate(p)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return compute_metrics(p, s), peak, elapsed
+
+
+def compare_precision(raw, seed=0):
+    """Membandingkan float32 terhadap float64 untuk satu set parameter mentah."""
+    results = {}
+    for precision in ("float64", "float32"):
+        p = normalize_params({"seed": seed, **raw, "precision": precision})
+        results[precision] = _run(p)
+    ref, peak64, time64 = results["float64"]
+    low, peak32, time32 = results["float32"]
+    row = {"peak_mb_64": peak64 / 2**20, "peak_mb_32": peak32 / 2**20}
+    row.update(ms_64=time64 * 1e3, ms_32=time32 * 1e3, ok=True)
+    for metric, (abs_tol, rel_tol) in TOLERANCES.items():
+        diff = abs(low[metric] - ref[metric])
+        row[metric] = ref[metric]
+        row[f"{metric}_diff"] = diff
+        if not diff <= abs_tol + rel_tol * abs(ref[metric]):
+            row["ok"] = False
+    return row
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Check float32 precision mode against the float64 path."
+    )
+    parser.add_argument("input", nargs="?", help="JSON or CSV of parameter sets")
+    parser.add_argument("--seed", type=int, default=0, help="noise seed for both runs")
+    parser.add_argument(
+        "--passband-only", action="store_true", help="skip the baseband engine"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    param_sets = (
+        load_param_sets(args.input) if args.input else _preset_param_sets(["all"])
+    )
+    engines = (False,) if args.passband_only else (False, True)
+    failures = 0
+    print(
+        f"{'run':32s} {'thd %':>9s} {'dTHD':>8s} {'dSINAD':>8s} {'dEff':>8s}"
+        f" {'peak MB 64/32':>14s} {'ms 64/32':>10s}"
+    )
+    for raw in param_sets:
+        for baseband in engines:
+            row = compare_precision({**raw, "baseband": baseband}, args.seed)
+            name = f"{raw.get('name', '')[:26]}{' [IQ]' if baseband else ''}"
+            failures += not row["ok"]
+            print(
+                f"{name:32s} {row['thd']:9.4f} {row['thd_diff']:8.1e}"
+                f" {row['sinad_diff']:8.1e} {row['efficiency_diff']:8.1e}"
+                f" {row['peak_mb_64']:6.1f}/{row['peak_mb_32']:<7.1f}"
+                f" {row['ms_64']:4.0f}/{row['ms_32']:<5.0f}"
+                f"{'' if row['ok'] else '  GAGAL'}"
+            )
+    print(f"{failures} di luar toleransi", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
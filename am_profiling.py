@@ -0,0 +1,180 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Instrumentasi Waktu per Tahap
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Mencatat durasi tiap tahap update (tahap pipeline, set data plot, draw
+# Matplotlib, analisis) dalam riwayat bergulir per tahap, lengkap dengan
+# histogram latensi, ringkasan per update untuk status bar, dan perekaman
+# cProfile untuk satu update pilihan (thread pekerja + thread GUI digabung
+# ke satu file .prof). Tidak bergantung pada tkinter.
+# =============================================================================
+
+import cProfile
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Histogram bucket edges (ms), roughly logarithmic
+HIST_EDGES_MS = (0, 0.3, 1, 3, 10, 30, 100, 300, 1000, float("inf"))
+_BARS = " ▁▂▃▄▅▆▇█"
+
+
+class Profiler:
+    """Riwayat latensi bergulir per tahap dan rincian update terakhir.
+
+    record()/stage() aman dipanggil dari thread mana pun. `last` berisi
+    durasi tahap sejak begin_update() terakhir, dipakai untuk rincian ms
+    di status bar; riwayat (maks. `history` sampel per tahap) dipakai
+    untuk persentil dan histogram di report().
+    """
+
+    def __init__(self, history=200):
+        self.history = history
+        self._samples = {}
+        self._lock = threading.Lock()
+        self.last = {}
+        self._armed_path = None
+        self._profiles = []
+
+    def begin_update(self):
+        with self._lock:
+            self.last = {}
+
+    def record(self, name, ms):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.history)
+            samples.append(ms)
+            self.last[name] = self.last.get(name, 0.0) + ms
+
+    def record_many(self, timings, prefix=""):
+        for name, ms in timings.items():
+            self.record(prefix + name, ms)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1e3)
+
+    def summary(self, name):
+        """last/mean/p50/p95/max (ms) dan jumlah sampel untuk satu tahap."""
+        with self._lock:
+            samples = np.array(self._samples.get(name, ()))
+        if not len(samples):
+            return {"count": 0}
+        return {
+            "count": len(samples),
+            "last_ms": float(samples[-1]),
+            "mean_ms": float(np.mean(samples)),
+            "p50_ms": float(np.percentile(samples, 50)),
+            "p95_ms": float(np.percentile(samples, 95)),
+            "max_ms": float(np.max(samples)),
+        }
+
+    def histogram(self, name, edges=HIST_EDGES_MS):
+        with self._lock:
+            samples = np.array(self._samples.get(name, ()))
+        return np.histogram(samples, bins=edges)[0]
+
+    def names(self):
+        with self._lock:
+            return list(self._samples)
+
+    def breakdown(self, groups):
+        """Rincian update terakhir, mis. "pipeline 31 (demod 8, thd 9) | plot 12".
+
+        `groups` adalah daftar (label, prefix): tahap berawalan `prefix`
+        dijumlahkan di bawah `label`, dengan tahap >= 1 ms dirinci.
+        """
+        with self._lock:
+            last = dict(self.last)
+        parts = []
+        for label, prefix in groups:
+            items = [
+                (k[len(prefix) :], v) for k, v in last.items() if k.startswith(prefix)
+            ]
+            if not items:
+                continue
+            total = sum(v for _, v in items)
+            detail = ", ".join(
+                f"{name} {ms:.0f}" for name, ms in items if name and ms >= 1
+            )
+            parts.append(f"{label} {total:.0f}" + (f" ({detail})" if detail else ""))
+        return " | ".join(parts) + " ms" if parts else ""
+
+    def report(self):
+        """Tabel teks: persentil dan histogram bergulir untuk setiap tahap."""
+        edges = ", ".join(f"{e:g}" for e in HIST_EDGES_MS[1:-1])
+        lines = [
+            f"{'tahap':20s} {'n':>4s} {'last':>7s} {'p50':>7s} {'p95':>7s}"
+            f" {'max':>7s}  histogram (batas ms: {edges})"
+        ]
+        for name in sorted(self.names()):
+            s = self.summary(name)
+            counts = self.histogram(name)
+            scale = counts.max() or 1
+            bars = "".join(
+                _BARS[int(np.ceil(c / scale * (len(_BARS) - 1)))] for c in counts
+            )
+            lines.append(
+                f"{name:20s} {s['count']:4d} {s['last_ms']:7.1f} {s['p50_ms']:7.1f}"
+                f" {s['p95_ms']:7.1f} {s['max_ms']:7.1f}  |{bars}|"
+            )
+        return "\n".join(lines)
+
+    # --- cProfile untuk satu update ---
+    def arm(self, path):
+        """Update berikutnya direkam dengan cProfile dan disimpan ke `path`."""
+        with self._lock:
+            self._armed_path, self._profiles = path, []
+
+    @property
+    def armed(self):
+        return self._armed_path is not None
+
+    def profiled(self, func, *args, keep=False, **kwargs):
+        """Menjalankan func; jika sedang armed, di bawah cProfile.
+
+        Tiap thread punya profiler sendiri, jadi bagian pekerja dan bagian
+        GUI dari satu update direkam terpisah lalu digabung di finish().
+        Dengan keep=False (mis. run pekerja yang bisa saja dibatalkan),
+        hanya rekaman terakhir yang dipertahankan.
+        """
+        if not self.armed:
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python >= 3.12 allows only one active cProfile per process
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                if not keep:
+                    self._profiles = [p for p in self._profiles if p[1]]
+                self._profiles.append((profile, keep))
+
+    def finish(self):
+        """Menulis rekaman gabungan ke file yang di-arm; mengembalikan path-nya."""
+        with self._lock:
+            path, profiles = self._armed_path, [p for p, _ in self._profiles]
+            self._armed_path, self._profiles = None, []
+        if path is None or not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        return path
@@ -0,0 +1,241 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Lapisan Render (Blitting)
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Latar statis figure (sumbu, tick, legenda) disimpan sekali setelah setiap
+# draw penuh; update berikutnya hanya memulihkan latar tersebut lalu
+# menggambar ulang artist yang berubah (garis, judul, anotasi, marker).
+# Relayout penuh hanya terjadi jika batas sumbu benar-benar berubah.
+# =============================================================================
+
+import time
+from collections import deque
+
+import numpy as np
+
+
+class MinMaxPyramid:
+    """Piramida min/max multi-resolusi untuk satu trace dengan x berjarak seragam.
+
+    Level k menyimpan min dan max tiap blok 2**k sampel, dibangun sekali
+    dalam O(n). query() memilih level yang memberi sekitar 1-2 blok per
+    piksel untuk rentang x yang terlihat, sehingga jumlah titik yang
+    digambar sebanding dengan lebar layar, bukan jumlah sampel.
+    """
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, float)
+        self.y = np.asarray(y, float)
+        n = len(self.y)
+        self.dx = (self.x[-1] - self.x[0]) / (n - 1) if n > 1 else 1.0
+        self.levels = []
+        mins = maxs = self.y
+        while len(mins) >= 4:
+            even = len(mins) // 2 * 2
+            new_mins = np.minimum(mins[0:even:2], mins[1:even:2])
+            new_maxs = np.maximum(maxs[0:even:2], maxs[1:even:2])
+            if even < len(mins):
+                # Fold the odd tail sample into the last block
+                new_mins[-1] = min(new_mins[-1], mins[-1])
+                new_maxs[-1] = max(new_maxs[-1], maxs[-1])
+            mins, maxs = new_mins, new_maxs
+            self.levels.append((mins, maxs))
+
+    def query(self, x0, x1, pixels):
+        """Titik (x, y) untuk rentang [x0, x1] yang digambar selebar `pixels`."""
+        n = len(self.y)
+        if n < 2:
+            return self.x, self.y
+        i0 = int(np.clip(np.floor((x0 - self.x[0]) / self.dx) - 1, 0, n))
+        i1 = int(np.clip(np.ceil((x1 - self.x[0]) / self.dx) + 2, 0, n))
+        count = i1 - i0
+        pixels = max(int(pixels), 1)
+        if count <= 2 * pixels or not self.levels:
+            return self.x[i0:i1], self.y[i0:i1]
+        k = min(int(np.ceil(np.log2(count / pixels))), len(self.levels))
+        mins, maxs = self.levels[k - 1]
+        size = 2**k
+        b0, b1 = i0 // size, min(-(-i1 // size), len(mins))
+        centers = self.x[0] + (np.arange(b0, b1) * size + (size - 1) / 2) * self.dx
+        centers = np.minimum(centers, self.x[-1])
+        # Alternate min->max and max->min per block so consecutive blocks join
+        # along the top/bottom edge instead of with full-height diagonals
+        lo, hi = mins[b0:b1], maxs[b0:b1]
+        flip = np.arange(b0, b1) % 2 == 1
+        y = np.empty(2 * (b1 - b0))
+        y[0::2] = np.where(flip, hi, lo)
+        y[1::2] = np.where(flip, lo, hi)
+        return np.repeat(centers, 2), y
+
+
+class PlotView:
+    """Mengelola redraw cepat (blit) untuk satu figure Matplotlib.
+
+    Artist yang didaftarkan lewat add_artist() ditandai animated sehingga
+    tidak ikut tergambar di latar. Ubah batas sumbu hanya lewat set_limits()
+    atau fit_y() agar perubahan batas memicu draw penuh; selain itu render()
+    cukup mem-blit. Trace panjang diisi lewat set_line_data() agar
+    digambar dari piramida min/max sesuai lebar sumbu dan zoom.
+    `on_full_draw(ms)` (opsional) dipanggil setelah draw penuh yang diminta
+    render() selesai, dengan waktu dari permintaan hingga selesai digambar.
+    """
+
+    # fit_y only shrinks the y-range once the data uses less than this fraction
+    SHRINK_RATIO = 0.5
+    # Extra room added on every refit so slowly growing data does not relayout
+    HEADROOM = 0.2
+
+    def __init__(self, fig, canvas=None, history=200, on_full_draw=None):
+        self.fig = fig
+        self.canvas = canvas or fig.canvas
+        self.on_full_draw = on_full_draw
+        self.artists = []
+        self.full_draws, self.blits = 0, 0
+        self.frame_ms = deque(maxlen=history)
+        self.draw_ms = deque(maxlen=history)
+        self._draw_requested = None
+        self._background = None
+        self._stale = True
+        self._draw_pending = False
+        self._lod = {}
+        self._watched_axes = set()
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", self._on_resize)
+
+    def add_artist(self, *artists):
+        for artist in artists:
+            artist.set_animated(True)
+            self.artists.append(artist)
+
+    def set_line_data(self, line, x, y):
+        """Seperti line.set_data, tetapi lewat MinMaxPyramid (x harus seragam)."""
+        self._lod[line] = MinMaxPyramid(x, y)
+        ax = line.axes
+        if ax not in self._watched_axes:
+            # Toolbar zoom/pan changes the limits: re-pick the level only
+            ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+            self._watched_axes.add(ax)
+        self._apply_lod(line)
+
+    def _apply_lod(self, line):
+        ax = line.axes
+        x0, x1 = sorted(ax.get_xlim())
+        line.set_data(*self._lod[line].query(x0, x1, ax.bbox.width))
+
+    def _on_xlim_changed(self, ax):
+        for line in self._lod:
+            if line.axes is ax:
+                self._apply_lod(line)
+
+    def _on_resize(self, event):
+        for line in self._lod:
+            self._apply_lod(line)
+
+    def invalidate(self):
+        """Memaksa draw penuh pada render() berikutnya (mis. setelah ganti label)."""
+        self._stale = True
+
+    def set_limits(self, ax, xlim=None, ylim=None):
+        """Mengubah batas sumbu; hanya perubahan nyata yang memicu draw penuh."""
+        for new, get, set_ in (
+            (xlim, ax.get_xlim, ax.set_xlim),
+            (ylim, ax.get_ylim, ax.set_ylim),
+        ):
+            if new is not None and not np.allclose(get(), new, rtol=1e-9, atol=0):
+                set_(*new)
+                self._stale = True
+
+    def fit_y(self, ax, lines=None, margin=0.1):
+        """Menyesuaikan batas y dengan data yang terlihat, dengan histeresis.
+
+        Batas diperlebar jika data keluar dari batas, dan dipersempit hanya
+        jika data memakai kurang dari SHRINK_RATIO rentang sekarang, sehingga
+        update kontinu (mis. menggeser slider) tidak memicu relayout terus.
+        """
+        if lines is None:
+            lines = [ln for ln in ax.get_lines() if ln.get_transform() is ax.transData]
+        x_lo, x_hi = sorted(ax.get_xlim())
+        lo, hi = np.inf, -np.inf
+        for line in lines:
+            if not line.get_visible():
+                continue
+            x, y = (np.asarray(v, float) for v in line.get_data())
+            if len(y) == 0:
+                continue
+            y = y[(x >= x_lo) & (x <= x_hi)] if len(x) == len(y) else y
+            y = y[np.isfinite(y)]
+            if len(y):
+                lo, hi = min(lo, y.min()), max(hi, y.max())
+        if not np.isfinite(lo):
+            return
+        pad = margin * (hi - lo) if hi > lo else max(abs(hi) * margin, 1e-9)
+        lo, hi = lo - pad, hi + pad
+        cur_lo, cur_hi = ax.get_ylim()
+        if (
+            lo < cur_lo
+            or hi > cur_hi
+            or (hi - lo) < self.SHRINK_RATIO * (cur_hi - cur_lo)
+        ):
+            room = self.HEADROOM * (hi - lo)
+            self.set_limits(ax, ylim=(lo - room, hi + room))
+
+    def _on_draw(self, event):
+        # A full draw just happened: grab the static background, then paint
+        # the animated artists on top so the frame is complete
+        self._draw_pending = False
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+        if self._draw_requested is not None:
+            # draw_idle runs later, so this includes the wait for idle
+            ms = (time.perf_counter() - self._draw_requested) * 1e3
+            self._draw_requested = None
+            self.draw_ms.append(ms)
+            if self.on_full_draw is not None:
+                self.on_full_draw(ms)
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def render(self):
+        """Blit artist yang berubah, atau draw penuh jika latar tidak valid."""
+        if self._stale or self._background is None:
+            self._stale, self._draw_pending = False, True
+            self.full_draws += 1
+            self._draw_requested = time.perf_counter()
+            self.canvas.draw_idle()
+            return
+        if self._draw_pending:
+            # The queued full draw will paint the artists' latest state
+            return
+        start = time.perf_counter()
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.fig.bbox)
+        self.blits += 1
+        self.frame_ms.append((time.perf_counter() - start) * 1e3)
+
+    def savefig(self, path, **kwargs):
+        """Menyimpan figure lengkap; artist animated ikut tergambar."""
+        for artist in self.artists:
+            artist.set_animated(False)
+        try:
+            self.fig.savefig(path, **kwargs)
+        finally:
+            for artist in self.artists:
+                artist.set_animated(True)
+            # The save emitted a draw_event with the artists baked in
+            self.invalidate()
+            self.render()
+
+    def stats(self):
+        frames = np.array(self.frame_ms)
+        stats = {"full_draws": self.full_draws, "blits": self.blits}
+        if len(frames):
+            stats.update(
+                mean_ms=float(np.mean(frames)), p95_ms=float(np.percentile(frames, 95))
+            )
+        if len(self.draw_ms):
+            stats["draw_mean_ms"] = float(np.mean(self.draw_ms))
+        return stats
@@ -0,0 +1,140 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Penjadwal Kalkulasi (latest-value-wins)
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Satu thread pekerja menjalankan kalkulasi untuk parameter TERBARU saja.
+# Job yang belum dimulai digantikan oleh submit berikutnya; job yang sedang
+# berjalan dibatalkan di antara tahap pipeline. Hasil dikirim lewat callback
+# `notify` (mis. event Tk), bukan polling. Tidak bergantung pada tkinter.
+# =============================================================================
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from am_parallel import RunCancelled
+
+
+class CalculationScheduler:
+    """Penjadwal latest-value-wins untuk kalkulasi interaktif.
+
+    `compute(params, cancelled)` dijalankan di thread pekerja; `cancelled()`
+    bernilai benar begitu ada job yang lebih baru. `notify()` dipanggil dari
+    thread pekerja setiap ada hasil baru; pemilik lalu mengambilnya lewat
+    take_result() di thread-nya sendiri.
+    """
+
+    def __init__(self, compute, notify=None, history=200):
+        self._compute = compute
+        self._notify = notify
+        self._cond = threading.Condition()
+        self._pending = None
+        self._result = None
+        self._running = False
+        self._latest_id = 0
+        self._closed = False
+        self._thread = None
+        self._latencies = deque(maxlen=history)
+        self.counts = {"submitted": 0, "completed": 0, "superseded": 0, "cancelled": 0}
+
+    def submit(self, params):
+        """Menjadwalkan kalkulasi baru dan menggantikan semua job yang lebih lama."""
+        with self._cond:
+            self._latest_id += 1
+            if self._pending is not None:
+                self.counts["superseded"] += 1
+            self._pending = {
+                "id": self._latest_id,
+                "params": params,
+                "submitted": time.perf_counter(),
+            }
+            self.counts["submitted"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._latest_id
+
+    def _is_stale(self, job_id):
+        return job_id != self._latest_id or self._closed
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job, self._pending = self._pending, None
+                self._running = True
+            job["started"] = time.perf_counter()
+            try:
+                job["result"] = self._compute(
+                    job["params"], lambda: self._is_stale(job["id"])
+                )
+            except RunCancelled:
+                with self._cond:
+                    self._running = False
+                    self.counts["cancelled"] += 1
+                continue
+            except Exception as e:
+                job["error"] = str(e)
+            job["finished"] = time.perf_counter()
+            with self._cond:
+                self._running = False
+                if self._is_stale(job["id"]):
+                    # Finished, but a newer job already exists: drop it
+                    self.counts["cancelled"] += 1
+                    continue
+                self._result = job
+            if self._notify is not None:
+                self._notify()
+
+    @property
+    def busy(self):
+        """True selama ada job yang antre, berjalan, atau hasilnya belum diambil."""
+        with self._cond:
+            return (
+                self._pending is not None or self._running or self._result is not None
+            )
+
+    def take_result(self):
+        """Mengambil hasil terbaru (atau None) dan mencatat latensinya.
+
+        Dict hasil berisi "params", "result" atau "error", serta
+        "latency_ms" (submit -> diambil), "compute_ms" dan "wait_ms".
+        """
+        with self._cond:
+            job, self._result = self._result, None
+            if job is None:
+                return None
+            now = time.perf_counter()
+            job["wait_ms"] = (job["started"] - job["submitted"]) * 1e3
+            job["compute_ms"] = (job["finished"] - job["started"]) * 1e3
+            job["latency_ms"] = (now - job["submitted"]) * 1e3
+            self.counts["completed"] += 1
+            self._latencies.append(job["latency_ms"])
+            return job
+
+    def metrics(self):
+        """Statistik latensi (ms) dari job terakhir yang terkirim, plus jumlah job."""
+        with self._cond:
+            lat = np.array(self._latencies)
+            stats = dict(self.counts)
+        if len(lat):
+            stats.update(
+                last_ms=float(lat[-1]),
+                mean_ms=float(np.mean(lat)),
+                p95_ms=float(np.percentile(lat, 95)),
+            )
+        return stats
+
+    def shutdown(self):
+        """Menghentikan thread pekerja; job yang sedang berjalan dibatalkan."""
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify()
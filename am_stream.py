@@ -0,0 +1,267 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Pipeline Streaming Berbasis Blok
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Menghasilkan sinyal pesan, carrier, termodulasi, kanal (noisy) dan hasil
+# demodulasi dalam blok berukuran tetap. Osilator menjaga kontinuitas fasa
+# antar blok dan filter kausal (sosfilt) membawa state `zi`, sehingga
+# memori tetap terbatas berapa pun panjang run-nya. Waterfall menghitung
+# STFT secara inkremental dari blok yang sama.
+# =============================================================================
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from am_engine import FILTER_CACHE, SignalProcessor, required_sampling_rate
+from am_oscillator import Oscillator
+from am_spectrum import SpectrumAnalyzer
+
+# Cut-off DC tracker relatif terhadap fm (menggantikan dem - mean(dem))
+DC_TRACK_RATIO = 0.05
+# Waterfall: STFT segment length, rows kept in the history and empty level
+WATERFALL_NFFT, WATERFALL_ROWS = 1024, 200
+WATERFALL_FLOOR_DB = -120.0
+
+
+class CausalFilter:
+    """Filter SOS kausal yang membawa state antar blok."""
+
+    def __init__(self, sos):
+        self.sos = sos
+        self.zi = None
+
+    def __call__(self, x):
+        from scipy import signal as sig
+
+        if self.zi is None:
+            # Start in steady state for the first sample to avoid a big transient
+            self.zi = sig.sosfilt_zi(self.sos) * x[0]
+        y, self.zi = sig.sosfilt(self.sos, x, zi=self.zi)
+        return y
+
+
+class RingBuffer:
+    """Buffer melingkar berukuran tetap untuk jendela tampilan terakhir."""
+
+    def __init__(self, size):
+        self.data = np.zeros(size)
+        self.size, self.count, self.pos = size, 0, 0
+
+    def extend(self, x):
+        x = np.asarray(x)[-self.size :]
+        n = len(x)
+        first = min(n, self.size - self.pos)
+        self.data[self.pos : self.pos + first] = x[:first]
+        self.data[: n - first] = x[first:]
+        self.pos = (self.pos + n) % self.size
+        self.count = min(self.count + n, self.size)
+
+    def view(self):
+        """Isi buffer dalam urutan waktu (salinan)."""
+        if self.count < self.size:
+            return self.data[: self.count].copy()
+        return np.roll(self.data, -self.pos)
+
+
+class StreamingPipeline:
+    """Pipeline AM kausal yang menghasilkan satu blok sinyal per panggilan.
+
+    Parameter `p` sama dengan simulate(). Laju sampel mengikuti
+    required_sampling_rate(p) kecuali `sr` diberikan.
+    """
+
+    def __init__(self, p, block_size=4096, sr=None, seed=None):
+        self.block_size = block_size
+        self.processor = SignalProcessor()
+        self.rng = np.random.default_rng(seed if seed is not None else p.get("seed"))
+        self.sample_index = 0
+        self._sig_energy, self._sig_count = 0.0, 0
+        self.sr = None
+        self.update_params(p, sr)
+
+    def update_params(self, p, sr=None):
+        """Mengganti parameter tanpa memutus fasa osilator bila laju sampel sama."""
+        sr = sr or required_sampling_rate(p)
+        old = getattr(self, "p", None)
+        if self.sr != sr:
+            self.sample_index = 0
+            self.msg_osc = Oscillator(p["fm"], sr)
+            self.carrier_osc = Oscillator(p["fc"], sr)
+        else:
+            self.msg_osc.freq, self.carrier_osc.freq = p["fm"], p["fc"]
+        if old is None or self.sr != sr or old["fm"] != p["fm"]:
+            wn = 1.5 * p["fm"] / (0.5 * sr)
+            self.lowpass = CausalFilter(FILTER_CACHE.lowpass(4, wn))
+            self.dc_tracker = CausalFilter(FILTER_CACHE.lowpass(1, DC_TRACK_RATIO * wn))
+        if old is not None and (old["Am"], old["mode"]) != (p["Am"], p["mode"]):
+            self._sig_energy, self._sig_count = 0.0, 0
+        self.p, self.sr = p, sr
+
+    def _message(self, n):
+        p = self.p
+        if p["shape"] == "sine":
+            return self.msg_osc.cos(n, p["Am"])
+        if p["shape"] == "dual_tone":
+            # cos(3x) = Re(z^3) from the same rotator block
+            z = self.msg_osc.iq(n)
+            return (p["Am"] / 2) * (z.real + (z * z * z).real)
+        from scipy import signal as sig
+
+        func = {"square": sig.square, "sawtooth": sig.sawtooth}[p["shape"]]
+        return p["Am"] * func(self.msg_osc.phases(n))
+
+    def _noise(self, mod):
+        # Running estimate of the signal power replaces the whole-array mean
+        self._sig_energy += float(np.sum(mod**2))
+        self._sig_count += len(mod)
+        p_s = self._sig_energy / self._sig_count
+        p_n = 10 ** ((10 * np.log10(p_s + 1e-9) - self.p["snr_db"]) / 10)
+        return mod + self.rng.standard_normal(len(mod)) * np.sqrt(p_n)
+
+    def next_block(self):
+        p, n = self.p, self.block_size
+        t = (self.sample_index + np.arange(n)) / self.sr
+        self.sample_index += n
+
+        msg = self._message(n)
+        # One rotator block gives both the carrier and the coherent LO
+        z = self.carrier_osc.iq(n)
+        carrier = p["Ac"] * z.real
+        mod = self.processor.modulate(msg, carrier, p["Ac"], p["mode"])
+        noisy = self._noise(mod)
+        if p["demod_mode"] == "Coherent":
+            rot = np.exp(1j * np.deg2rad(p["phase_error"]))
+            lo = z.real * rot.real - z.imag * rot.imag
+            demod = 2 * self.lowpass(noisy * lo)
+        else:
+            dem = self.lowpass(np.abs(noisy))
+            demod = dem - self.dc_tracker(dem)
+        return {
+            "t": t,
+            "msg": msg,
+            "carrier": carrier,
+            "mod": mod,
+            "noisy": noisy,
+            "demod": demod,
+            "sr": self.sr,
+        }
+
+    def blocks(self, n_blocks=None):
+        """Generator blok; tanpa batas jika `n_blocks` None."""
+        produced = 0
+        while n_blocks is None or produced < n_blocks:
+            yield self.next_block()
+            produced += 1
+
+
+class StreamView:
+    """Jendela bergulir (ring buffer) dari beberapa sinyal stream untuk tampilan live."""
+
+    KEYS = ("t", "msg", "carrier", "mod", "noisy", "demod")
+
+    def __init__(self, window):
+        self.window = window
+        self.buffers = {k: RingBuffer(window) for k in self.KEYS}
+
+    def push(self, block):
+        for k in self.KEYS:
+            self.buffers[k].extend(block[k])
+
+    def snapshot(self):
+        return {k: buf.view() for k, buf in self.buffers.items()}
+
+
+class Waterfall:
+    """Spektrogram (STFT) inkremental dengan riwayat baris berukuran tetap.
+
+    push() hanya mentransformasi segmen yang baru lengkap; sisa sampel
+    dibawa ke panggilan berikutnya, jadi blok stream tidak pernah
+    ditransformasi ulang. Setiap baris dB ditulis dua kali (di r dan
+    r + rows), sehingga image() selalu berupa view bersambung dari baris
+    tertua ke terbaru tanpa salinan atau np.roll, siap untuk set_data.
+    Skala sama dengan SpectrumAnalyzer: sinus beramplitudo A bernilai ~A.
+    Dengan `fc`, input adalah selubung IQ kompleks dan spektrumnya dua
+    sisi di sekitar fc.
+    """
+
+    def __init__(
+        self,
+        sr,
+        nfft=WATERFALL_NFFT,
+        rows=WATERFALL_ROWS,
+        overlap=0.5,
+        window="hann",
+        fc=None,
+    ):
+        self.sr, self.fc, self.nfft, self.rows = sr, fc, nfft, rows
+        self.hop = max(1, int(round(nfft * (1 - overlap))))
+        self.window = SpectrumAnalyzer().window(window, nfft)
+        if fc is None:
+            self.freq = np.fft.rfftfreq(nfft, 1 / sr)
+        else:
+            self.freq = np.fft.fftshift(np.fft.fftfreq(nfft, 1 / sr)) + fc
+        self.history = np.full(
+            (2 * rows, len(self.freq)), WATERFALL_FLOOR_DB, np.float32
+        )
+        self.row, self.count = 0, 0
+        self.rgba, self._colors = None, None
+        self._carry = np.zeros(0)
+
+    def set_colormap(self, cmap, vmin, vmax):
+        """Riwayat berwarna (RGBA uint8) yang ikut diperbarui per baris baru.
+
+        `cmap` adalah Colormap Matplotlib. Mewarnai hanya baris baru jauh
+        lebih murah daripada colormap seluruh image pada setiap draw.
+        """
+        self._colors = (cmap, vmin, vmax)
+        self.rgba = self._colorize(self.history)
+
+    def _colorize(self, db):
+        cmap, vmin, vmax = self._colors
+        return cmap((db - vmin) / (vmax - vmin), bytes=True)
+
+    def samples_for(self, rows):
+        """Jumlah sampel yang menghasilkan tepat `rows` baris dari awal."""
+        return self.nfft + (rows - 1) * self.hop
+
+    def push(self, x, restart=False):
+        """Menambah sampel; mengembalikan jumlah baris baru.
+
+        restart=True membuang sisa sampel sebelumnya, untuk potongan yang
+        tidak bersambung dengan data terdahulu (mis. hasil update baru).
+        """
+        x = np.asarray(x, dtype=np.float64 if self.fc is None else np.complex128)
+        buf = x if restart else np.concatenate((self._carry, x))
+        n_seg = 1 + (len(buf) - self.nfft) // self.hop if len(buf) >= self.nfft else 0
+        self._carry = buf[n_seg * self.hop :].copy()
+        if not n_seg:
+            return 0
+        # Only the newest `rows` segments can still be seen
+        first = max(0, n_seg - self.rows)
+        segments = sliding_window_view(buf, self.nfft)[:: self.hop][first:n_seg]
+        if self.fc is None:
+            mag = np.abs(np.fft.rfft(segments * self.window, axis=-1))
+            mag *= 2.0 / np.sum(self.window)
+        else:
+            mag = np.abs(np.fft.fft(segments * self.window, axis=-1))
+            mag = np.fft.fftshift(mag, axes=-1) / np.sum(self.window)
+        db = 20 * np.log10(mag + 1e-9)
+        idx = (self.row + np.arange(len(db))) % self.rows
+        self.history[idx] = db
+        self.history[idx + self.rows] = db
+        if self.rgba is not None:
+            colors = self._colorize(db)
+            self.rgba[idx] = colors
+            self.rgba[idx + self.rows] = colors
+        self.row = (self.row + len(db)) % self.rows
+        self.count += n_seg
+        return n_seg
+
+    def image(self, rgba=False):
+        """Riwayat dari baris tertua ke terbaru (view, bukan salinan).
+
+        rgba=True mengembalikan versi berwarna dari set_colormap().
+        """
+        history = self.rgba if rgba else self.history
+        return history[self.row : self.row + self.rows]
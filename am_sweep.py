@@ -0,0 +1,211 @@
+# =============================================================================
+# VIRTUAL AM SPECTRUM ANALYZER - Sweep Parameter Tervektorisasi
+# Dibuat oleh: Dhimas Ardinata Putra Pamungkas
+# NIM: 4.3.22.0.10 | Kelas: TE-4A
+#
+# Mengevaluasi seluruh grid m x SNR x phase error x fc sebagai array 2-D
+# (satu baris per titik grid) yang berbagi satu vektor waktu dan carrier,
+# alih-alih menjalankan simulate() sekali per titik.
+# =============================================================================
+
+import numpy as np
+
+from am_engine import (
+    MAX_SAMPLES,
+    SignalProcessor,
+    parse_input,
+    required_sampling_rate,
+    signal_duration,
+    signal_dtype,
+)
+
+SWEEP_AXES = ("m", "snr_db", "phase_error", "fc")
+
+# Batas memori kasar untuk satu blok baris (per array sinyal)
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def parse_range(text):
+    """Mengubah 'start:stop:n' menjadi linspace, atau 'a,b,c' menjadi daftar nilai."""
+    text = str(text).strip()
+    if ":" in text:
+        start, stop, n = text.split(":")
+        return np.linspace(parse_input(start), parse_input(stop), int(n))
+    return np.array([parse_input(v) for v in text.split(",") if v.strip()])
+
+
+def _grid_sr(base, fc_values):
+    return max(required_sampling_rate({**base, "fc": fc}) for fc in fc_values)
+
+
+def evaluate_points(base, points, sr, processor=None, block_rows=None, duration=None):
+    """Menghitung [THD, SNR terukur] untuk daftar titik grid berbentuk (P, 4).
+
+    Kolom `points` mengikuti urutan SWEEP_AXES. Semua titik memakai satu
+    vektor waktu pada laju `sr`, satu pesan satuan dan satu carrier per fc
+    unik; baris diproses per blok agar memori tetap terbatas.
+    """
+    processor = processor or SignalProcessor()
+    points = np.asarray(points, float).reshape(-1, len(SWEEP_AXES))
+    duration = duration or signal_duration(base, sr)
+    t = processor.gen_time_vector(duration, sr, MAX_SAMPLES * 2)
+    dtype = signal_dtype(base)
+    msg_unit = processor.gen_message_signal(t, 1.0, base["fm"], base["shape"], dtype)
+    fc_values, fc_index = np.unique(points[:, 3], return_inverse=True)
+    carriers = np.stack(
+        [processor.gen_carrier_signal(t, base["Ac"], fc, dtype) for fc in fc_values]
+    )
+
+    out = np.empty((len(points), 2))
+    block_rows = block_rows or max(1, BLOCK_BYTES // (dtype().itemsize * len(t)))
+    for start in range(0, len(points), block_rows):
+        rows = slice(start, min(start + block_rows, len(points)))
+        m, snr, pe, fc = (points[rows, k][:, None] for k in range(4))
+
+        msg = (m * base["Ac"]).astype(dtype) * msg_unit
+        carrier = carriers[fc_index[rows]]
+        mod = processor.modulate(msg, carrier, base["Ac"], base["mode"])
+        noisy = processor.add_noise(mod, snr)
+        if base["demod_mode"] == "Coherent":
+            demod = processor.coherent_demodulate(noisy, t, fc, pe, base["fm"], sr)
+        else:
+            demod = processor.envelope_demodulate(noisy, base["fm"], sr)
+
+        out[rows, 0] = processor.calculate_thd(demod, base["fm"], sr)
+        p_sig = np.mean(mod**2, axis=-1)
+        p_noise = np.mean((noisy - mod) ** 2, axis=-1)
+        with np.errstate(divide="ignore"):
+            out[rows, 1] = 10 * np.log10(p_sig / p_noise)
+    return out
+
+
+def _points_kernel(context, points):
+    base, sr, duration = context
+    return evaluate_points(base, points, sr, duration=duration)
+
+
+def sweep(
+    base,
+    processor=None,
+    block_rows=None,
+    duration=None,
+    runner=None,
+    **ranges,
+):
+    """Menghitung THD, SNR terukur dan efisiensi untuk seluruh grid parameter.
+
+    `base` adalah dict hasil normalize_params; `ranges` berisi array nilai
+    untuk sumbu di SWEEP_AXES (sumbu yang tidak diberikan memakai nilai
+    dari `base`). fm, bentuk sinyal, mode dan demodulator sama untuk semua
+    titik. Jika `runner` (am_parallel.ParallelRunner) diberikan, titik grid
+    dibagi ke beberapa proses. Hasil berupa dict dengan "axes" dan array
+    metrik berbentuk grid.
+    """
+    processor = processor or SignalProcessor()
+    unknown = set(ranges) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Sumbu sweep tidak dikenal: {sorted(unknown)}")
+    axes = {
+        name: np.atleast_1d(
+            np.asarray(
+                ranges[name] if ranges.get(name) is not None else base[name], float
+            )
+        )
+        for name in SWEEP_AXES
+    }
+    if np.any(axes["fc"] <= 0) or np.any(axes["m"] < 0):
+        raise ValueError("fc harus positif dan m tidak boleh negatif.")
+
+    # One sampling rate (and so one time vector) for the whole grid
+    sr = _grid_sr(base, axes["fc"])
+    duration = duration or signal_duration(base, sr)
+    shape = tuple(len(axes[k]) for k in SWEEP_AXES)
+    grid = np.meshgrid(*(axes[k] for k in SWEEP_AXES), indexing="ij")
+    points = np.stack([g.ravel() for g in grid], axis=1)
+
+    if runner is None:
+        values = evaluate_points(base, points, sr, processor, block_rows, duration)
+    else:
+        values = runner.map(_points_kernel, points, 2, context=(base, sr, duration))
+
+    eff = np.array(
+        [processor.calc_power(base["Ac"], m, base["mode"])["eff"] for m in axes["m"]]
+    )
+    n = min(int(round(duration * sr)), MAX_SAMPLES * 2)
+    return {
+        "axes": axes,
+        "thd": values[:, 0].reshape(shape),
+        "snr_measured": values[:, 1].reshape(shape),
+        "efficiency": np.broadcast_to(eff[:, None, None, None], shape).copy(),
+        "sr": sr,
+        "duration": n / sr,
+    }
+
+
+def sweep_slice(result, keep, metric="thd", **at):
+    """Mengambil kurva (1 sumbu) atau heatmap (2 sumbu) dari hasil sweep.
+
+    Sumbu lain ditetapkan pada nilai terdekat dari `at` (default: indeks 0).
+    Contoh: sweep_slice(res, ("m",)) untuk THD vs m, atau
+    sweep_slice(res, ("snr_db", "m"), phase_error=0) untuk heatmap.
+    """
+    keep = tuple(keep)
+    index = []
+    for name in SWEEP_AXES:
+        if name in keep:
+            index.append(slice(None))
+        elif name in at:
+            index.append(int(np.argmin(np.abs(result["axes"][name] - at[name]))))
+        else:
+            index.append(0)
+    data = result[metric][tuple(index)]
+    # Order the remaining axes as requested
+    remaining = [name for name in SWEEP_AXES if name in keep]
+    return np.transpose(data, [remaining.index(name) for name in keep])
+
+
+def sweep_rows(result):
+    """Meratakan hasil sweep menjadi daftar dict (format panjang untuk CSV/JSON)."""
+    axes = result["axes"]
+    rows = []
+    for index in np.ndindex(result["thd"].shape):
+        row = {name: float(axes[name][i]) for name, i in zip(SWEEP_AXES, index)}
+        row["thd"] = float(result["thd"][index])
+        row["snr_measured"] = float(result["snr_measured"][index])
+        row["efficiency"] = float(result["efficiency"][index])
+        rows.append(row)
+    return rows
+
+
+def plot_sweep(result, path):
+    """Menyimpan kurva THD vs m, THD vs SNR dan heatmap THD(m, SNR) ke file gambar."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    axes = result["axes"]
+    fig, (ax_m, ax_snr, ax_map) = plt.subplots(
+        1, 3, figsize=(15, 4.5), constrained_layout=True
+    )
+    for snr in axes["snr_db"]:
+        ax_m.plot(
+            axes["m"], sweep_slice(result, ("m",), snr_db=snr), label=f"{snr:g} dB"
+        )
+    ax_m.set(xlabel="m", ylabel="THD (%)", title="THD vs m", yscale="log")
+    ax_m.legend(fontsize="small", title="SNR")
+    for m in axes["m"]:
+        ax_snr.plot(
+            axes["snr_db"], sweep_slice(result, ("snr_db",), m=m), label=f"{m:.2f}"
+        )
+    ax_snr.set(xlabel="SNR (dB)", ylabel="THD (%)", title="THD vs SNR", yscale="log")
+    if len(axes["m"]) <= 10:
+        ax_snr.legend(fontsize="small", title="m")
+    heat = sweep_slice(result, ("snr_db", "m"))
+    im = ax_map.pcolormesh(
+        axes["m"], axes["snr_db"], np.log10(np.maximum(heat, 1e-6)), shading="auto"
+    )
+    ax_map.set(xlabel="m", ylabel="SNR (dB)", title="log10 THD (%)")
+    fig.colorbar(im, ax=ax_map)
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
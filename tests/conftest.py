@@ -0,0 +1,65 @@
+import os
+import sys
+
+# The am_*.py modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import pytest
+
+
+class FakeRoot:
+    """Tk root stand-in: after() only records the callbacks."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def after(self, ms, func, *args):
+        job = f"after#{len(self.jobs)}"
+        self.jobs[job] = (ms, func, args)
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def event_generate(self, sequence, **kw):
+        pass
+
+
+class FakeVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+@pytest.fixture
+def gui():
+    """Offscreen AMSimulatorGUI with a fake root; _parse_inputs returns gui.inputs."""
+    from am_bench import offscreen_gui
+
+    gui = offscreen_gui()
+    gui.root = FakeRoot()
+    gui.app_status_var = FakeVar()
+    gui.inputs = None
+    gui._parse_inputs = lambda: dict(gui.inputs)
+    yield gui
+    gui.scheduler.shutdown()
+
+
+def wait_result(scheduler, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = scheduler.take_result()
+        if job is not None:
+            return job
+        time.sleep(0.01)
+    raise TimeoutError("scheduler gave no result")
@@ -0,0 +1,12 @@
+import numpy as np
+
+from am_audio import AudioPlayer, NullSink
+
+
+def test_one_shot_tail_is_not_an_underrun():
+    sink = NullSink(48000)
+    player = AudioPlayer(sink)
+    player.play(np.sin(np.arange(4800) / 10), 48000, loop=False)
+    sink.run(0.5)
+    assert player.finished
+    assert player.stats()["underruns"] == 0
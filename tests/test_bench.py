@@ -0,0 +1,51 @@
+import copy
+
+from am_bench import compare
+
+
+def _suite(results):
+    return {"results": results}
+
+
+def _stats(median, spread=0.1):
+    return {"min_ms": median - spread, "median_ms": median, "spread_ms": spread}
+
+
+RESULTS = {
+    "Default": {"pipeline": _stats(12.0), "update.snr": _stats(0.8, 0.05)},
+    "Default [IQ]": {"pipeline": _stats(6.0, 1.5), "render.full": _stats(450.0, 20.0)},
+}
+
+
+def test_identical_results_never_regress():
+    rows = compare(_suite(RESULTS), _suite(copy.deepcopy(RESULTS)), tolerance=0.0)
+    assert len(rows) == 4
+    assert not any(row[5] for row in rows)
+
+
+def test_small_slowdown_is_noise():
+    # Twice as slow, but below the 2 ms floor
+    current = copy.deepcopy(RESULTS)
+    current["Default"]["update.snr"] = _stats(1.6, 0.05)
+    assert not any(row[5] for row in compare(_suite(current), _suite(RESULTS)))
+
+
+def test_slowdown_within_spread_is_noise():
+    current = copy.deepcopy(RESULTS)
+    current["Default [IQ]"]["pipeline"] = _stats(9.0, 1.5)
+    assert not any(row[5] for row in compare(_suite(current), _suite(RESULTS)))
+
+
+def test_real_slowdown_regresses():
+    current = copy.deepcopy(RESULTS)
+    current["Default"]["pipeline"] = _stats(30.0)
+    flagged = [row[:2] for row in compare(_suite(current), _suite(RESULTS)) if row[5]]
+    assert flagged == [("Default", "pipeline")]
+
+
+def test_baseline_without_spread():
+    baseline = copy.deepcopy(RESULTS)
+    for metrics in baseline.values():
+        for stats in metrics.values():
+            del stats["spread_ms"]
+    assert not any(row[5] for row in compare(_suite(RESULTS), _suite(baseline)))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from am_engine import FilterCache
+
+
+def test_same_normalized_cutoff_is_a_hit():
+    cache = FilterCache()
+    a = cache.lowpass(5, 1000 / 24000)
+    b = cache.lowpass(5, 2000 / 48000)
+    assert b is a
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_matches_fresh_design():
+    from scipy import signal as sig
+
+    sos = FilterCache().design(4, 0.2, "high")
+    np.testing.assert_array_equal(sos, sig.butter(4, 0.2, "high", output="sos"))
+
+
+def test_lru_eviction():
+    cache = FilterCache(maxsize=2)
+    first = cache.lowpass(5, 0.1)
+    cache.lowpass(5, 0.2)
+    cache.lowpass(5, 0.1)  # touch: 0.2 is now the oldest
+    cache.lowpass(5, 0.3)
+    assert cache.evictions == 1
+    assert cache.lowpass(5, 0.1) is first
+    misses = cache.misses
+    cache.lowpass(5, 0.2)
+    assert cache.misses == misses + 1
+    cache.resize(0)
+    assert cache.evictions == 4
@@ -0,0 +1,11 @@
+from am_bench import offscreen_gui
+from am_engine import PRESETS, Pipeline, normalize_params
+
+
+def test_offscreen_gui_renders_preset():
+    gui = offscreen_gui()
+    p = normalize_params(PRESETS["Default (Modulasi Baik)"])
+    s = Pipeline().run(p)
+    gui._update_plots(p, s)
+    assert len(gui.lines[0].get_xdata()) > 0
+    assert gui.profiler.breakdown(gui.TIMING_GROUPS)
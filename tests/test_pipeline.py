@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from am_engine import PRESETS, Pipeline, normalize_params
+
+DOWNSTREAM = {"channel", "demod", "passband", "spectrum", "zoom", "thd"}
+
+
+@pytest.mark.parametrize("baseband", [False, True])
+def test_snr_change_reruns_only_noise_and_later_stages(baseband):
+    p = normalize_params({**PRESETS["Default (Modulasi Baik)"], "baseband": baseband})
+    p["seed"] = 3
+    pipeline = Pipeline()
+    first = pipeline.run(p)
+    assert {"time", "message"} <= set(pipeline.last_run)
+
+    q = {**p, "snr_db": p["snr_db"] - 10}
+    s = pipeline.run(q)
+    assert pipeline.last_run
+    assert set(pipeline.last_run) <= DOWNSTREAM
+    assert "channel" in pipeline.last_run
+    assert set(pipeline.last_timings) == set(pipeline.last_run)
+    # Upstream arrays are the memoized ones, downstream matches a fresh run
+    assert s["msg"] is first["msg"]
+    np.testing.assert_array_equal(s["demod"], Pipeline().run(q)["demod"])
+
+
+def test_identical_params_rerun_nothing():
+    p = normalize_params(PRESETS["Default (Modulasi Baik)"])
+    pipeline = Pipeline()
+    pipeline.run(p)
+    pipeline.run(dict(p))
+    assert pipeline.last_run == [] and pipeline.last_timings == {}
+
+
+def test_view_only_param_reruns_no_signal_stage():
+    p = normalize_params(PRESETS["Default (Modulasi Baik)"])
+    pipeline = Pipeline()
+    pipeline.run(p)
+    pipeline.run({**p, "fft_scale": "Linear"})
+    assert pipeline.last_run == []
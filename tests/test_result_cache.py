@@ -0,0 +1,87 @@
+import os
+import threading
+
+import numpy as np
+
+from am_cache import WRITE_QUEUE_SIZE, ResultCache, cache_key, with_seed
+
+P = {"fc": 10e3, "fm": 500.0, "snr_db": 30.0, "shape": "sine"}
+
+
+def _result(n=1000, value=1.0):
+    return {"noisy": np.full(n, value), "sr": 50e3, "thd": 0.5}
+
+
+def test_miss_then_hit(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get(P) is None
+    cache.put(P, _result())
+    s = cache.get(P)
+    np.testing.assert_array_equal(s["noisy"], _result()["noisy"])
+    assert s["sr"] == 50e3 and isinstance(s["sr"], float)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_ignores_view_params_but_not_seed():
+    assert cache_key(P) == cache_key({**P, "fft_scale": "Linear"})
+    assert cache_key(P) == cache_key(with_seed(P))
+    assert cache_key(P) != cache_key({**P, "seed": 1})
+    # Center/span only select the band in zoom mode
+    assert cache_key(P) == cache_key({**P, "fft_center": 9e3})
+    zoom = {**P, "fft_zoom": True}
+    assert cache_key(zoom) != cache_key({**zoom, "fft_center": 9e3})
+
+
+def test_fetch_computes_once(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    calls = []
+
+    def compute(p):
+        calls.append(p)
+        return _result()
+
+    cache.fetch(P, compute)
+    cache.fetch(P, compute)
+    assert len(calls) == 1 and calls[0]["seed"] == 0
+
+
+def test_lru_trim(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    params = [{**P, "snr_db": float(snr)} for snr in (10, 20, 30)]
+    for i, p in enumerate(params):
+        cache.put(p, _result())
+        path = os.path.join(cache.directory, cache_key(p) + ".npz")
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.get(params[0])  # now the most recently used
+    cache.max_bytes = cache.stats()["bytes"] * 2 // 3
+    cache.evict()
+    assert cache.evictions == 1
+    assert cache.get(params[1]) is None
+    assert cache.get(params[0]) is not None and cache.get(params[2]) is not None
+
+
+class BlockingCache(ResultCache):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.entered, self.release = threading.Event(), threading.Event()
+
+    def put(self, p, s):
+        self.entered.set()
+        self.release.wait(10)
+        super().put(p, s)
+
+
+def test_bounded_writer_drops_when_full(tmp_path):
+    cache = BlockingCache(str(tmp_path))
+    params = [{**P, "snr_db": float(snr)} for snr in range(WRITE_QUEUE_SIZE + 2)]
+    assert cache.put_later(params[0], _result())
+    assert cache.entered.wait(10)
+    # One write in progress, WRITE_QUEUE_SIZE waiting, the rest dropped
+    for p in params[1 : WRITE_QUEUE_SIZE + 1]:
+        assert cache.put_later(p, _result())
+    assert not cache.put_later(params[-1], _result())
+    assert cache.stats()["dropped"] == 1
+    cache.release.set()
+    cache.flush()
+    assert cache.stats()["entries"] == WRITE_QUEUE_SIZE + 1
+    assert cache.get(params[-1]) is None
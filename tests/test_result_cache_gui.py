@@ -0,0 +1,33 @@
+from conftest import wait_result
+
+from am_cache import ResultCache, with_seed
+from am_engine import PRESETS, normalize_params
+
+
+def test_settled_configuration_is_cached(gui, tmp_path):
+    gui.cache = ResultCache(str(tmp_path))
+    p = normalize_params(PRESETS["Default (Modulasi Baik)"])
+    gui.inputs = {**p, "snr_db": 23.0}
+
+    # Interactive update: unseeded and not written
+    gui.start_calculation()
+    job = wait_result(gui.scheduler)
+    gui.signals, timings = job["result"]
+    gui._signal_params = job["params"]
+    gui._schedule_cache_store(job["params"], timings)
+    gui.cache.flush()
+    assert gui.cache.stats()["entries"] == 0
+
+    # The parameters settle: the pending timer stores the seeded result
+    [(ms, func, _)] = gui.root.jobs.values()
+    assert ms == gui.CACHE_SETTLE_MS
+    func()
+    job = wait_result(gui.scheduler)
+    assert job["params"]["store"]
+    gui.cache.flush()
+    assert gui.cache.stats()["entries"] == 1
+    assert gui.cache.get(with_seed(gui.inputs)) is not None
+
+    # A stored result does not schedule another store
+    gui._schedule_cache_store(job["params"], job["result"][1])
+    assert gui._settle_job is None
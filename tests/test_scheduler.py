@@ -0,0 +1,41 @@
+import threading
+
+from conftest import wait_result
+
+from am_scheduler import CalculationScheduler
+
+
+def _blocking_scheduler(release):
+    def compute(params, cancelled):
+        release.wait(10)
+        return {"snr_db": params["snr_db"]}, {}
+
+    return CalculationScheduler(compute)
+
+
+def test_scheduler_busy_until_result_taken():
+    release = threading.Event()
+    scheduler = _blocking_scheduler(release)
+    assert not scheduler.busy
+    scheduler.submit({"snr_db": 1.0})
+    assert scheduler.busy
+    release.set()
+    job = wait_result(scheduler)
+    assert job["params"]["snr_db"] == 1.0
+    assert not scheduler.busy
+    scheduler.shutdown()
+
+
+def test_scrubbing_back_to_displayed_value_resubmits(gui):
+    # SNR 50 is displayed, 20 is running, then the slider returns to 50
+    release = threading.Event()
+    gui.scheduler = _blocking_scheduler(release)
+    gui.signals, gui._signal_params = {"sr": 1.0}, {"snr_db": 50.0}
+    gui.inputs = {"snr_db": 20.0}
+    gui.start_calculation()
+    gui.inputs = {"snr_db": 50.0}
+    gui.start_calculation()
+    release.set()
+    job = wait_result(gui.scheduler)
+    assert job["params"]["snr_db"] == 50.0
+    assert gui.scheduler.counts["submitted"] == 2
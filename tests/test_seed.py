@@ -0,0 +1,41 @@
+import numpy as np
+
+from am_engine import PRESETS, normalize_params, simulate
+from am_montecarlo import monte_carlo, run_trials
+
+RAW = PRESETS["Sangat Berisik (SNR Rendah)"]
+
+
+def test_normalize_params_reads_seed():
+    assert normalize_params({**RAW, "seed": "7"})["seed"] == 7
+    assert "seed" not in normalize_params({**RAW, "seed": ""})
+
+
+def test_same_seed_same_noise():
+    a = simulate(normalize_params({**RAW, "seed": 7}))
+    b = simulate(normalize_params({**RAW, "seed": 7}))
+    np.testing.assert_array_equal(a["noisy"], b["noisy"])
+    np.testing.assert_array_equal(a["demod"], b["demod"])
+
+
+def test_different_seed_different_noise():
+    a = simulate(normalize_params({**RAW, "seed": 7}))
+    b = simulate(normalize_params({**RAW, "seed": 8}))
+    assert not np.array_equal(a["noisy"], b["noisy"])
+
+
+def test_monte_carlo_reproducible():
+    p = normalize_params(RAW)
+    a = monte_carlo(p, trials=6, seed=11)
+    b = monte_carlo(p, trials=6, seed=11)
+    np.testing.assert_array_equal(a["samples"]["thd"], b["samples"]["thd"])
+    c = monte_carlo(p, trials=6, seed=12)
+    assert not np.array_equal(a["samples"]["thd"], c["samples"]["thd"])
+
+
+def test_trials_independent_of_blocking():
+    # Realization i only depends on (seed, i), not on batch size or order
+    p = normalize_params(RAW)
+    full = run_trials(p, 5, np.arange(6), block_rows=6)
+    np.testing.assert_array_equal(full, run_trials(p, 5, np.arange(6), block_rows=2))
+    np.testing.assert_array_equal(full[[4, 1]], run_trials(p, 5, [4, 1]))
@@ -0,0 +1,45 @@
+import numpy as np
+
+from am_spectrum import SpectrumAnalyzer
+
+
+def _tone(f, sr, n, complex_=False):
+    t = np.arange(n) / sr
+    return np.exp(2j * np.pi * f * t) if complex_ else np.cos(2 * np.pi * f * t)
+
+
+def test_zoom_in_band_tone():
+    sr = 50e3
+    freq, mag, _, _ = SpectrumAnalyzer().zoom_spectrum(
+        _tone(10e3, sr, 20000), sr, 10e3, 2e3
+    )
+    assert abs(freq[np.argmax(mag)] - 10e3) < 50
+    assert np.max(mag) > 0.9
+
+
+def test_zoom_passband_center_beyond_nyquist():
+    # 40 kHz at sr = 50 kHz is the alias of the 10 kHz tone, not a tone
+    sr = 50e3
+    _, mag, mag_db, _ = SpectrumAnalyzer().zoom_spectrum(
+        _tone(10e3, sr, 20000), sr, 40e3, 2e3
+    )
+    assert len(mag) and np.all(mag == 0)
+    assert np.all(mag_db < -150)
+
+
+def test_zoom_passband_band_straddles_nyquist():
+    sr = 50e3
+    freq, mag, _, _ = SpectrumAnalyzer().zoom_spectrum(
+        _tone(24e3, sr, 20000), sr, 25e3, 4e3
+    )
+    assert np.all(mag[freq > sr / 2] == 0)
+    assert abs(freq[np.argmax(mag)] - 24e3) < 50
+
+
+def test_zoom_iq_center_beyond_band():
+    # IQ envelope at sr = 10 kHz around fc = 10 kHz covers 5..15 kHz only
+    sr, fc = 10e3, 10e3
+    _, mag, _, _ = SpectrumAnalyzer().zoom_spectrum(
+        _tone(0.0, sr, 8000, complex_=True), sr, 20e3, 1e3, fc=fc
+    )
+    assert len(mag) and np.all(mag == 0)